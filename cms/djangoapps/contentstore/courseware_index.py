@@ -2,11 +2,15 @@
 from __future__ import absolute_import
 from abc import ABCMeta, abstractmethod
 from datetime import timedelta
+import hashlib
+import json
 import logging
 import re
+import zlib
 from six import add_metaclass
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy, ugettext as _
 from django.core.urlresolvers import resolve
 
@@ -26,6 +30,13 @@ from xmodule.library_tools import normalize_key_for_search
 # how far back from the trigger point to look back in order to index
 REINDEX_AGE = timedelta(0, 60)  # 60 seconds
 
+# Index snapshots are kept in the cache for INDEX_SNAPSHOT_TIMEOUT seconds;
+# after that the next incremental run falls back to a full reindex.
+# Snapshots larger than INDEX_SNAPSHOT_MAX_SIZE bytes once compressed are not
+# cached at all, as they would be rejected by memcached (1MB per item).
+INDEX_SNAPSHOT_TIMEOUT = 7 * 24 * 60 * 60
+INDEX_SNAPSHOT_MAX_SIZE = 1000 * 1000
+
 log = logging.getLogger('edx.modulestore')
 
 
@@ -48,6 +59,13 @@ def indexing_is_enabled():
     return settings.FEATURES.get('ENABLE_COURSEWARE_INDEX', False)
 
 
+def incremental_indexing_is_enabled():
+    """
+    Checks to see if updates of the indexes should only index the changed items
+    """
+    return settings.FEATURES.get('ENABLE_INCREMENTAL_SEARCH_INDEX', False)
+
+
 class SearchIndexingError(Exception):
     """ Indicates some error(s) occured during indexing """
 
@@ -114,7 +132,7 @@ class SearchIndexerBase(object):
         searcher.remove(cls.DOCUMENT_TYPE, result_ids)
 
     @classmethod
-    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE):
+    def index(cls, modulestore, structure_key, triggered_at=None, reindex_age=REINDEX_AGE, incremental=False):
         """
         Process course for indexing
 
@@ -130,6 +148,11 @@ class SearchIndexerBase(object):
             which items may need to be removed from the index
             If None, then a full reindex takes place
 
+        incremental (bool) - compare the published structure with the snapshot
+            recorded by the previous indexing run, and only update the index of
+            the items that changed since then, and remove the items that are gone.
+            Takes precedence over triggered_at when a snapshot is available.
+
         Returns:
         Number of items that have been added to the index
         """
@@ -141,9 +164,16 @@ class SearchIndexerBase(object):
         structure_key = cls.normalize_structure_key(structure_key)
         location_info = cls._get_location_info(structure_key)
 
+        # The signatures of the items indexed by the previous run, if we are
+        # to index only the items that have changed since.
+        previous_snapshot = cls._get_index_snapshot(structure_key) if incremental else None
+        if previous_snapshot is not None:
+            triggered_at = None
+
         # Wrap counter in dictionary - otherwise we seem to lose scope inside the embedded function `prepare_item_index`
         indexed_count = {
-            "count": 0
+            "count": 0,
+            "unchanged": 0,
         }
 
         # indexed_items is a list of all the items that we wish to remain in the
@@ -157,6 +187,10 @@ class SearchIndexerBase(object):
         # instead of per item index API call.
         items_index = []
 
+        # snapshot maps the id of each item in indexed_items to the signature
+        # of its current index, or to None if that isn't known.
+        snapshot = {}
+
         def get_item_location(item):
             """
             Gets the version agnostic item location
@@ -178,12 +212,6 @@ class SearchIndexerBase(object):
             Returns:
             item_content_groups - content groups assigned to indexed item
             """
-            is_indexable = hasattr(item, "index_dictionary")
-            item_index_dictionary = item.index_dictionary() if is_indexable else None
-            # if it's not indexable and it does not have children, then ignore
-            if not item_index_dictionary and not item.has_children:
-                return
-
             item_content_groups = None
 
             if item.category == "split_test":
@@ -207,7 +235,6 @@ class SearchIndexerBase(object):
                 item_content_groups = groups_usage_info.get(unicode(item_location), None)
 
             item_id = unicode(cls._id_modifier(item.scope_ids.usage_id))
-            indexed_items.add(item_id)
             if item.has_children:
                 # determine if it's okay to skip adding the children herein based upon how recently any may have changed
                 skip_child_index = skip_index or \
@@ -225,6 +252,31 @@ class SearchIndexerBase(object):
                 if None in children_groups_usage:
                     item_content_groups = None
 
+            item_signature = None
+            supplemental_fields = None
+            if previous_snapshot is not None:
+                try:
+                    supplemental_fields = cls.supplemental_fields(item)
+                    item_signature = cls._index_signature(item, item_content_groups, supplemental_fields)
+                except Exception:  # pylint: disable=broad-except
+                    # the item gets indexed, which reports the error if there is one
+                    supplemental_fields = None
+                if item_signature is not None and previous_snapshot.get(item_id) == item_signature:
+                    # the index of this item is up to date
+                    indexed_items.add(item_id)
+                    snapshot[item_id] = item_signature
+                    indexed_count["unchanged"] += 1
+                    return item_content_groups
+
+            is_indexable = hasattr(item, "index_dictionary")
+            item_index_dictionary = item.index_dictionary() if is_indexable else None
+            # if it's not indexable and it does not have children, then ignore
+            if not item_index_dictionary and not item.has_children:
+                return
+
+            indexed_items.add(item_id)
+            snapshot[item_id] = None
+
             if skip_index or not item_index_dictionary:
                 return
 
@@ -237,15 +289,21 @@ class SearchIndexerBase(object):
                 if item.start:
                     item_index['start_date'] = item.start
                 item_index['content_groups'] = item_content_groups if item_content_groups else None
-                item_index.update(cls.supplemental_fields(item))
+                if supplemental_fields is None:
+                    supplemental_fields = cls.supplemental_fields(item)
+                item_index.update(supplemental_fields)
                 items_index.append(item_index)
                 indexed_count["count"] += 1
+                if item_signature is None:
+                    item_signature = cls._index_signature(item, item_content_groups, supplemental_fields)
+                snapshot[item_id] = item_signature
                 return item_content_groups
             except Exception as err:  # pylint: disable=broad-except
                 # broad exception so that index operation does not fail on one item of many
                 log.warning('Could not index item: %s - %r', item.location, err)
                 error_list.append(_('Could not index item: {}').format(item.location))
 
+        removed_items = []
         try:
             with modulestore.branch_setting(ModuleStoreEnum.RevisionOption.published_only):
                 structure = cls._fetch_top_level(modulestore, structure_key)
@@ -258,7 +316,14 @@ class SearchIndexerBase(object):
                 for item in structure.get_children():
                     prepare_item_index(item, groups_usage_info=groups_usage_info)
                 searcher.index(cls.DOCUMENT_TYPE, items_index)
-                cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                if previous_snapshot is not None:
+                    # the items of the previous run that are gone can be removed without searching for them
+                    removed_items = [item_id for item_id in previous_snapshot if item_id not in indexed_items]
+                    if removed_items:
+                        searcher.remove(cls.DOCUMENT_TYPE, removed_items)
+                else:
+                    cls.remove_deleted_items(searcher, structure_key, indexed_items)
+                cls._set_index_snapshot(structure_key, snapshot)
         except Exception as err:  # pylint: disable=broad-except
             # broad exception so that index operation does not prevent the rest of the application from working
             log.exception(
@@ -267,12 +332,86 @@ class SearchIndexerBase(object):
                 err
             )
             error_list.append(_('General indexing error occurred'))
+            # the index may not match the snapshot anymore, so the next run must not rely on it
+            cls._set_index_snapshot(structure_key, None)
+
+        if previous_snapshot is not None:
+            cls._track_index_request(
+                cls.INDEX_EVENT['name'],
+                cls.INDEX_EVENT['category'],
+                indexed_count["count"],
+                incremental=True,
+                unchanged_count=indexed_count["unchanged"],
+                removed_count=len(removed_items),
+            )
 
         if error_list:
             raise SearchIndexingError('Error(s) present during indexing', error_list)
 
         return indexed_count["count"]
 
+    @classmethod
+    def _index_signature(cls, item, content_groups, supplemental_fields):
+        """
+        Returns a digest of everything the index of the item is built from, or
+        None if the item doesn't record when it was last edited.
+
+        Along with the item's own content, this covers the values it inherits
+        or gets from its position in the structure, so that the index of a
+        whole subtree is updated when, say, its start date or groups change.
+        """
+        edited_on = getattr(item, 'edited_on', None)
+        if edited_on is None:
+            return None
+        signature = json.dumps(
+            [unicode(edited_on), unicode(item.start), content_groups, supplemental_fields],
+            sort_keys=True,
+            default=unicode
+        )
+        return hashlib.md5(signature.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _index_snapshot_cache_key(cls, structure_key):
+        """ Cache key of the index snapshot of the structure """
+        return u"contentstore.courseware_index.snapshot.{}.{}".format(cls.INDEX_NAME, structure_key)
+
+    @classmethod
+    def _get_index_snapshot(cls, structure_key):
+        """
+        Returns the snapshot recorded by the last indexing run of the
+        structure, mapping the ids of its indexed items to their signatures,
+        or None if there isn't one.
+        """
+        compressed_snapshot = cache.get(cls._index_snapshot_cache_key(structure_key))
+        if compressed_snapshot is None:
+            return None
+        return json.loads(zlib.decompress(compressed_snapshot))
+
+    @classmethod
+    def _set_index_snapshot(cls, structure_key, snapshot):
+        """
+        Records the snapshot of the structure's index, or clears it if
+        snapshot is None. Snapshots are compressed, as they list every item
+        of the structure, and are dropped if they are still too large to be
+        cached.
+        """
+        cache_key = cls._index_snapshot_cache_key(structure_key)
+        if snapshot is None:
+            cache.delete(cache_key)
+            return
+
+        compressed_snapshot = zlib.compress(json.dumps(snapshot))
+        if len(compressed_snapshot) > INDEX_SNAPSHOT_MAX_SIZE:
+            log.warning(
+                "Index snapshot of %s is too large to be cached (%d bytes), "
+                "it will be fully reindexed on the next incremental run",
+                structure_key,
+                len(compressed_snapshot)
+            )
+            cache.delete(cache_key)
+        else:
+            cache.set(cache_key, compressed_snapshot, INDEX_SNAPSHOT_TIMEOUT)
+
     @classmethod
     def _do_reindex(cls, modulestore, structure_key):
         """
@@ -285,13 +424,14 @@ class SearchIndexerBase(object):
         return indexed_count
 
     @classmethod
-    def _track_index_request(cls, event_name, category, indexed_count):
+    def _track_index_request(cls, event_name, category, indexed_count, **statistics):
         """Track content index requests.
 
         Arguments:
             event_name (str):  Name of the event to be logged.
             category (str): category of indexed items
             indexed_count (int): number of indexed items
+            statistics: any other statistics of the indexing run to be logged
         Returns:
             None
 
@@ -300,6 +440,7 @@ class SearchIndexerBase(object):
             "indexed_count": indexed_count,
             'category': category,
         }
+        data.update(statistics)
 
         tracker.emit(
             event_name,
@@ -10,7 +10,9 @@ from pytz import UTC
 
 from django.contrib.auth.models import User
 
-from contentstore.courseware_index import CoursewareSearchIndexer, LibrarySearchIndexer, SearchIndexingError
+from contentstore.courseware_index import (
+    CoursewareSearchIndexer, LibrarySearchIndexer, SearchIndexingError, incremental_indexing_is_enabled
+)
 from contentstore.utils import initialize_permissions
 from course_action_state.models import CourseRerunState
 from opaque_keys.edx.keys import CourseKey
@@ -96,7 +98,12 @@ def update_search_index(course_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         course_key = CourseKey.from_string(course_id)
-        CoursewareSearchIndexer.index(modulestore(), course_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        CoursewareSearchIndexer.index(
+            modulestore(),
+            course_key,
+            triggered_at=(_parse_time(triggered_time_isoformat)),
+            incremental=incremental_indexing_is_enabled()
+        )
 
     except SearchIndexingError as exc:
         LOGGER.error('Search indexing error for complete course %s - %s', course_id, unicode(exc))
@@ -109,7 +116,12 @@ def update_library_index(library_id, triggered_time_isoformat):
     """ Updates course search index. """
     try:
         library_key = CourseKey.from_string(library_id)
-        LibrarySearchIndexer.index(modulestore(), library_key, triggered_at=(_parse_time(triggered_time_isoformat)))
+        LibrarySearchIndexer.index(
+            modulestore(),
+            library_key,
+            triggered_at=(_parse_time(triggered_time_isoformat)),
+            incremental=incremental_indexing_is_enabled()
+        )
 
     except SearchIndexingError as exc:
         LOGGER.error('Search indexing error for library %s - %s', library_id, unicode(exc))
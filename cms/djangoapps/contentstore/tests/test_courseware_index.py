@@ -258,6 +258,10 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
             reindex_age=(trigger_time - since_time)
         )
 
+    def index_incrementally(self, store):
+        """ index the changes to the course since the last time it was indexed """
+        return CoursewareSearchIndexer.index(store, self.course.id, incremental=True)
+
     def _get_default_search(self):
         return {"course": unicode(self.course.id)}
 
@@ -441,6 +445,50 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
         indexed_count = self.reindex_course(store)
         self.assertEqual(indexed_count, 7)
 
+    def _test_incremental_index(self, store):
+        """ Make sure that an incremental index only indexes the items that changed since the previous one """
+        self.publish_item(store, self.vertical.location)
+        indexed_count = self.index_incrementally(store)
+        self.assertEqual(indexed_count, 4)
+
+        # nothing has changed since
+        indexed_count = self.index_incrementally(store)
+        self.assertEqual(indexed_count, 0)
+
+        # renaming the sequential changes the location of its descendants as well
+        self.sequential.display_name = "Lesson One"
+        self.update_item(store, self.sequential)
+        with patch.object(CoursewareSearchIndexer, '_track_index_request') as mock_track:
+            indexed_count = self.index_incrementally(store)
+        self.assertEqual(indexed_count, 3)
+        mock_track.assert_called_once_with(
+            CoursewareSearchIndexer.INDEX_EVENT['name'],
+            CoursewareSearchIndexer.INDEX_EVENT['category'],
+            3,
+            incremental=True,
+            unchanged_count=1,
+            removed_count=0,
+        )
+        response = self.search(query_string="Html Content")
+        self.assertEqual(response["results"][0]["data"]["location"], ["Week 1", "Lesson One", "Subsection 1"])
+
+        # deleted items are removed from the index
+        self.delete_item(store, self.html_unit.location)
+        self.publish_item(store, self.vertical.location)
+        self.index_incrementally(store)
+        response = self.search()
+        self.assertEqual(response["total"], 3)
+
+    def _test_incremental_index_snapshot_too_large(self, store):
+        """ Make sure that a snapshot too large to be cached leads to a full reindex """
+        self.publish_item(store, self.vertical.location)
+        with patch('contentstore.courseware_index.INDEX_SNAPSHOT_MAX_SIZE', 0):
+            with patch('contentstore.courseware_index.log') as mock_log:
+                self.index_incrementally(store)
+            self.assertTrue(mock_log.warning.called)
+            indexed_count = self.index_incrementally(store)
+        self.assertEqual(indexed_count, 4)
+
     def _test_course_about_property_index(self, store):
         """ Test that informational properties in the course object end up in the course_info index """
         display_name = "Help, I need somebody!"
@@ -576,6 +624,14 @@ class TestCoursewareSearchIndexer(MixedWithOptionsTestCase):
     def test_exception(self, store_type):
         self._perform_test_using_store(store_type, self._test_exception)
 
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index)
+
+    @ddt.data(*WORKS_WITH_STORES)
+    def test_incremental_index_snapshot_too_large(self, store_type):
+        self._perform_test_using_store(store_type, self._test_incremental_index_snapshot_too_large)
+
     @ddt.data(*WORKS_WITH_STORES)
     def test_course_about_property_index(self, store_type):
         self._perform_test_using_store(store_type, self._test_course_about_property_index)
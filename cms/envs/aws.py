@@ -158,6 +158,8 @@ if 'loc_cache' not in CACHES:
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'edx_location_mem_cache',
     }
+CONFIGURATION_MODEL_SNAPSHOT_TTL = ENV_TOKENS.get('CONFIGURATION_MODEL_SNAPSHOT_TTL', CONFIGURATION_MODEL_SNAPSHOT_TTL)
+GEOIP_COUNTRY_CODE_CACHE_SIZE = ENV_TOKENS.get('GEOIP_COUNTRY_CODE_CACHE_SIZE', GEOIP_COUNTRY_CODE_CACHE_SIZE)
 
 SESSION_COOKIE_DOMAIN = ENV_TOKENS.get('SESSION_COOKIE_DOMAIN')
 SESSION_COOKIE_HTTPONLY = ENV_TOKENS.get('SESSION_COOKIE_HTTPONLY', True)
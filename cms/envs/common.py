@@ -129,6 +129,11 @@ FEATURES = {
     # Turn off account locking if failed login attempts exceeds a limit
     'ENABLE_MAX_FAILED_LOGIN_ATTEMPTS': False,
 
+    # Keep the failed login counts and lockouts in the cache, which must be
+    # shared and support atomic increments, and write them to the database in
+    # the background, instead of querying the database on every login.
+    'ENABLE_LOGIN_FAILURES_CACHE': False,
+
     # Allow editing of short description in course settings in cms
     'EDITABLE_SHORT_DESCRIPTION': True,
 
@@ -181,6 +186,17 @@ FEATURES = {
     # Enable content libraries search functionality
     'ENABLE_LIBRARY_INDEX': False,
 
+    # Only reindex the changed items of courses and libraries when they are published
+    'ENABLE_INCREMENTAL_SEARCH_INDEX': False,
+
+    # Snapshot the student_view_data of blocks when courses are published, and
+    # only recompute it for the blocks that changed.
+    'ENABLE_STUDENT_VIEW_DATA_SNAPSHOTS': False,
+
+    # Maintain per-course, per-mode counts of active enrollments. Must match
+    # the LMS setting, as enrollments are also created in Studio.
+    'ENABLE_ENROLLMENT_COUNTS': False,
+
     # Enable course reruns, which will always use the split modulestore
     'ALLOW_COURSE_RERUNS': True,
 
@@ -235,6 +251,8 @@ sys.path.append(COMMON_ROOT / 'djangoapps')
 # For geolocation ip database
 GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoIP.dat"
 GEOIPV6_PATH = REPO_ROOT / "common/static/data/geoip/GeoIPv6.dat"
+# Number of IP addresses whose country is kept in memory by each process
+GEOIP_COUNTRY_CODE_CACHE_SIZE = 10000
 
 ############################# TEMPLATE CONFIGURATION #############################
 # Mako templating
@@ -1188,6 +1206,12 @@ DATABASE_ROUTERS = [
     'openedx.core.lib.django_courseware_routers.StudentModuleHistoryExtendedRouter',
 ]
 
+# Number of seconds between the checks each process makes that the
+# ConfigurationModel entries it keeps in memory are still current. Saving an
+# entry is seen by all processes within that delay. 0 disables the in-memory
+# entries, so that every lookup goes to the 'configuration' cache.
+CONFIGURATION_MODEL_SNAPSHOT_TTL = 0
+
 ############################ OAUTH2 Provider ###################################
 
 # OpenID Connect issuer ID. Normally the URL of the authentication endpoint.
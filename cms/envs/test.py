@@ -212,6 +212,9 @@ PASSWORD_HASHERS = (
     'django.contrib.auth.hashers.MD5PasswordHasher',
 )
 
+# Tests mock the country of IP addresses differently from one test to the next
+GEOIP_COUNTRY_CODE_CACHE_SIZE = 0
+
 # No segment key
 CMS_SEGMENT_KEY = None
 
@@ -1,7 +1,16 @@
 """
 Django Model baseclass for database-backed configuration.
 """
+import copy
+import threading
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.signals import request_finished
 from django.db import connection, models
+from django.dispatch import receiver
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.core.cache import caches, InvalidCacheBackendError
 from django.utils.translation import ugettext_lazy as _
@@ -15,6 +24,121 @@ except InvalidCacheBackendError:
     from django.core.cache import cache
 
 
+# Shared cache key of a token that is replaced whenever any configuration entry
+# is saved, which invalidates the snapshots of every process.
+VERSION_CACHE_KEY = 'configuration/version'
+
+
+class ConfigurationSnapshots(object):
+    """
+    Process-local snapshots of cached configuration, in front of the shared
+    cache.
+
+    Snapshots are kept for as long as the configuration version in the shared
+    cache doesn't change, and at most for the cache timeout of their model.
+    That version is only checked once every
+    settings.CONFIGURATION_MODEL_SNAPSHOT_TTL seconds, so a saved entry is
+    seen by all processes within that delay. Snapshots are disabled if the
+    setting is 0.
+    """
+    def __init__(self):
+        self.snapshots = {}
+        self.version = None
+        self.checked_at = 0
+        # The cache keys invalidated in the transaction of the current
+        # request, which are invalidated again once it is committed.
+        self.pending = threading.local()
+
+    @staticmethod
+    def ttl():
+        """
+        Return the number of seconds between checks of the configuration version.
+        """
+        return getattr(settings, 'CONFIGURATION_MODEL_SNAPSHOT_TTL', 0)
+
+    def get(self, cache_key):
+        """
+        Return a copy of the snapshot of cache_key, or None if there isn't one.
+        """
+        ttl = self.ttl()
+        if not ttl:
+            return None
+
+        current_time = time.time()
+        if current_time - self.checked_at >= ttl:
+            version = cache.get(VERSION_CACHE_KEY)
+            if version is None or version != self.version:
+                self.snapshots = {}
+                self.version = version
+            self.checked_at = current_time
+
+        snapshot = self.snapshots.get(cache_key)
+        if snapshot is None:
+            return None
+        value, expires_at = snapshot
+        if current_time >= expires_at:
+            del self.snapshots[cache_key]
+            return None
+        # Callers may modify the entries they get, so they each get their own copy.
+        return copy.copy(value)
+
+    def set(self, cache_key, value, timeout):
+        """
+        Snapshot the value of cache_key for at most timeout seconds.
+        """
+        if self.ttl():
+            self.snapshots[cache_key] = (copy.copy(value), time.time() + timeout)
+
+    def invalidate(self, cache_keys=()):
+        """
+        Delete cache_keys from the shared cache and drop the snapshots of this
+        process, and those of other processes when they next check the
+        configuration version.
+
+        Inside a transaction, other processes still read the old entries from
+        the database until it is committed, and may cache and snapshot them
+        again. So both are done again at the end of the request.
+        """
+        self._invalidate(cache_keys)
+        if connection.in_atomic_block:
+            if not hasattr(self.pending, 'cache_keys'):
+                self.pending.cache_keys = set()
+            self.pending.cache_keys.update(cache_keys)
+
+    def invalidate_pending(self):
+        """
+        Invalidate again the cache keys invalidated in the transaction of the
+        current request, now that it is committed.
+        """
+        cache_keys = getattr(self.pending, 'cache_keys', None)
+        if cache_keys is not None:
+            del self.pending.cache_keys
+            self._invalidate(cache_keys)
+
+    def _invalidate(self, cache_keys):
+        """
+        Delete cache_keys from the shared cache, then replace the configuration
+        version, so that other processes can't snapshot the deleted entries
+        under the new version.
+        """
+        for cache_key in cache_keys:
+            cache.delete(cache_key)
+        self.snapshots = {}
+        cache.set(VERSION_CACHE_KEY, uuid4().hex, None)
+
+
+snapshots = ConfigurationSnapshots()  # pylint: disable=invalid-name
+
+
+@receiver(request_finished)
+def invalidate_pending_snapshots(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the configuration saved by the request again once its
+    transaction is committed, as Django 1.8 has no on_commit hook.
+    """
+    snapshots.invalidate_pending()
+
+
 class ConfigurationModelManager(models.Manager):
     """
     Query manager for ConfigurationModel
@@ -99,9 +223,10 @@ class ConfigurationModel(models.Model):
         # Always create a new entry, instead of updating an existing model
         self.pk = None  # pylint: disable=invalid-name
         super(ConfigurationModel, self).save(*args, **kwargs)
-        cache.delete(self.cache_key_name(*[getattr(self, key) for key in self.KEY_FIELDS]))
+        cache_keys = [self.cache_key_name(*[getattr(self, key) for key in self.KEY_FIELDS])]
         if self.KEY_FIELDS:
-            cache.delete(self.key_values_cache_key_name())
+            cache_keys.append(self.key_values_cache_key_name())
+        snapshots.invalidate(cache_keys)
 
     @classmethod
     def cache_key_name(cls, *args):
@@ -118,12 +243,18 @@ class ConfigurationModel(models.Model):
     @classmethod
     def current(cls, *args):
         """
-        Return the active configuration entry, either from cache,
-        from the database, or by creating a new empty entry (which is not
-        persisted).
+        Return the active configuration entry, either from the process-local
+        snapshots, from cache, from the database, or by creating a new empty
+        entry (which is not persisted).
         """
-        cached = cache.get(cls.cache_key_name(*args))
+        cache_key = cls.cache_key_name(*args)
+        snapshot = snapshots.get(cache_key)
+        if snapshot is not None:
+            return snapshot
+
+        cached = cache.get(cache_key)
         if cached is not None:
+            snapshots.set(cache_key, cached, cls.cache_timeout)
             return cached
 
         key_dict = dict(zip(cls.KEY_FIELDS, args))
@@ -132,9 +263,57 @@ class ConfigurationModel(models.Model):
         except IndexError:
             current = cls(**key_dict)
 
-        cache.set(cls.cache_key_name(*args), current, cls.cache_timeout)
+        cache.set(cache_key, current, cls.cache_timeout)
+        snapshots.set(cache_key, current, cls.cache_timeout)
         return current
 
+    @classmethod
+    def current_many(cls, keys):
+        """
+        Return a dict mapping each of the given tuples of KEY_FIELDS values to
+        its active configuration entry, as `current` would, with a single
+        shared cache round trip and at most one query.
+
+        Arguments:
+            keys (list): Tuples of values for each of the KEY_FIELDS.
+        """
+        assert cls.KEY_FIELDS != (), "Just use model.current() if there are no KEY_FIELDS"
+        keys = [tuple(key) for key in keys]
+        cache_keys = {key: cls.cache_key_name(*key) for key in keys}
+
+        result = {}
+        for key, cache_key in cache_keys.iteritems():
+            snapshot = snapshots.get(cache_key)
+            if snapshot is not None:
+                result[key] = snapshot
+
+        missing_cache_keys = [cache_key for key, cache_key in cache_keys.iteritems() if key not in result]
+        cached = cache.get_many(missing_cache_keys) if missing_cache_keys else {}
+        for key, cache_key in cache_keys.iteritems():
+            if key not in result and cache_key in cached:
+                result[key] = cached[cache_key]
+                snapshots.set(cache_key, cached[cache_key], cls.cache_timeout)
+
+        missing_keys = [key for key in keys if key not in result]
+        if missing_keys:
+            query = Q()
+            for key in missing_keys:
+                query |= Q(**dict(zip(cls.KEY_FIELDS, key)))
+            entries = {
+                cls.cache_key_name(*[getattr(entry, field) for field in cls.KEY_FIELDS]): entry
+                for entry in cls.objects.current_set().filter(query)
+            }
+            to_cache = {}
+            for key in missing_keys:
+                current = entries.get(cache_keys[key])
+                if current is None:
+                    current = cls(**dict(zip(cls.KEY_FIELDS, key)))
+                result[key] = to_cache[cache_keys[key]] = current
+                snapshots.set(cache_keys[key], current, cls.cache_timeout)
+            cache.set_many(to_cache, cls.cache_timeout)
+
+        return result
+
     @classmethod
     def is_enabled(cls):
         """Returns True if this feature is configured as enabled, else False."""
@@ -173,11 +352,16 @@ class ConfigurationModel(models.Model):
         assert not kwargs, "'flat' is the only kwarg accepted"
         key_fields = key_fields or cls.KEY_FIELDS
         cache_key = cls.key_values_cache_key_name(*key_fields)
+        snapshot = snapshots.get(cache_key)
+        if snapshot is not None:
+            return snapshot
         cached = cache.get(cache_key)
         if cached is not None:
+            snapshots.set(cache_key, cached, cls.cache_timeout)
             return cached
         values = list(cls.objects.values_list(*key_fields, flat=flat).order_by().distinct())
         cache.set(cache_key, values, cls.cache_timeout)
+        snapshots.set(cache_key, values, cls.cache_timeout)
         return values
 
     def fields_equal(self, instance, fields_to_ignore=("id", "change_date", "changed_by")):
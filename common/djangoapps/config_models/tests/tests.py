@@ -5,14 +5,16 @@ Tests of ConfigurationModel
 
 import ddt
 from django.contrib.auth.models import User
+from django.core.signals import request_finished
 from django.db import models
 from django.test import TestCase
+from django.test.utils import override_settings
 from rest_framework.test import APIRequestFactory
 
 from freezegun import freeze_time
 
 from mock import patch, Mock
-from config_models.models import ConfigurationModel
+from config_models.models import ConfigurationModel, ConfigurationSnapshots, VERSION_CACHE_KEY
 from config_models.views import ConfigurationModelCurrentAPIView
 
 
@@ -415,6 +417,138 @@ class KeyedConfigurationModelTests(TestCase):
         self.assertFalse(ExampleKeyedConfig.equal_to_current({}))
 
 
+@override_settings(CONFIGURATION_MODEL_SNAPSHOT_TTL=60)
+@patch('config_models.models.cache')
+class ConfigurationSnapshotsTests(TestCase):
+    """
+    Tests of the process-local snapshots of ``ConfigurationModels``.
+    """
+    def setUp(self):
+        super(ConfigurationSnapshotsTests, self).setUp()
+        self.user = User()
+        self.user.save()
+        patcher = patch('config_models.models.snapshots', ConfigurationSnapshots())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _cache_get_keys(self, mock_cache):
+        """
+        Return the keys that were looked up in the shared cache, other than the version.
+        """
+        return [call[0][0] for call in mock_cache.get.call_args_list if call[0][0] != VERSION_CACHE_KEY]
+
+    def test_current_from_snapshot(self, mock_cache):
+        mock_cache.get.return_value = None
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+        mock_cache.get.reset_mock()
+
+        current = ExampleConfig.current()
+        self.assertEquals(current.string_field, 'first')
+        self.assertEquals(self._cache_get_keys(mock_cache), [])
+
+        # Each caller gets its own copy of the entry.
+        current.string_field = 'changed'
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+    def test_save_invalidates_snapshots(self, mock_cache):
+        mock_cache.get.return_value = None
+        ExampleConfig(changed_by=self.user, string_field='first').save()
+        self.assertEquals(ExampleConfig.current().string_field, 'first')
+
+        ExampleConfig(changed_by=self.user, string_field='second').save()
+        self.assertEquals(ExampleConfig.current().string_field, 'second')
+        self.assertEquals(mock_cache.set.call_args_list[-2][0][0], VERSION_CACHE_KEY)
+
+    def test_save_invalidates_snapshots_after_cache(self, mock_cache):
+        ExampleKeyedConfig(changed_by=self.user, left='a', right='b').save()
+        self.assertEquals(
+            [name for name, __, __ in mock_cache.mock_calls if name in ('delete', 'set')],
+            ['delete', 'delete', 'set'],
+        )
+        self.assertEquals(mock_cache.set.call_args[0][0], VERSION_CACHE_KEY)
+
+    def test_version_change_invalidates_snapshots(self, mock_cache):
+        mock_cache.get.side_effect = lambda key: 'version1' if key == VERSION_CACHE_KEY else None
+        with freeze_time('2012-01-01 00:00:00'):
+            self.assertEquals(ExampleConfig.current().string_field, '')
+
+        # Another process saves a new entry.
+        ExampleConfig.objects.bulk_create([ExampleConfig(changed_by=self.user, string_field='other')])
+        mock_cache.get.side_effect = lambda key: 'version2' if key == VERSION_CACHE_KEY else None
+
+        with freeze_time('2012-01-01 00:00:30'):
+            self.assertEquals(ExampleConfig.current().string_field, '')
+        with freeze_time('2012-01-01 00:01:00'):
+            self.assertEquals(ExampleConfig.current().string_field, 'other')
+
+    def test_snapshots_expire_with_cache_timeout(self, mock_cache):
+        mock_cache.get.side_effect = lambda key: 'version1' if key == VERSION_CACHE_KEY else None
+        with freeze_time('2012-01-01 00:00:00'):
+            self.assertEquals(ExampleConfig.current().string_field, '')
+
+        # An entry saved by another process without changing the version is
+        # seen once the snapshot is as old as the cache timeout.
+        ExampleConfig.objects.bulk_create([ExampleConfig(changed_by=self.user, string_field='other')])
+        with freeze_time('2012-01-01 00:04:00'):
+            self.assertEquals(ExampleConfig.current().string_field, '')
+        with freeze_time('2012-01-01 00:05:00'):
+            self.assertEquals(ExampleConfig.current().string_field, 'other')
+
+    def test_invalidated_again_after_request(self, mock_cache):
+        ExampleKeyedConfig(changed_by=self.user, left='a', right='b').save()
+        mock_cache.reset_mock()
+
+        # Other processes may have cached the old entry before the save was committed.
+        request_finished.send(sender=None)
+        self.assertEquals(
+            {call[0][0] for call in mock_cache.delete.call_args_list},
+            {ExampleKeyedConfig.cache_key_name('a', 'b'), ExampleKeyedConfig.key_values_cache_key_name()},
+        )
+        self.assertEquals(mock_cache.set.call_args[0][0], VERSION_CACHE_KEY)
+
+        # Only once
+        mock_cache.reset_mock()
+        request_finished.send(sender=None)
+        self.assertFalse(mock_cache.set.called)
+
+    @override_settings(CONFIGURATION_MODEL_SNAPSHOT_TTL=0)
+    def test_snapshots_disabled(self, mock_cache):
+        mock_cache.get.return_value = None
+        ExampleConfig.current()
+        ExampleConfig.current()
+        self.assertEquals(
+            self._cache_get_keys(mock_cache),
+            [ExampleConfig.cache_key_name(), ExampleConfig.cache_key_name()],
+        )
+
+    def test_current_many(self, mock_cache):
+        ExampleKeyedConfig(changed_by=self.user, left='a', right='b', string_field='ab').save()
+        ExampleKeyedConfig(changed_by=self.user, left='c', right='d', string_field='cd').save()
+        mock_cache.get.return_value = None
+        mock_cache.get_many.return_value = {
+            ExampleKeyedConfig.cache_key_name('c', 'd'): ExampleKeyedConfig(left='c', right='d', string_field='cached'),
+        }
+
+        with self.assertNumQueries(1):
+            current = ExampleKeyedConfig.current_many([('a', 'b'), ('c', 'd'), ('e', 'f')])
+        self.assertEquals(
+            {key: entry.string_field for key, entry in current.iteritems()},
+            {('a', 'b'): 'ab', ('c', 'd'): 'cached', ('e', 'f'): ''},
+        )
+        self.assertEquals(
+            set(mock_cache.set_many.call_args[0][0]),
+            {ExampleKeyedConfig.cache_key_name('a', 'b'), ExampleKeyedConfig.cache_key_name('e', 'f')},
+        )
+
+        # The entries are then served from the snapshots.
+        with self.assertNumQueries(0):
+            current = ExampleKeyedConfig.current_many([('a', 'b'), ('c', 'd')])
+        self.assertEquals(current[('c', 'd')].string_field, 'cached')
+        self.assertEquals(mock_cache.get_many.call_count, 1)
+
+
 @ddt.ddt
 class ConfigurationModelAPITests(TestCase):
     """
@@ -2,14 +2,21 @@
 Add and create new modes for running courses on this particular LMS
 """
 from datetime import datetime, timedelta
+import threading
 import pytz
 
 from collections import namedtuple, defaultdict
 from config_models.models import ConfigurationModel
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.core.signals import request_finished
+from django.db import connection, models
 from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils.translation import ugettext_lazy as _
+from request_cache.middleware import RequestCache
 from xmodule_django.models import CourseKeyField
 
 Mode = namedtuple('Mode',
@@ -25,6 +32,18 @@ Mode = namedtuple('Mode',
                       'bulk_sku',
                   ])
 
+COURSE_MODES_CACHE_KEY = u'course_modes.course_modes.{course_id}'
+COURSE_MODES_REQUEST_CACHE_NAME = 'course_modes.course_modes'
+
+# The cached modes of a course are dropped when one of them is saved or
+# deleted, and again once a request that changed them is committed, so this is
+# only a fail-safe for changes committed after their post_save elsewhere.
+COURSE_MODES_CACHE_TIMEOUT = 5 * 60
+
+# The courses whose modes were changed in the transaction of the current
+# request, and whose cached modes are dropped again once it is committed.
+_uncommitted_mode_changes = threading.local()  # pylint: disable=invalid-name
+
 
 class CourseMode(models.Model):
     """
@@ -182,6 +201,58 @@ class CourseMode(models.Model):
             self.expiration_datetime_is_explicit = True
         self._expiration_datetime = new_datetime
 
+    @classmethod
+    def is_cache_enabled(cls):
+        """
+        Returns whether the modes of courses are read from the cache.
+        """
+        return settings.FEATURES.get('ENABLE_COURSE_MODES_CACHE', False)
+
+    @classmethod
+    def cache_key(cls, course_id):
+        """
+        Returns the key of the cached modes of the course.
+        """
+        return COURSE_MODES_CACHE_KEY.format(course_id=unicode(course_id))
+
+    @classmethod
+    def cached_modes_for_courses(cls, course_id_list):
+        """
+        Returns all the modes of the courses, including expired and credit
+        modes, as lists of `Mode` keyed by course id.
+
+        The modes are read from the request cache, then from the shared
+        cache, and the modes of the remaining courses from the database with a
+        single query.
+
+        Arguments:
+            course_id_list (list): List of `CourseKey`s
+        """
+        request_cache = RequestCache.get_request_cache(COURSE_MODES_REQUEST_CACHE_NAME)
+        modes_by_course = {
+            course_id: request_cache[course_id] for course_id in course_id_list if course_id in request_cache
+        }
+
+        missing_course_ids = {
+            cls.cache_key(course_id): course_id for course_id in course_id_list if course_id not in modes_by_course
+        }
+        if missing_course_ids:
+            for key, modes in cache.get_many(missing_course_ids.keys()).iteritems():
+                modes_by_course[missing_course_ids.pop(key)] = modes
+
+        if missing_course_ids:
+            loaded_modes = {course_id: [] for course_id in missing_course_ids.itervalues()}
+            for mode in cls.objects.filter(course_id__in=loaded_modes.keys()):
+                loaded_modes[mode.course_id].append(mode.to_tuple())
+            cache.set_many(
+                {cls.cache_key(course_id): modes for course_id, modes in loaded_modes.iteritems()},
+                COURSE_MODES_CACHE_TIMEOUT
+            )
+            modes_by_course.update(loaded_modes)
+
+        request_cache.update(modes_by_course)
+        return modes_by_course
+
     @classmethod
     def all_modes_for_courses(cls, course_id_list):
         """Find all modes for a list of course IDs, including expired modes.
@@ -196,8 +267,13 @@ class CourseMode(models.Model):
 
         """
         modes_by_course = defaultdict(list)
-        for mode in cls.objects.filter(course_id__in=course_id_list):
-            modes_by_course[mode.course_id].append(mode.to_tuple())
+        if cls.is_cache_enabled():
+            for course_id, modes in cls.cached_modes_for_courses(course_id_list).iteritems():
+                if modes:
+                    modes_by_course[course_id] = list(modes)
+        else:
+            for mode in cls.objects.filter(course_id__in=course_id_list):
+                modes_by_course[mode.course_id].append(mode.to_tuple())
 
         # Assign default modes if nothing available in the database
         missing_courses = set(course_id_list) - set(modes_by_course.keys())
@@ -251,6 +327,12 @@ class CourseMode(models.Model):
 
         """
         now = datetime.now(pytz.UTC)
+        if cls.is_cache_enabled():
+            return [
+                mode for mode in cls.cached_modes_for_courses([course_id])[course_id]
+                if mode.min_price > 0 and (mode.expiration_datetime is None or mode.expiration_datetime >= now)
+            ]
+
         found_course_modes = cls.objects.filter(
             Q(course_id=course_id) &
             Q(min_price__gt=0) &
@@ -262,7 +344,7 @@ class CourseMode(models.Model):
         return [mode.to_tuple() for mode in found_course_modes]
 
     @classmethod
-    def modes_for_course(cls, course_id, include_expired=False, only_selectable=True):
+    def modes_for_course(cls, course_id, include_expired=False, only_selectable=True, all_modes=None):
         """
         Returns a list of the non-expired modes for a given course id
 
@@ -280,28 +362,44 @@ class CourseMode(models.Model):
                 aren't available to users until they complete the course, so
                 they are hidden in track selection.)
 
+            all_modes (list of `Mode`): If provided, all the modes of the course,
+                including expired and credit modes, as returned by
+                `all_modes_for_courses`. They are filtered instead of querying
+                the modes of the course.
+
         Returns:
             list of `Mode` tuples
 
         """
         now = datetime.now(pytz.UTC)
 
-        found_course_modes = cls.objects.filter(course_id=course_id)
+        if all_modes is None and cls.is_cache_enabled():
+            all_modes = cls.cached_modes_for_courses([course_id])[course_id]
 
-        # Filter out expired course modes if include_expired is not set
-        if not include_expired:
-            found_course_modes = found_course_modes.filter(
-                Q(_expiration_datetime__isnull=True) | Q(_expiration_datetime__gte=now)
-            )
+        if all_modes is not None:
+            modes = [
+                mode for mode in all_modes
+                if (include_expired or mode.expiration_datetime is None or mode.expiration_datetime >= now) and
+                not (only_selectable and mode.slug in cls.CREDIT_MODES)
+            ]
+        else:
+            found_course_modes = cls.objects.filter(course_id=course_id)
+
+            # Filter out expired course modes if include_expired is not set
+            if not include_expired:
+                found_course_modes = found_course_modes.filter(
+                    Q(_expiration_datetime__isnull=True) | Q(_expiration_datetime__gte=now)
+                )
 
-        # Credit course modes are currently not shown on the track selection page;
-        # they're available only when students complete a course.  For this reason,
-        # we exclude them from the list if we're only looking for selectable modes
-        # (e.g. on the track selection page or in the payment/verification flows).
-        if only_selectable:
-            found_course_modes = found_course_modes.exclude(mode_slug__in=cls.CREDIT_MODES)
+            # Credit course modes are currently not shown on the track selection page;
+            # they're available only when students complete a course.  For this reason,
+            # we exclude them from the list if we're only looking for selectable modes
+            # (e.g. on the track selection page or in the payment/verification flows).
+            if only_selectable:
+                found_course_modes = found_course_modes.exclude(mode_slug__in=cls.CREDIT_MODES)
+
+            modes = ([mode.to_tuple() for mode in found_course_modes])
 
-        modes = ([mode.to_tuple() for mode in found_course_modes])
         if not modes:
             modes = [cls.DEFAULT_MODE]
 
@@ -648,6 +746,35 @@ class CourseMode(models.Model):
         )
 
 
+@receiver(post_save, sender=CourseMode)
+@receiver(post_delete, sender=CourseMode)
+def invalidate_course_modes_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cached modes of the course of a saved or deleted mode.
+    """
+    cache.delete(CourseMode.cache_key(instance.course_id))
+    RequestCache.get_request_cache(COURSE_MODES_REQUEST_CACHE_NAME).pop(instance.course_id, None)
+
+    # Until the change is committed, other processes may cache the old modes again.
+    if connection.in_atomic_block:
+        if not hasattr(_uncommitted_mode_changes, 'course_ids'):
+            _uncommitted_mode_changes.course_ids = set()
+        _uncommitted_mode_changes.course_ids.add(instance.course_id)
+
+
+@receiver(request_finished)
+def uncache_course_modes_after_request(sender, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cached modes of the courses whose modes were changed in the
+    request again, now that its transaction is committed. Django 1.8 has no
+    on_commit hook.
+    """
+    course_ids = getattr(_uncommitted_mode_changes, 'course_ids', None)
+    if course_ids:
+        del _uncommitted_mode_changes.course_ids
+        cache.delete_many([CourseMode.cache_key(course_id) for course_id in course_ids])
+
+
 class CourseModesArchive(models.Model):
     """
     Store the past values of course_mode that a course had in the past. We decided on having
@@ -9,8 +9,11 @@ from datetime import datetime, timedelta
 import itertools
 
 import ddt
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.core.signals import request_finished
 from django.test import TestCase
+from mock import patch
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from opaque_keys.edx.locator import CourseLocator
 import pytz
@@ -18,6 +21,8 @@ import pytz
 from course_modes.helpers import enrollment_mode_display
 from course_modes.models import CourseMode, Mode
 from course_modes.tests.factories import CourseModeFactory
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from request_cache.middleware import RequestCache
 
 
 @ddt.ddt
@@ -471,3 +476,78 @@ class CourseModeModelTest(TestCase):
             self.assertTrue(is_error_expected, "Did not expect a ValidationError to be thrown.")
         else:
             self.assertFalse(is_error_expected, "Expected a ValidationError to be thrown.")
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_MODES_CACHE': True})
+class CourseModeCacheTest(CacheIsolationTestCase):
+    """
+    Tests of the cached modes of courses.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(CourseModeCacheTest, self).setUp()
+        self.course_key = CourseLocator('Test', 'TestCourse', 'TestCourseRun')
+        now = datetime.now(pytz.UTC)
+        CourseModeFactory(course_id=self.course_key, mode_slug=CourseMode.AUDIT, min_price=0)
+        CourseModeFactory(
+            course_id=self.course_key,
+            mode_slug=CourseMode.VERIFIED,
+            min_price=10,
+            expiration_datetime=now - timedelta(days=1),
+        )
+        CourseModeFactory(course_id=self.course_key, mode_slug=CourseMode.CREDIT_MODE, min_price=20)
+
+    def test_modes_filtered_in_memory(self):
+        with self.assertNumQueries(1):
+            self.assertEqual([mode.slug for mode in CourseMode.modes_for_course(self.course_key)], [CourseMode.AUDIT])
+            self.assertItemsEqual(
+                [mode.slug for mode in CourseMode.modes_for_course(self.course_key, include_expired=True)],
+                [CourseMode.AUDIT, CourseMode.VERIFIED],
+            )
+            self.assertEqual(
+                [mode.slug for mode in CourseMode.paid_modes_for_course(self.course_key)],
+                [CourseMode.CREDIT_MODE],
+            )
+            self.assertIsNone(CourseMode.mode_for_course(self.course_key, CourseMode.VERIFIED))
+            self.assertTrue(CourseMode.can_auto_enroll(self.course_key))
+
+    def test_modes_shared_across_requests(self):
+        CourseMode.modes_for_course(self.course_key)
+        RequestCache.clear_request_cache()
+        with self.assertNumQueries(0):
+            CourseMode.modes_for_course(self.course_key)
+
+    def test_invalidated_on_save(self):
+        CourseMode.modes_for_course(self.course_key)
+        CourseModeFactory(course_id=self.course_key, mode_slug=CourseMode.HONOR, min_price=0)
+        self.assertItemsEqual(
+            [mode.slug for mode in CourseMode.modes_for_course(self.course_key)],
+            [CourseMode.AUDIT, CourseMode.HONOR],
+        )
+
+    def test_invalidated_after_request(self):
+        CourseMode.modes_for_course(self.course_key)
+        cache_key = CourseMode.cache_key(self.course_key)
+        old_modes = cache.get(cache_key)
+        CourseModeFactory(course_id=self.course_key, mode_slug=CourseMode.HONOR, min_price=0)
+
+        # Another process caches the old modes before the new one is committed.
+        cache.set(cache_key, old_modes)
+        request_finished.send(sender=None)
+        RequestCache.clear_request_cache()
+        self.assertItemsEqual(
+            [mode.slug for mode in CourseMode.modes_for_course(self.course_key)],
+            [CourseMode.AUDIT, CourseMode.HONOR],
+        )
+
+    def test_invalidated_on_delete(self):
+        CourseMode.modes_for_course(self.course_key)
+        CourseMode.objects.filter(course_id=self.course_key, mode_slug=CourseMode.AUDIT).delete()
+        self.assertEqual(CourseMode.modes_for_course(self.course_key), [CourseMode.DEFAULT_MODE])
+
+    def test_default_mode_for_courses_without_modes(self):
+        other_course_key = CourseLocator('Test', 'OtherCourse', 'TestCourseRun')
+        all_modes = CourseMode.all_modes_for_courses([self.course_key, other_course_key])
+        self.assertEqual(len(all_modes[self.course_key]), 3)
+        self.assertEqual(all_modes[other_course_key], [CourseMode.DEFAULT_MODE])
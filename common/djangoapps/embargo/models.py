@@ -11,6 +11,7 @@ file and check it in at the same time as your model changes. To do that,
 3. Add the migration file created in edx-platform/common/djangoapps/embargo/migrations/
 """
 
+import bisect
 import ipaddr
 import json
 import logging
@@ -20,6 +21,7 @@ from django.utils.translation import ugettext as _, ugettext_lazy
 from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.db.models.signals import post_save, post_delete
+from django.utils.lru_cache import lru_cache
 
 from django_countries.fields import CountryField
 from django_countries import countries
@@ -675,11 +677,30 @@ class IPFilter(ConfigurationModel):
     class IPFilterList(object):
         """
         Represent a list of IP addresses with support of networks.
+
+        The networks are indexed as sorted, disjoint ranges of addresses for
+        each IP version, so that membership is checked with a binary search.
         """
 
         def __init__(self, ips):
             self.networks = [ipaddr.IPNetwork(ip) for ip in ips]
 
+            ranges = {}
+            for network in self.networks:
+                ranges.setdefault(network.version, []).append((int(network.network), int(network.broadcast)))
+
+            # Maps IP versions to the sorted starts and the ends of the merged ranges
+            self._index = {}
+            for version, version_ranges in ranges.iteritems():
+                starts, ends = [], []
+                for start, end in sorted(version_ranges):
+                    if ends and start <= ends[-1] + 1:
+                        ends[-1] = max(ends[-1], end)
+                    else:
+                        starts.append(start)
+                        ends.append(end)
+                self._index[version] = (starts, ends)
+
         def __iter__(self):
             for network in self.networks:
                 yield network
@@ -690,26 +711,35 @@ class IPFilter(ConfigurationModel):
             except ValueError:
                 return False
 
-            for network in self.networks:
-                if network.Contains(ip):
-                    return True
+            if ip.version not in self._index:
+                return False
+            starts, ends = self._index[ip.version]
+            position = bisect.bisect_right(starts, int(ip)) - 1
+            return position >= 0 and int(ip) <= ends[position]
 
-            return False
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _ip_filter_list(ips):
+        """
+        Return the IPFilterList of a comma-separated list of IP addresses.
+
+        The lists of the current and recent configurations are kept by each
+        process, so that their index is only built once.
+        """
+        if ips == '':
+            return []
+        return IPFilter.IPFilterList([addr.strip() for addr in ips.split(',')])
 
     @property
     def whitelist_ips(self):
         """
         Return a list of valid IP addresses to whitelist
         """
-        if self.whitelist == '':
-            return []
-        return self.IPFilterList([addr.strip() for addr in self.whitelist.split(',')])
+        return self._ip_filter_list(self.whitelist)
 
     @property
     def blacklist_ips(self):
         """
         Return a list of valid IP addresses to blacklist
         """
-        if self.blacklist == '':
-            return []
-        return self.IPFilterList([addr.strip() for addr in self.blacklist.split(',')])
+        return self._ip_filter_list(self.blacklist)
@@ -105,6 +105,20 @@ class EmbargoModelsTest(CacheIsolationTestCase):
         self.assertTrue('1.1.1.0' in cblacklist)
         self.assertFalse('1.2.0.0' in cblacklist)
 
+    def test_ip_network_index(self):
+        blacklist = '1.1.0.0/16, 1.1.5.0/24, 1.2.0.0/16, 10.0.0.1, 2002:c0a8:101::/64, 1.4.0.0/16'
+        IPFilter(blacklist=blacklist).save()
+
+        cblacklist = IPFilter.current().blacklist_ips
+        for addr in ('1.1.0.0', '1.1.5.7', '1.2.255.255', '10.0.0.1', '2002:c0a8:101::42', '1.4.0.1'):
+            self.assertIn(addr, cblacklist)
+        for addr in ('1.0.255.255', '1.3.0.0', '10.0.0.2', '0.0.0.0', '2002:c0a8:102::42', 'not an ip'):
+            self.assertNotIn(addr, cblacklist)
+        self.assertEqual(len(list(cblacklist)), 6)
+
+        # The list is indexed once per configuration.
+        self.assertIs(IPFilter.current().blacklist_ips, cblacklist)
+
 
 class RestrictedCourseTest(CacheIsolationTestCase):
     """Test RestrictedCourse model. """
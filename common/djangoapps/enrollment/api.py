@@ -17,7 +17,7 @@ log = logging.getLogger(__name__)
 DEFAULT_DATA_API = 'enrollment.data'
 
 
-def get_enrollments(user_id):
+def get_enrollments(user_id, fields=None, paginate=None):
     """Retrieves all the courses a user is enrolled in.
 
     Takes a user and retrieves all relative enrollments. Includes information regarding how the user is enrolled
@@ -25,6 +25,9 @@ def get_enrollments(user_id):
 
     Args:
         user_id (str): The username of the user we want to retrieve course enrollment information for.
+        fields (list): If provided, the names of the only fields of the enrollments to return.
+        paginate (callable): If provided, called with the enrollments of the user, and returns
+            the enrollments of the requested page, which are the only ones returned.
 
     Returns:
         A list of enrollment information for the given user.
@@ -89,7 +92,7 @@ def get_enrollments(user_id):
         ]
 
     """
-    return _data_api().get_course_enrollments(user_id)
+    return _data_api().get_course_enrollments(user_id, fields=fields, paginate=paginate)
 
 
 def get_enrollment(user_id, course_id):
@@ -7,6 +7,7 @@ import logging
 from django.contrib.auth.models import User
 from opaque_keys.edx.keys import CourseKey
 
+from course_modes.models import CourseMode
 from enrollment.errors import (
     CourseEnrollmentClosedError, CourseEnrollmentFullError,
     CourseEnrollmentExistsError, UserNotFoundError, InvalidEnrollmentAttribute
@@ -23,13 +24,21 @@ from student.models import (
 log = logging.getLogger(__name__)
 
 
-def get_course_enrollments(user_id):
+def get_course_enrollments(user_id, fields=None, paginate=None):
     """Retrieve a list representing all aggregated data for a user's course enrollments.
 
     Construct a representation of all course enrollment data for a specific user.
 
+    The course overviews and modes of all the enrolled courses are loaded at
+    once, instead of course by course while serializing the enrollments.
+
     Args:
         user_id (str): The name of the user to retrieve course enrollment information for.
+        fields (list): If provided, the names of the only fields of the enrollments to return.
+            The course modes are not loaded when "course_details" is not one of them.
+        paginate (callable): If provided, called with the queryset of the user's enrollments, and
+            returns the enrollments of the requested page, which are the only ones loaded and
+            serialized. Enrollments in deleted courses are left out of the page.
 
     Returns:
         A serializable list of dictionaries of all aggregated enrollment data for a user.
@@ -38,19 +47,32 @@ def get_course_enrollments(user_id):
     qset = CourseEnrollment.objects.filter(
         user__username=user_id,
         is_active=True
-    ).order_by('created')
-
-    enrollments = CourseEnrollmentSerializer(qset, many=True).data
+    ).select_related('user').order_by('created')
+    enrollments = list(paginate(qset) if paginate is not None else qset)
+
+    course_overviews = {
+        course_overview.id: course_overview
+        for course_overview in CourseOverview.objects.filter(
+            id__in=[enrollment.course_id for enrollment in enrollments],
+            version__gte=CourseOverview.VERSION,
+        )
+    }
 
-    # Find deleted courses and filter them out of the results
+    # Find deleted courses and filter them out of the results. The overviews
+    # of the courses that were not loaded above are loaded one at a time.
     deleted = []
     valid = []
     for enrollment in enrollments:
-        if enrollment.get("course_details") is not None:
+        enrollment._course_overview = course_overviews.get(enrollment.course_id)  # pylint: disable=protected-access
+        if enrollment.course_overview is not None:
             valid.append(enrollment)
         else:
             deleted.append(enrollment)
 
+    all_course_modes = {}
+    if fields is None or "course_details" in fields:
+        all_course_modes = CourseMode.all_modes_for_courses([enrollment.course_id for enrollment in valid])
+
     if deleted:
         log.warning(
             (
@@ -59,7 +81,12 @@ def get_course_enrollments(user_id):
             ), user_id,
         )
 
-    return valid
+    return CourseEnrollmentSerializer(
+        valid,
+        many=True,
+        fields=fields,
+        context={'all_course_modes': all_course_modes},
+    ).data
 
 
 def get_course_enrollment(username, course_id):
@@ -50,11 +50,15 @@ class CourseSerializer(serializers.Serializer):  # pylint: disable=abstract-meth
     def get_course_modes(self, obj):
         """
         Retrieve course modes associated with the course.
+
+        The modes of all the serialized courses may be loaded at once and
+        passed, keyed by course id, in the 'all_course_modes' context.
         """
         course_modes = CourseMode.modes_for_course(
             obj.id,
             include_expired=self.include_expired,
-            only_selectable=False
+            only_selectable=False,
+            all_modes=self.context.get('all_course_modes', {}).get(obj.id),
         )
         return [
             ModeSerializer(mode).data
@@ -72,6 +76,17 @@ class CourseEnrollmentSerializer(serializers.ModelSerializer):
     course_details = CourseSerializer(source="course_overview")
     user = serializers.SerializerMethodField('get_username')
 
+    def __init__(self, *args, **kwargs):
+        """
+        Arguments:
+            fields (list): If provided, the names of the only fields to serialize.
+        """
+        fields = kwargs.pop('fields', None)
+        super(CourseEnrollmentSerializer, self).__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
     def get_username(self, model):
         """Retrieves the username from the associated model."""
         return model.username
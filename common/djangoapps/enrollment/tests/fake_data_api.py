@@ -25,9 +25,9 @@ _VERIFIED_MODE_EXPIRED = []
 
 
 # pylint: disable=unused-argument
-def get_course_enrollments(student_id):
+def get_course_enrollments(student_id, fields=None, paginate=None):  # pylint: disable=unused-argument
     """Stubbed out Enrollment data request."""
-    return _ENROLLMENTS
+    return paginate(_ENROLLMENTS) if paginate is not None else _ENROLLMENTS
 
 
 def get_course_enrollment(student_id, course_id):
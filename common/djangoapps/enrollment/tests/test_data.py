@@ -10,6 +10,8 @@ from mock import patch
 from nose.tools import raises
 from pytz import UTC
 from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from course_modes.models import CourseMode
 from enrollment import data
@@ -42,6 +44,20 @@ class EnrollmentDataTest(ModuleStoreTestCase):
         self.user = UserFactory.create(username=self.USERNAME, email=self.EMAIL, password=self.PASSWORD)
         self.client.login(username=self.USERNAME, password=self.PASSWORD)
 
+    def test_get_course_enrollments_paginated(self):
+        courses = [self.course] + [CourseFactory.create(number=course_number) for course_number in ['1', '2']]
+        for course in courses:
+            data.create_course_enrollment(self.user.username, unicode(course.id), 'honor', True)
+
+        with patch.object(CourseMode, 'all_modes_for_courses', return_value={}) as mock_all_modes:
+            results = data.get_course_enrollments(self.user.username, paginate=lambda queryset: queryset[1:2])
+        self.assertEqual(
+            [result['course_details']['course_id'] for result in results],
+            [unicode(courses[1].id)],
+        )
+        # Only the courses of the page are loaded.
+        self.assertEqual(mock_all_modes.call_args[0][0], [courses[1].id])
+
     @ddt.data(
         # Default (no course modes in the database)
         # Expect that users are automatically enrolled as "honor".
@@ -145,6 +161,36 @@ class EnrollmentDataTest(ModuleStoreTestCase):
         updated_results = data.get_course_enrollments(self.user.username)
         self.assertEqual(results, updated_results)
 
+    def test_get_course_enrollments_queries(self):
+        """
+        The course overviews and modes of all the enrollments are loaded at once.
+        """
+        query_counts = []
+        for course_number in ['1', '2', '3']:
+            course = CourseFactory.create(number=course_number)
+            self._create_course_modes(['honor', 'verified'], course=course)
+            data.create_course_enrollment(self.user.username, unicode(course.id), 'honor', True)
+            # Load the course overview of the new course.
+            data.get_course_enrollments(self.user.username)
+
+            with CaptureQueriesContext(connection) as queries:
+                results = data.get_course_enrollments(self.user.username)
+            self.assertEqual(len(results), int(course_number))
+            query_counts.append(len(queries))
+
+        self.assertEqual(len(set(query_counts)), 1)
+
+    def test_get_course_enrollments_fields(self):
+        self._create_course_modes(['honor', 'verified'])
+        data.create_course_enrollment(self.user.username, unicode(self.course.id), 'honor', True)
+
+        results = data.get_course_enrollments(self.user.username, fields=['mode', 'is_active'])
+        self.assertEqual(results, [{'mode': 'honor', 'is_active': True}])
+
+        with patch.object(CourseMode, 'all_modes_for_courses') as mock_all_modes:
+            data.get_course_enrollments(self.user.username, fields=['mode'])
+        self.assertFalse(mock_all_modes.called)
+
     @ddt.data(
         # Default (no course modes in the database)
         # Expect that users are automatically enrolled as "honor".
@@ -369,6 +369,57 @@ class EnrollmentTest(EnrollmentTestMixin, ModuleStoreTestCase, APITestCase):
         self.client.logout()
         self._assert_enrollments_visible_in_list([self.course, other_course], use_server_key=True)
 
+    def test_enrollment_list_fields(self):
+        CourseModeFactory.create(course_id=self.course.id, mode_slug=CourseMode.HONOR)
+        self.assert_enrollment_status(course_id=unicode(self.course.id), max_mongo_calls=0)
+
+        response = self.client.get(reverse('courseenrollments'), {'fields': 'mode,is_active'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), [{'mode': CourseMode.HONOR, 'is_active': True}])
+
+        # Course staff only see the requested fields of the enrollments in their courses.
+        other_course = CourseFactory.create(emit_signals=True)
+        self.assert_enrollment_status(course_id=unicode(other_course.id), max_mongo_calls=0)
+        staff_user = UserFactory.create(username='staff', email='staff@example.com', password=self.PASSWORD)
+        CourseStaffRole(self.course.id).add_users(staff_user)
+        self.client.login(username='staff', password=self.PASSWORD)
+        response = self.client.get(reverse('courseenrollments'), {'user': self.user.username, 'fields': 'mode'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), [{'mode': CourseMode.HONOR}])
+
+    def test_enrollment_list_unknown_fields(self):
+        self.assert_enrollment_status(course_id=unicode(self.course.id), max_mongo_calls=0)
+        response = self.client.get(reverse('courseenrollments'), {'fields': 'mode,grade'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('grade', json.loads(response.content)['message'])
+
+    def test_enrollment_list_pagination(self):
+        courses = [self.course] + [CourseFactory.create(emit_signals=True) for __ in range(2)]
+        for course in courses:
+            self.assert_enrollment_status(course_id=unicode(course.id), max_mongo_calls=0)
+
+        response = self.client.get(reverse('courseenrollments'), {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(response.content)
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(data['num_pages'], 2)
+        self.assertEqual(
+            [enrollment['course_details']['course_id'] for enrollment in data['results']],
+            [unicode(course.id) for course in courses[:2]]
+        )
+
+        response = self.client.get(reverse('courseenrollments'), {'page_size': 2, 'page': 2})
+        data = json.loads(response.content)
+        self.assertEqual(
+            [enrollment['course_details']['course_id'] for enrollment in data['results']],
+            [unicode(courses[2].id)]
+        )
+        self.assertIsNone(data['next'])
+
+        # Without pagination parameters, all the enrollments are listed.
+        response = self.client.get(reverse('courseenrollments'))
+        self.assertEqual(len(json.loads(response.content)), 3)
+
     def test_user_does_not_match_param(self):
         """
         The view should return status 404 if the enrollment username does not match the username of the user
@@ -3,6 +3,7 @@ The Enrollment API Views should be simple, lean HTTP endpoints for API access. T
 consist primarily of authentication, request validation, and serialization.
 
 """
+from functools import partial
 import logging
 
 from django.core.exceptions import ObjectDoesNotExist
@@ -11,6 +12,7 @@ from opaque_keys import InvalidKeyError
 from course_modes.models import CourseMode
 from lms.djangoapps.commerce.utils import audit_log
 from openedx.core.djangoapps.user_api.preferences.api import update_email_opt_in
+from openedx.core.lib.api.paginators import DefaultPagination
 from openedx.core.lib.api.permissions import ApiKeyHeaderPermission, ApiKeyHeaderPermissionIsAuthenticated
 from rest_framework import status
 from rest_framework.response import Response
@@ -32,6 +34,7 @@ from enrollment.errors import (
     CourseModeNotFoundError,
     CourseEnrollmentExistsError
 )
+from enrollment.serializers import CourseEnrollmentSerializer
 from student.auth import user_has_role
 from student.models import User
 from student.roles import CourseStaffRole, GlobalStaff
@@ -280,6 +283,11 @@ class EnrollmentCourseDetailView(APIView):
             )
 
 
+class EnrollmentListPagination(DefaultPagination):
+    """Paginate the enrollments of a user. """
+    page_size = 20
+
+
 @can_disable_rate_limit
 class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
     """
@@ -312,6 +320,8 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
 
             GET /api/enrollment/v1/enrollment
 
+            GET /api/enrollment/v1/enrollment?fields=course_details,mode&page=1&page_size=20
+
             POST /api/enrollment/v1/enrollment {
 
                 "mode": "credit",
@@ -362,6 +372,24 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
               * user: Optional. The user ID of the currently logged in user. You
                 cannot use the command to enroll a different user.
 
+            **GET Parameters**
+
+              A GET request can include the following parameters.
+
+              * user: Optional. The username of the learner whose enrollments
+                are listed. Defaults to the currently logged in user.
+
+              * fields: Optional. A comma separated list of the names of the
+                only values of each course enrollment to return, such as
+                "mode,is_active". The course modes are not loaded when
+                course_details is not one of them.
+
+              * page: Optional. The page of enrollments to return. When page or
+                page_size is provided, the enrollments are paginated.
+
+              * page_size: Optional. The number of enrollments per page. The
+                default is 20 and the maximum is 100.
+
         **GET Response Values**
 
             If an unspecified error occurs when the user tries to obtain a
@@ -390,6 +418,23 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
             returned along with a collection of course enrollments for the
             user or for the newly created enrollment.
 
+            If the enrollments are paginated, the response is a collection
+            with the following values, instead of the list of enrollments.
+
+            * count: The number of enrollments.
+
+            * num_pages: The number of pages.
+
+            * current_page: The number of the returned page.
+
+            * start: The index of the first returned enrollment.
+
+            * next: The URL of the next page, or null.
+
+            * previous: The URL of the previous page, or null.
+
+            * results: The course enrollments of the page.
+
             Each course enrollment contains the following values.
 
             * course_details: A collection that includes the following
@@ -472,10 +517,46 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
 
         Users who have the global staff permission can access all enrollment data for all
         courses.
+
+        The enrollments are paginated when the 'page' or 'page_size' GET parameter is provided,
+        and only the values named by the comma separated 'fields' GET parameter are returned.
+        Unknown field names are rejected with a 400 response.
         """
         username = request.GET.get('user', request.user.username)
+        can_view_all = (
+            username == request.user.username or GlobalStaff().has_user(request.user) or
+            self.has_api_key_permissions(request)
+        )
+
+        fields = None
+        if request.GET.get('fields'):
+            fields = [field.strip() for field in request.GET['fields'].split(',') if field.strip()]
+            unknown_fields = set(fields) - set(CourseEnrollmentSerializer.Meta.fields)
+            if unknown_fields:
+                return Response(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    data={
+                        "message": u"Unknown enrollment fields: {fields}".format(
+                            fields=u", ".join(sorted(unknown_fields))
+                        )
+                    }
+                )
+        # The courses of the enrollments are needed to filter the enrollments visible to course staff.
+        query_fields = fields
+        if fields is not None and not can_view_all and 'course_details' not in fields:
+            query_fields = fields + ['course_details']
+
+        paginator = None
+        paginate = None
+        if 'page' in request.GET or 'page_size' in request.GET:
+            paginator = EnrollmentListPagination()
+            # The enrollments visible to course staff are only known once they are
+            # loaded, so they are paginated afterwards.
+            if can_view_all:
+                paginate = partial(paginator.paginate_queryset, request=request, view=self)
+
         try:
-            enrollment_data = api.get_enrollments(username)
+            enrollment_data = api.get_enrollments(username, fields=query_fields, paginate=paginate)
         except CourseEnrollmentError:
             return Response(
                 status=status.HTTP_400_BAD_REQUEST,
@@ -485,15 +566,21 @@ class EnrollmentListView(APIView, ApiKeyPermissionMixIn):
                     ).format(username=username)
                 }
             )
-        if username == request.user.username or GlobalStaff().has_user(request.user) or \
-                self.has_api_key_permissions(request):
-            return Response(enrollment_data)
-        filtered_data = []
-        for enrollment in enrollment_data:
-            course_key = CourseKey.from_string(enrollment["course_details"]["course_id"])
-            if user_has_role(request.user, CourseStaffRole(course_key)):
-                filtered_data.append(enrollment)
-        return Response(filtered_data)
+        if not can_view_all:
+            filtered_data = []
+            for enrollment in enrollment_data:
+                course_key = CourseKey.from_string(enrollment["course_details"]["course_id"])
+                if user_has_role(request.user, CourseStaffRole(course_key)):
+                    if query_fields is not fields:
+                        enrollment.pop("course_details")
+                    filtered_data.append(enrollment)
+            enrollment_data = filtered_data
+
+        if paginator is not None:
+            if paginate is None:
+                enrollment_data = paginator.paginate_queryset(enrollment_data, request, view=self)
+            return paginator.get_paginated_response(enrollment_data)
+        return Response(enrollment_data)
 
     def post(self, request):
         """Enrolls the currently logged-in user in a course.
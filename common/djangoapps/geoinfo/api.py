@@ -0,0 +1,123 @@
+"""
+Country lookups of IP addresses.
+
+The GeoIP databases are opened once per process, memory-mapped, and reopened
+when their file changes. The countries of recently seen addresses are kept in
+a bounded least recently used cache, whose size is set by
+settings.GEOIP_COUNTRY_CODE_CACHE_SIZE.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pygeoip
+from django.conf import settings
+
+
+# How often the GeoIP database files are checked for changes, in seconds.
+RELOAD_CHECK_INTERVAL = 60
+
+_MISSING = object()
+
+
+class GeoIPReader(object):
+    """
+    A GeoIP database reader shared by the threads of the process.
+    """
+    def __init__(self, path_setting_name):
+        """
+        Arguments:
+            path_setting_name (str): The name of the setting with the path of
+                the database file.
+        """
+        self.path_setting_name = path_setting_name
+        self._geoip = None
+        self._version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """
+        Return the pygeoip.GeoIP of the database, reopening it if its file
+        has changed since it was last opened.
+        """
+        current_time = time.time()
+        if self._geoip is None or current_time - self._checked_at >= RELOAD_CHECK_INTERVAL:
+            with self._lock:
+                path = getattr(settings, self.path_setting_name)
+                version = (path, os.path.getmtime(path))
+                if self._geoip is None or version != self._version:
+                    if self._geoip is not None:
+                        # The cached country codes may come from the previous database.
+                        country_codes.clear()
+                    self._geoip = pygeoip.GeoIP(path, pygeoip.MMAP_CACHE)
+                    self._version = version
+                self._checked_at = current_time
+        return self._geoip
+
+
+class CountryCodeCache(object):
+    """
+    A thread-safe least recently used cache of the country codes of IP addresses.
+    """
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ip_addr):
+        """
+        Return the cached country code of ip_addr, or _MISSING.
+        """
+        with self._lock:
+            country_code = self._entries.pop(ip_addr, _MISSING)
+            if country_code is not _MISSING:
+                self._entries[ip_addr] = country_code
+            return country_code
+
+    def set(self, ip_addr, country_code, max_size):
+        """
+        Cache the country code of ip_addr, evicting the least recently used
+        entries beyond max_size.
+        """
+        with self._lock:
+            self._entries[ip_addr] = country_code
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop all the cached country codes.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+ipv4_reader = GeoIPReader('GEOIP_PATH')  # pylint: disable=invalid-name
+ipv6_reader = GeoIPReader('GEOIPV6_PATH')  # pylint: disable=invalid-name
+country_codes = CountryCodeCache()  # pylint: disable=invalid-name
+
+
+def country_code_from_ip(ip_addr):
+    """
+    Return the country code associated with an IP address.
+    Handles both IPv4 and IPv6 addresses.
+
+    Args:
+        ip_addr (str): The IP address to look up.
+
+    Returns:
+        str: A 2-letter country code.
+    """
+    cache_size = getattr(settings, 'GEOIP_COUNTRY_CODE_CACHE_SIZE', 0)
+    if cache_size:
+        country_code = country_codes.get(ip_addr)
+        if country_code is not _MISSING:
+            return country_code
+
+    reader = ipv6_reader if ip_addr.find(':') >= 0 else ipv4_reader
+    country_code = reader.get().country_code_by_addr(ip_addr)
+
+    if cache_size:
+        country_codes.set(ip_addr, country_code, cache_size)
+    return country_code
@@ -0,0 +1,63 @@
+"""
+Tests for the country lookups of IP addresses.
+"""
+from mock import patch
+import pygeoip
+
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from geoinfo import api
+
+
+@override_settings(GEOIP_COUNTRY_CODE_CACHE_SIZE=2)
+class CountryCodeFromIpTests(TestCase):
+    """
+    Tests of country_code_from_ip.
+    """
+    def setUp(self):
+        super(CountryCodeFromIpTests, self).setUp()
+        api.country_codes.clear()
+        self.addCleanup(api.country_codes.clear)
+        patcher = patch.object(pygeoip.GeoIP, 'country_code_by_addr', side_effect=self.mock_country_code_by_addr)
+        self.mock_lookup = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def mock_country_code_by_addr(self, ip_addr):
+        """
+        Gives us a fake set of IPs
+        """
+        ip_dict = {
+            '117.79.83.1': 'CN',
+            '4.0.0.0': 'SD',
+            '2001:da8:20f:1502:edcf:550b:4a9c:207d': 'CN',
+        }
+        return ip_dict.get(ip_addr, 'US')
+
+    def test_reader_shared(self):
+        self.assertIs(api.ipv4_reader.get(), api.ipv4_reader.get())
+        self.assertIsNot(api.ipv4_reader.get(), api.ipv6_reader.get())
+
+    def test_country_code_cached(self):
+        self.assertEqual(api.country_code_from_ip('117.79.83.1'), 'CN')
+        self.assertEqual(api.country_code_from_ip('2001:da8:20f:1502:edcf:550b:4a9c:207d'), 'CN')
+        self.assertEqual(api.country_code_from_ip('117.79.83.1'), 'CN')
+        self.assertEqual(self.mock_lookup.call_count, 2)
+
+    def test_least_recently_used_evicted(self):
+        api.country_code_from_ip('117.79.83.1')
+        api.country_code_from_ip('4.0.0.0')
+        api.country_code_from_ip('117.79.83.1')
+        api.country_code_from_ip('8.8.8.8')
+        self.assertEqual(self.mock_lookup.call_count, 3)
+
+        # '4.0.0.0' was the least recently used address, so it is looked up again.
+        self.assertEqual(api.country_code_from_ip('117.79.83.1'), 'CN')
+        self.assertEqual(api.country_code_from_ip('4.0.0.0'), 'SD')
+        self.assertEqual(self.mock_lookup.call_count, 4)
+
+    @override_settings(GEOIP_COUNTRY_CODE_CACHE_SIZE=0)
+    def test_cache_disabled(self):
+        api.country_code_from_ip('117.79.83.1')
+        api.country_code_from_ip('117.79.83.1')
+        self.assertEqual(self.mock_lookup.call_count, 2)
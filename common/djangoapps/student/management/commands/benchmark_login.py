@@ -0,0 +1,215 @@
+"""Management command to measure the latency of the login endpoint under concurrent load."""
+import json
+import logging
+import random
+import time
+from multiprocessing.pool import ThreadPool
+from optparse import make_option
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.urlresolvers import NoReverseMatch, reverse
+from django.db import connection, reset_queries
+from django.test.client import Client
+
+from student.models import UserProfile
+from util.query import QueryCounter
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+BENCHMARK_USERNAME = u'login_benchmark_{}'
+BENCHMARK_EMAIL = u'login_benchmark_{}@example.com'
+BENCHMARK_PASSWORD = 'login_benchmark'
+
+
+def percentile(sorted_values, fraction):
+    """
+    Return the value below which the given fraction of the sorted values fall.
+    """
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Command(BaseCommand):
+    """Management command to measure the latency of the login endpoint under concurrent load."""
+
+    help = """
+    Log benchmark users in concurrently through the login endpoint, in process,
+    and report the latency, throughput and database queries of the logins.
+    The benchmark users are created if they don't exist, and deleted at the
+    end of the run. As they are active users with a known password, the
+    command refuses to run unless settings.DEBUG is set or --create-users is
+    passed. Not meant to be run against production databases.
+
+    Example:
+
+    Run 1000 logins of 50 users by 20 threads, with a tenth of wrong passwords.
+        $ ... benchmark_login -n 1000 -c 20 -u 50 --failure-rate 0.1 --create-users
+    """
+
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '-n', '--requests',
+            dest='requests',
+            type='int',
+            default=200,
+            help='the number of logins to run'
+        ),
+        make_option(
+            '-c', '--concurrency',
+            dest='concurrency',
+            type='int',
+            default=10,
+            help='the number of logins to run at the same time'
+        ),
+        make_option(
+            '-u', '--users',
+            dest='users',
+            type='int',
+            default=20,
+            help='the number of users to log in'
+        ),
+        make_option(
+            '--failure-rate',
+            dest='failure_rate',
+            type='float',
+            default=0.0,
+            help='the fraction of the logins made with a wrong password'
+        ),
+        make_option(
+            '--create-users',
+            dest='create_users',
+            action='store_true',
+            default=False,
+            help='allow creating the benchmark users when settings.DEBUG is not set'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        num_requests = options['requests']
+        concurrency = options['concurrency']
+        num_users = options['users']
+        failure_rate = options['failure_rate']
+        if num_requests < 1 or concurrency < 1 or num_users < 1:
+            raise CommandError('The numbers of requests, concurrent requests and users must be positive.')
+        if not 0 <= failure_rate <= 1:
+            raise CommandError('The failure rate must be between 0 and 1.')
+        if not (settings.DEBUG or options['create_users']):
+            raise CommandError(
+                'This command creates active users with a known password. '
+                'Pass --create-users to run it when settings.DEBUG is not set.'
+            )
+
+        self.url = self._get_login_url()
+        created_user_ids = []
+        try:
+            self._run_benchmark(num_requests, concurrency, num_users, failure_rate, created_user_ids)
+        finally:
+            User.objects.filter(id__in=created_user_ids).delete()
+            logger.info(u'Deleted %d benchmark users.', len(created_user_ids))
+
+    def _run_benchmark(self, num_requests, concurrency, num_users, failure_rate, created_user_ids):
+        """
+        Run the logins and report their statistics, adding the ids of the
+        benchmark users created to created_user_ids.
+        """
+        emails = []
+        for index in xrange(num_users):
+            user, created = self._get_or_create_user(index)
+            emails.append(user.email)
+            if created:
+                created_user_ids.append(user.id)
+        logins = [
+            (index, emails[index % num_users], random.random() < failure_rate)
+            for index in xrange(num_requests)
+        ]
+
+        start_time = time.time()
+        if concurrency == 1:
+            results = self._run_logins(logins)
+        else:
+            pool = ThreadPool(concurrency)
+            try:
+                chunks = pool.map(self._run_logins_in_thread, [logins[i::concurrency] for i in xrange(concurrency)])
+            finally:
+                pool.close()
+                pool.join()
+            results = [result for chunk in chunks for result in chunk]
+        total_time = time.time() - start_time
+
+        latencies = sorted(latency for latency, __, __ in results)
+        stats = {
+            'requests': num_requests,
+            'successes': sum(1 for __, success, __ in results if success),
+            'throughput': num_requests / total_time,
+            'p50': percentile(latencies, 0.5) * 1000,
+            'p90': percentile(latencies, 0.9) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'max': latencies[-1] * 1000,
+            'queries': sum(queries for __, __, queries in results) / float(num_requests),
+        }
+        self.stdout.write(
+            u'{requests} logins, {successes} successful, {throughput:.1f} logins/s\n'
+            u'latency (ms): p50 {p50:.1f}, p90 {p90:.1f}, p99 {p99:.1f}, max {max:.1f}\n'
+            u'queries per login: {queries:.1f}\n'.format(**stats)
+        )
+
+    def _get_login_url(self):
+        """
+        Return the url of the login endpoint of the LMS or Studio.
+        """
+        try:
+            return reverse('login_post')
+        except NoReverseMatch:
+            return reverse('login')
+
+    def _get_or_create_user(self, index):
+        """
+        Return the benchmark user with the given index and whether it was
+        created, creating the active user and their profile if they don't exist.
+        """
+        user, created = User.objects.get_or_create(
+            username=BENCHMARK_USERNAME.format(index),
+            defaults={'email': BENCHMARK_EMAIL.format(index), 'is_active': True},
+        )
+        if created:
+            user.set_password(BENCHMARK_PASSWORD)
+            user.save()
+            UserProfile.objects.create(user=user, name=user.username)
+            logger.info(u'Created the benchmark user %s.', user.username)
+        return user, created
+
+    def _run_logins_in_thread(self, logins):
+        """
+        Run the logins in a thread of the pool, closing its database connection afterwards.
+        """
+        try:
+            return self._run_logins(logins)
+        finally:
+            connection.close()
+
+    def _run_logins(self, logins):
+        """
+        Run the logins, and return the (latency in seconds, success, number of
+        queries) of each of them.
+        """
+        results = []
+        for index, email, wrong_password in logins:
+            # Spread the logins over addresses, as the failed logins are rate limited by address.
+            client = Client(REMOTE_ADDR='10.0.{}.{}'.format(index // 250 % 250, index % 250 + 1))
+            password = 'wrong_{}'.format(BENCHMARK_PASSWORD) if wrong_password else BENCHMARK_PASSWORD
+
+            # The log of queries is also reset when the request starts.
+            reset_queries()
+            counter = QueryCounter()
+            start_time = time.time()
+            response = client.post(self.url, {'email': email, 'password': password})
+            latency = time.time() - start_time
+            queries, __ = counter.stop()
+
+            try:
+                success = bool(json.loads(response.content).get('success'))
+            except ValueError:
+                success = False
+            results.append((latency, success, queries))
+        return results
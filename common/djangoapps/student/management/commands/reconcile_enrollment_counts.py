@@ -0,0 +1,56 @@
+"""Management command to recompute the materialized enrollment counts of courses."""
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from opaque_keys import InvalidKeyError
+from opaque_keys.edx.keys import CourseKey
+from optparse import make_option
+
+from student.models import CourseEnrollmentCount
+
+logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
+
+
+class Command(BaseCommand):
+    """Management command to recompute the materialized enrollment counts of courses."""
+
+    help = """
+    Recompute the counts of active enrollments in each mode of courses from
+    their enrollments, correcting any drift caused by enrollments updated in
+    bulk. Meant to be run periodically when the ENABLE_ENROLLMENT_COUNTS
+    feature is enabled.
+
+    Example:
+
+    Recompute the counts of all the courses whose counts have been computed.
+        $ ... reconcile_enrollment_counts
+
+    Recompute the counts of the given course.
+        $ ... reconcile_enrollment_counts -c course-v1:SomeCourse+SomethingX+2016
+    """
+
+    option_list = BaseCommand.option_list + (
+        make_option(
+            '-c', '--course',
+            dest='course',
+            default=None,
+            help='the course to recompute the enrollment counts of'
+        ),
+    )
+
+    def handle(self, *args, **options):
+        course_id = options.get('course')
+
+        if course_id is not None:
+            try:
+                course_keys = [CourseKey.from_string(course_id)]
+            except InvalidKeyError:
+                raise CommandError('Course ID {} is invalid.'.format(course_id))
+        else:
+            course_keys = set(
+                enrollment_count.course_id for enrollment_count in CourseEnrollmentCount.objects.only('course_id')
+            )
+
+        for course_key in course_keys:
+            counts = CourseEnrollmentCount.reconcile(course_key)
+            logger.info('Reconciled the enrollment counts of course %s: %s.', unicode(course_key), counts)
@@ -0,0 +1,52 @@
+"""Tests for the benchmark_login command."""
+from StringIO import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from student.tests.factories import UserFactory
+
+
+class BenchmarkLoginTests(TestCase):
+    """Tests for the benchmark_login command."""
+
+    def test_benchmark(self):
+        out = StringIO()
+        call_command('benchmark_login', requests=4, concurrency=1, users=2, create_users=True, stdout=out)
+        self.assertIn('4 logins, 4 successful', out.getvalue())
+        # The benchmark users are deleted at the end of the run.
+        self.assertFalse(User.objects.filter(username__startswith='login_benchmark_').exists())
+
+    def test_existing_users_kept(self):
+        UserFactory(username='login_benchmark_0', email='login_benchmark_0@example.com', password='login_benchmark')
+        call_command('benchmark_login', requests=2, concurrency=1, users=2, create_users=True, stdout=StringIO())
+        self.assertEqual(
+            list(User.objects.filter(username__startswith='login_benchmark_').values_list('username', flat=True)),
+            ['login_benchmark_0'],
+        )
+
+    def test_failed_logins(self):
+        out = StringIO()
+        call_command(
+            'benchmark_login', requests=2, concurrency=1, users=1, failure_rate=1, create_users=True, stdout=out
+        )
+        self.assertIn('2 logins, 0 successful', out.getvalue())
+
+    @override_settings(DEBUG=True)
+    def test_debug(self):
+        out = StringIO()
+        call_command('benchmark_login', requests=1, concurrency=1, users=1, stdout=out)
+        self.assertIn('1 logins, 1 successful', out.getvalue())
+
+    def test_invalid_options(self):
+        with self.assertRaises(CommandError):
+            call_command('benchmark_login', requests=0)
+        with self.assertRaises(CommandError):
+            call_command('benchmark_login', failure_rate=2)
+        # Users are only created with settings.DEBUG or --create-users.
+        with self.assertRaises(CommandError):
+            call_command('benchmark_login', requests=1, users=1)
+        self.assertFalse(User.objects.filter(username__startswith='login_benchmark_').exists())
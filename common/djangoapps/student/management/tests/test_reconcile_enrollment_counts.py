@@ -0,0 +1,37 @@
+"""Tests for the reconcile_enrollment_counts command."""
+import unittest
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
+
+from student.models import CourseEnrollment, CourseEnrollmentCount
+from student.tests.factories import UserFactory
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_ENROLLMENT_COUNTS': True})
+class ReconcileEnrollmentCountsTests(TestCase):
+    """Tests for the reconcile_enrollment_counts command."""
+
+    def setUp(self):
+        super(ReconcileEnrollmentCountsTests, self).setUp()
+        self.course_key = CourseLocator('edX', 'EnrollmentCounts', 'run')
+        for user in UserFactory.create_batch(2):
+            CourseEnrollment.enroll(user, self.course_key, mode='audit')
+        CourseEnrollmentCount.get_counts(self.course_key)
+
+    def test_bulk_update_reconciled(self):
+        """Verify that the counts of enrollments updated in bulk are corrected."""
+        CourseEnrollment.objects.filter(course_id=self.course_key).update(mode='honor')
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course_key), {'audit': 2})
+
+        call_command('reconcile_enrollment_counts')
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course_key), {'honor': 2})
+
+    def test_invalid_course(self):
+        with self.assertRaises(CommandError):
+            call_command('reconcile_enrollment_counts', course='invalid')
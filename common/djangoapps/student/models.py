@@ -31,7 +31,7 @@ from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.db import models, IntegrityError, transaction
-from django.db.models import Count
+from django.db.models import Count, F, Q
 from django.db.models.signals import pre_save, post_save
 from django.dispatch import receiver, Signal
 from django.core.exceptions import ObjectDoesNotExist
@@ -790,9 +790,28 @@ class PasswordHistory(models.Model):
         return True
 
 
+# The failure counts and lockouts of users cached when the
+# ENABLE_LOGIN_FAILURES_CACHE feature is enabled, and how long they are cached.
+LOGIN_FAILURES_CACHE_KEY = u'student.login_failures.count.{user_id}'
+LOGIN_LOCKOUT_CACHE_KEY = u'student.login_failures.lockout_until.{user_id}'
+LOGIN_FAILURES_CACHE_TIMEOUT = 60 * 60 * 24
+
+# How long after their change the cached login failures of a user are written
+# to the database. Another write is scheduled if the one that was scheduled
+# hasn't run after LOGIN_FAILURES_WRITE_SCHEDULED_TIMEOUT seconds.
+LOGIN_FAILURES_WRITE_DELAY = 10
+LOGIN_FAILURES_WRITE_SCHEDULED_CACHE_KEY = u'student.login_failures.write_scheduled.{user_id}'
+LOGIN_FAILURES_WRITE_SCHEDULED_TIMEOUT = 60
+
+
 class LoginFailures(models.Model):
     """
     This model will keep track of failed login attempts
+
+    When the ENABLE_LOGIN_FAILURES_CACHE feature is enabled, the failure
+    counts and lockouts are read and updated in the cache, and written behind
+    to this model by the student.write_login_failures task. The cache then
+    needs to be shared by the processes and to support atomic increments.
     """
     user = models.ForeignKey(User)
     failure_count = models.IntegerField(default=0)
@@ -818,11 +837,82 @@ class LoginFailures(models.Model):
         """
         return settings.FEATURES['ENABLE_MAX_FAILED_LOGIN_ATTEMPTS']
 
+    @classmethod
+    def is_cache_enabled(cls):
+        """
+        Returns whether the failure counts and lockouts are kept in the cache
+        """
+        return settings.FEATURES.get('ENABLE_LOGIN_FAILURES_CACHE', False)
+
+    @classmethod
+    def _cache_keys(cls, user_id):
+        """
+        Returns the cache keys of the failure count and lockout of a user
+        """
+        return LOGIN_FAILURES_CACHE_KEY.format(user_id=user_id), LOGIN_LOCKOUT_CACHE_KEY.format(user_id=user_id)
+
+    @classmethod
+    def _get_cached_state(cls, user):
+        """
+        Returns the cached (failure count, lockout until) of a user, caching
+        them from the database first if they are not cached. The lockout is
+        None if the user has not been locked out.
+        """
+        count_key, lockout_key = cls._cache_keys(user.id)
+        cached = cache.get_many([count_key, lockout_key])
+        if len(cached) < 2:
+            try:
+                record = cls._get_record_for_user(user)
+                failure_count, lockout_until = record.failure_count, record.lockout_until
+            except ObjectDoesNotExist:
+                failure_count, lockout_until = 0, None
+            # Don't overwrite the changes made since the cache was read.
+            # Lockouts are cached as 0 when there is none.
+            cache.add(count_key, failure_count, LOGIN_FAILURES_CACHE_TIMEOUT)
+            cache.add(lockout_key, lockout_until or 0, LOGIN_FAILURES_CACHE_TIMEOUT)
+            cached = {count_key: failure_count, lockout_key: lockout_until}
+            cached.update(cache.get_many([count_key, lockout_key]))
+        return cached[count_key], cached[lockout_key] or None
+
+    @classmethod
+    def _schedule_write(cls, user_id):
+        """
+        Schedules the write of the cached failure count and lockout of a user
+        to the database, unless it is already scheduled
+        """
+        scheduled_key = LOGIN_FAILURES_WRITE_SCHEDULED_CACHE_KEY.format(user_id=user_id)
+        if cache.add(scheduled_key, True, LOGIN_FAILURES_WRITE_SCHEDULED_TIMEOUT):
+            from student.tasks import write_login_failures
+            write_login_failures.apply_async(args=[user_id], countdown=LOGIN_FAILURES_WRITE_DELAY)
+
+    @classmethod
+    def write_cached_state(cls, user_id):
+        """
+        Writes the cached failure count and lockout of a user to the database
+        """
+        cache.delete(LOGIN_FAILURES_WRITE_SCHEDULED_CACHE_KEY.format(user_id=user_id))
+        count_key, lockout_key = cls._cache_keys(user_id)
+        cached = cache.get_many([count_key, lockout_key])
+        if len(cached) < 2:
+            # They were evicted, and will be cached from the database again.
+            return
+
+        failure_count, lockout_until = cached[count_key], cached[lockout_key] or None
+        records = cls.objects.filter(user_id=user_id)
+        if not failure_count and not lockout_until:
+            records.delete()
+        elif not records.update(failure_count=failure_count, lockout_until=lockout_until):
+            cls.objects.create(user_id=user_id, failure_count=failure_count, lockout_until=lockout_until)
+
     @classmethod
     def is_user_locked_out(cls, user):
         """
         Static method to return in a given user has his/her account locked out
         """
+        if cls.is_cache_enabled():
+            __, lockout_until = cls._get_cached_state(user)
+            return bool(lockout_until and datetime.now(UTC) < lockout_until)
+
         try:
             record = cls._get_record_for_user(user)
             if not record.lockout_until:
@@ -841,6 +931,25 @@ class LoginFailures(models.Model):
         """
         Ticks the failed attempt counter
         """
+        if cls.is_cache_enabled():
+            count_key, lockout_key = cls._cache_keys(user.id)
+            cls._get_cached_state(user)
+            try:
+                failure_count = cache.incr(count_key)
+            except ValueError:
+                # The count was evicted since it was cached, or isn't cached at all.
+                log.warning(u"Could not increment the cached login failures of user %s.", user.id)
+            else:
+                if failure_count >= settings.MAX_FAILED_LOGIN_ATTEMPTS_ALLOWED:
+                    lockout_period_secs = settings.MAX_FAILED_LOGIN_ATTEMPTS_LOCKOUT_PERIOD_SECS
+                    cache.set(
+                        lockout_key,
+                        datetime.now(UTC) + timedelta(seconds=lockout_period_secs),
+                        LOGIN_FAILURES_CACHE_TIMEOUT,
+                    )
+                cls._schedule_write(user.id)
+                return
+
         record, _ = LoginFailures.objects.get_or_create(user=user)
         record.failure_count = record.failure_count + 1
         max_failures_allowed = settings.MAX_FAILED_LOGIN_ATTEMPTS_ALLOWED
@@ -858,6 +967,13 @@ class LoginFailures(models.Model):
         """
         Removes the lockout counters (normally called after a successful login)
         """
+        if cls.is_cache_enabled():
+            failure_count, lockout_until = cls._get_cached_state(user)
+            if not failure_count and not lockout_until:
+                return
+            # Writes scheduled by earlier failures will find no failures.
+            cache.set_many(dict.fromkeys(cls._cache_keys(user.id), 0), LOGIN_FAILURES_CACHE_TIMEOUT)
+
         try:
             entry = cls._get_record_for_user(user)
             entry.delete()
@@ -885,6 +1001,10 @@ class AlreadyEnrolledError(CourseEnrollmentException):
     pass
 
 
+# The number of enrollments written in each transaction by CourseEnrollment.bulk_enroll.
+BULK_ENROLL_BATCH_SIZE = 500
+
+
 class CourseEnrollmentManager(models.Manager):
     """
     Custom manager for CourseEnrollment with Table-level filter methods.
@@ -897,6 +1017,9 @@ class CourseEnrollmentManager(models.Manager):
         'course_id' is the course_id to return enrollments
         """
 
+        if CourseEnrollmentCount.is_enabled():
+            return sum(CourseEnrollmentCount.get_counts(course_id).itervalues())
+
         enrollment_number = super(CourseEnrollmentManager, self).get_queryset().filter(
             course_id=course_id,
             is_active=1
@@ -926,6 +1049,15 @@ class CourseEnrollmentManager(models.Manager):
         admins = CourseInstructorRole(course_locator).users_with_role()
         coaches = CourseCcxCoachRole(course_locator).users_with_role()
 
+        if CourseEnrollmentCount.is_enabled():
+            # Only the enrollments of the few users with these roles are counted.
+            enrolled_admins = super(CourseEnrollmentManager, self).get_queryset().filter(
+                Q(user__in=staff) | Q(user__in=admins) | Q(user__in=coaches),
+                course_id=course_id,
+                is_active=1,
+            ).count()
+            return self.num_enrolled_in(course_id) - enrolled_admins
+
         return super(CourseEnrollmentManager, self).get_queryset().filter(
             course_id=course_id,
             is_active=1,
@@ -954,6 +1086,11 @@ class CourseEnrollmentManager(models.Manager):
         Returns a dictionary that stores the total enrollment count for a course, as well as the
         enrollment count for each individual mode.
         """
+        if CourseEnrollmentCount.is_enabled():
+            enroll_dict = defaultdict(int, CourseEnrollmentCount.get_counts(course_id))
+            enroll_dict['total'] = sum(enroll_dict.itervalues())
+            return enroll_dict
+
         # Unfortunately, Django's "group by"-style queries look super-awkward
         query = use_read_replica_if_available(
             super(CourseEnrollmentManager, self).get_queryset().filter(course_id=course_id, is_active=True).values(
@@ -1018,6 +1155,15 @@ class CourseEnrollment(models.Model):
         # When the property .course_overview is accessed for the first time, this variable will be set.
         self._course_overview = None
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(CourseEnrollment, cls).from_db(db, field_names, values)
+        # Remember the activation and mode loaded from the database, so that
+        # the enrollment counts can be adjusted without reloading them on save.
+        if 'is_active' in field_names and 'mode' in field_names:
+            instance._loaded_count_state = (instance.is_active, instance.mode)  # pylint: disable=protected-access
+        return instance
+
     def __unicode__(self):
         return (
             "[CourseEnrollment] {}: {} ({}); active: ({})"
@@ -1170,43 +1316,60 @@ class CourseEnrollment(models.Model):
         """
         Emits an event to explicitly track course enrollment and unenrollment.
         """
+        self.emit_events(event_name, [self])
 
-        try:
-            context = contexts.course_context_from_course_id(self.course_id)
-            assert isinstance(self.course_id, CourseKey)
-            data = {
-                'user_id': self.user.id,
-                'course_id': self.course_id.to_deprecated_string(),
-                'mode': self.mode,
-            }
-
-            with tracker.get_tracker().context(event_name, context):
-                tracker.emit(event_name, data)
-
-                if hasattr(settings, 'LMS_SEGMENT_KEY') and settings.LMS_SEGMENT_KEY:
-                    tracking_context = tracker.get_tracker().resolve_context()
-                    analytics.track(self.user_id, event_name, {
-                        'category': 'conversion',
-                        'label': self.course_id.to_deprecated_string(),
-                        'org': self.course_id.org,
-                        'course': self.course_id.course,
-                        'run': self.course_id.run,
-                        'mode': self.mode,
-                    }, context={
-                        'ip': tracking_context.get('ip'),
-                        'Google Analytics': {
-                            'clientId': tracking_context.get('client_id')
-                        }
-                    })
+    @classmethod
+    def emit_events(cls, event_name, enrollments):
+        """
+        Emits an event for each of the given enrollments of a course, within
+        a single tracking context.
+        """
+        if not enrollments:
+            return
+        course_id = enrollments[0].course_id
 
+        try:
+            context = contexts.course_context_from_course_id(course_id)
+            assert isinstance(course_id, CourseKey)
         except:  # pylint: disable=bare-except
-            if event_name and self.course_id:
-                log.exception(
-                    u'Unable to emit event %s for user %s and course %s',
-                    event_name,
-                    self.user.username,
-                    self.course_id,
-                )
+            if event_name and course_id:
+                log.exception(u'Unable to emit event %s for course %s', event_name, course_id)
+            return
+
+        with tracker.get_tracker().context(event_name, context):
+            for enrollment in enrollments:
+                try:
+                    data = {
+                        'user_id': enrollment.user.id,
+                        'course_id': course_id.to_deprecated_string(),
+                        'mode': enrollment.mode,
+                    }
+                    tracker.emit(event_name, data)
+
+                    if hasattr(settings, 'LMS_SEGMENT_KEY') and settings.LMS_SEGMENT_KEY:
+                        tracking_context = tracker.get_tracker().resolve_context()
+                        analytics.track(enrollment.user_id, event_name, {
+                            'category': 'conversion',
+                            'label': course_id.to_deprecated_string(),
+                            'org': course_id.org,
+                            'course': course_id.course,
+                            'run': course_id.run,
+                            'mode': enrollment.mode,
+                        }, context={
+                            'ip': tracking_context.get('ip'),
+                            'Google Analytics': {
+                                'clientId': tracking_context.get('client_id')
+                            }
+                        })
+
+                except:  # pylint: disable=bare-except
+                    if event_name:
+                        log.exception(
+                            u'Unable to emit event %s for user %s and course %s',
+                            event_name,
+                            enrollment.user.username,
+                            course_id,
+                        )
 
     @classmethod
     def enroll(cls, user, course_key, mode=None, check_access=False):
@@ -1290,6 +1453,115 @@ class CourseEnrollment(models.Model):
 
         return enrollment
 
+    @classmethod
+    def bulk_enroll(cls, course_key, users, mode=None):
+        """
+        Enroll many users in a course at once. This saves immediately.
+
+        Returns the list of the users' CourseEnrollment objects.
+
+        `course_key` is our usual course_id string (e.g. "edX/Test101/2013_Fall)
+
+        `users` is a list of Django User objects. Those that haven't been saved
+               yet are saved before adding enrollments for them.
+
+        `mode` is a string specifying what kind of enrollment these are, as
+               for `enroll()`. The default is the default course mode.
+
+        Unlike `enroll()`, no access checks are made, so it is expected that
+        this method is called from a method which has already verified the
+        course exists and the users are allowed to enroll.
+
+        The enrollments are created or updated in batches of
+        BULK_ENROLL_BATCH_SIZE, with a transaction for each batch, and their
+        analytics events are emitted together. The post_save receivers of the
+        enrollments (forum roles, cohorts, history, etc.) and enrollment badges
+        run in the `student.process_bulk_enrollment` background task instead.
+        """
+        # Import here to avoid a circular import of the student models.
+        from student.tasks import process_bulk_enrollment
+
+        assert isinstance(course_key, CourseKey)
+        if mode is None:
+            mode = _default_course_mode(unicode(course_key))
+
+        users = list(users)
+        for user in users:
+            if user.id is None:
+                user.save()
+
+        enrollments = []
+        activated_enrollments = []
+        mode_changed_enrollments = []
+        for batch_start in xrange(0, len(users), BULK_ENROLL_BATCH_SIZE):
+            batch_user_ids = [user.id for user in users[batch_start:batch_start + BULK_ENROLL_BATCH_SIZE]]
+            with transaction.atomic():
+                # The activation and mode of the existing enrollments, keyed by user id.
+                previous_states = {
+                    user_id: (is_active, previous_mode)
+                    for user_id, is_active, previous_mode in cls.objects.select_for_update().filter(
+                        course_id=course_key,
+                        user_id__in=batch_user_ids,
+                    ).values_list('user_id', 'is_active', 'mode')
+                }
+                cls.objects.bulk_create([
+                    cls(user_id=user_id, course_id=course_key, mode=mode, is_active=True)
+                    for user_id in set(batch_user_ids) - set(previous_states)
+                ])
+                cls.objects.filter(
+                    course_id=course_key,
+                    user_id__in=[
+                        user_id for user_id, previous_state in previous_states.iteritems()
+                        if previous_state != (True, mode)
+                    ],
+                ).update(is_active=True, mode=mode)
+                batch_enrollments = list(
+                    cls.objects.filter(course_id=course_key, user_id__in=batch_user_ids).select_related('user')
+                )
+
+            changed_enrollments = []
+            for enrollment in batch_enrollments:
+                created = enrollment.user_id not in previous_states
+                # The events are those of enroll(), whose new enrollments are
+                # first created inactive in the default mode.
+                was_active, previous_mode = previous_states.get(
+                    enrollment.user_id, (False, CourseMode.DEFAULT_MODE_SLUG)
+                )
+                if not was_active:
+                    activated_enrollments.append(enrollment)
+                if previous_mode != mode:
+                    mode_changed_enrollments.append(enrollment)
+                if created or (was_active, previous_mode) != (True, mode):
+                    changed_enrollments.append((enrollment.id, created, None if created else previous_mode))
+            enrollments.extend(batch_enrollments)
+
+            if changed_enrollments:
+                cache.delete_many([
+                    cls.cache_key_name(enrollment.user_id, unicode(course_key)) for enrollment in batch_enrollments
+                ])
+                # Give the transaction some time to be committed, as in the
+                # verified track cohorting receivers.
+                process_bulk_enrollment.apply_async(
+                    kwargs={'course_id': unicode(course_key), 'changed_enrollments': changed_enrollments},
+                    countdown=3,
+                )
+
+        if CourseEnrollmentCount.is_enabled():
+            CourseEnrollmentCount.reconcile(course_key)
+
+        cls.emit_events(EVENT_NAME_ENROLLMENT_ACTIVATED, activated_enrollments)
+        cls.emit_events(EVENT_NAME_ENROLLMENT_MODE_CHANGED, mode_changed_enrollments)
+        if activated_enrollments:
+            dog_stats_api.increment(
+                "common.student.enrollment",
+                value=len(activated_enrollments),
+                tags=[u"org:{}".format(course_key.org),
+                      u"offering:{}".format(course_key.offering),
+                      u"mode:{}".format(mode)]
+            )
+
+        return enrollments
+
     @classmethod
     def enroll_by_email(cls, email, course_id, mode=None, ignore_errors=True):
         """
@@ -1445,11 +1717,15 @@ class CourseEnrollment(models.Model):
     def enrollments_for_user(cls, user):
         return cls.objects.filter(user=user, is_active=1)
 
-    def is_paid_course(self):
+    def is_paid_course(self, modes_dict=None):
         """
         Returns True, if course is paid
+
+        Keyword Arguments:
+            modes_dict (dict): If provided, the unexpired modes of the course
+                keyed by slug, which are otherwise queried.
         """
-        paid_course = CourseMode.is_white_label(self.course_id)
+        paid_course = CourseMode.is_white_label(self.course_id, modes_dict=modes_dict)
         if paid_course or CourseMode.is_professional_slug(self.mode):
             return True
 
@@ -1469,10 +1745,17 @@ class CourseEnrollment(models.Model):
         """Changes this `CourseEnrollment` record's mode to `mode`.  Saves immediately."""
         self.update_enrollment(mode=mode)
 
-    def refundable(self):
+    def refundable(self, user_already_has_certs_for=None, modes=None):
         """
         For paid/verified certificates, students may receive a refund if they have
         a verified certificate and the deadline for refunds has not yet passed.
+
+        Keyword Arguments:
+            user_already_has_certs_for (set of CourseKey): If provided, the
+                courses the user has a certificate in, which are otherwise
+                queried for this enrollment's course.
+            modes (list of Mode): If provided, the unexpired modes of the
+                course, which are otherwise queried.
         """
         # In order to support manual refunds past the deadline, set can_refund on this object.
         # On unenrolling, the "UNENROLL_DONE" signal calls CertificateItem.refund_cert_callback(),
@@ -1483,7 +1766,17 @@ class CourseEnrollment(models.Model):
             return True
 
         # If the student has already been given a certificate they should not be refunded
-        if GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None:
+        if user_already_has_certs_for is None:
+            has_certificate = GeneratedCertificate.certificate_for_student(self.user, self.course_id) is not None
+        else:
+            has_certificate = self.course_id in user_already_has_certs_for
+        if has_certificate:
+            return False
+
+        # The verified mode is checked before the refund cutoff date, which
+        # may require a call to the E-Commerce service.
+        course_mode = CourseMode.mode_for_course(self.course_id, 'verified', modes=modes)
+        if course_mode is None:
             return False
 
         # If it is after the refundable cutoff date they should not be refunded.
@@ -1491,20 +1784,20 @@ class CourseEnrollment(models.Model):
         if refund_cutoff_date and datetime.now(UTC) > refund_cutoff_date:
             return False
 
-        course_mode = CourseMode.mode_for_course(self.course_id, 'verified')
-        if course_mode is None:
-            return False
-        else:
-            return True
+        return True
 
     def refund_cutoff_date(self):
         """ Calculate and return the refund window end date. """
-        try:
-            attribute = self.attributes.get(namespace='order', name='order_number')
-        except ObjectDoesNotExist:
+        # The attributes are read with all() so that they can be prefetched
+        # for several enrollments.
+        order_numbers = [
+            attribute.value for attribute in self.attributes.all()
+            if attribute.namespace == 'order' and attribute.name == 'order_number'
+        ]
+        if not order_numbers:
             return None
 
-        order_number = attribute.value
+        order_number = order_numbers[0]
         order = ecommerce_api_client(self.user).orders(order_number).get()
         refund_window_start_date = max(
             datetime.strptime(order['date_placed'], ECOMMERCE_DATE_FORMAT),
@@ -1596,6 +1889,135 @@ def invalidate_enrollment_mode_cache(sender, instance, **kwargs):  # pylint: dis
     cache.delete(cache_key)
 
 
+@receiver(pre_save, sender=CourseEnrollment)
+def course_enrollment_pre_save_callback(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Capture the activation and mode of the enrollment before it is saved, for
+    the enrollment counts to be adjusted in the post_save callback.
+    """
+    if not CourseEnrollmentCount.is_enabled():
+        return
+    previous_state = None
+    if instance.pk is not None:
+        previous_state = getattr(instance, '_loaded_count_state', None)
+        if previous_state is None:
+            # The enrollment wasn't loaded from the database.
+            previous_state = CourseEnrollment.objects.filter(pk=instance.pk).values_list('is_active', 'mode').first()
+    instance._previous_count_state = previous_state or (False, None)  # pylint: disable=protected-access
+
+
+@receiver(post_save, sender=CourseEnrollment)
+def course_enrollment_post_save_callback(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Adjust the enrollment counts of the course when an enrollment is
+    activated, deactivated or changes modes.
+    """
+    previous_state = getattr(instance, '_previous_count_state', None)
+    if previous_state is None:
+        return
+    del instance._previous_count_state  # pylint: disable=protected-access
+    instance._loaded_count_state = (instance.is_active, instance.mode)  # pylint: disable=protected-access
+
+    was_active, previous_mode = previous_state
+    if previous_state == (instance.is_active, instance.mode):
+        return
+    if was_active:
+        CourseEnrollmentCount.adjust(instance.course_id, previous_mode, -1)
+    if instance.is_active:
+        CourseEnrollmentCount.adjust(instance.course_id, instance.mode, 1)
+
+
+@receiver(models.signals.post_delete, sender=CourseEnrollment)
+def course_enrollment_post_delete_callback(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Adjust the enrollment counts of the course when an active enrollment is
+    deleted.
+    """
+    if CourseEnrollmentCount.is_enabled() and instance.is_active:
+        CourseEnrollmentCount.adjust(instance.course_id, instance.mode, -1)
+
+
+class CourseEnrollmentCount(TimeStampedModel):
+    """
+    The number of active enrollments in each mode of a course.
+
+    When the ENABLE_ENROLLMENT_COUNTS feature is enabled, the counts of a
+    course are computed from CourseEnrollment the first time they are read,
+    then adjusted as its enrollments are activated, deactivated, change modes
+    or are deleted. Enrollments updated in bulk bypass these adjustments, so
+    the counts are periodically recomputed by the reconcile_enrollment_counts
+    management command.
+    """
+    course_id = CourseKeyField(max_length=255, db_index=True)
+    mode = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+
+    class Meta(object):
+        unique_together = (('course_id', 'mode'),)
+
+    def __unicode__(self):
+        return u"[CourseEnrollmentCount] {}: {} ({})".format(self.course_id, self.mode, self.count)
+
+    @classmethod
+    def is_enabled(cls):
+        """
+        Returns whether the enrollment counts are maintained and read.
+        """
+        return settings.FEATURES.get('ENABLE_ENROLLMENT_COUNTS', False)
+
+    @classmethod
+    def get_counts(cls, course_id):
+        """
+        Returns the number of active enrollments in each mode of the course,
+        keyed by mode slug.
+        """
+        counts = {
+            enrollment_count.mode: enrollment_count.count
+            for enrollment_count in cls.objects.filter(course_id=course_id)
+        }
+        if not counts:
+            counts = cls.reconcile(course_id)
+        return {mode: count for mode, count in counts.iteritems() if count}
+
+    @classmethod
+    def adjust(cls, course_id, mode, delta):
+        """
+        Adds delta to the count of the mode of the course, if the counts of
+        the course have been computed.
+        """
+        updated = cls.objects.filter(course_id=course_id, mode=mode).update(count=F('count') + delta)
+        if not updated and cls.objects.filter(course_id=course_id).exists():
+            # The first enrollment in this mode of the course.
+            cls.reconcile(course_id)
+
+    @classmethod
+    def reconcile(cls, course_id):
+        """
+        Recomputes the counts of the course from its enrollments, and returns
+        them keyed by mode slug.
+        """
+        counts = {}
+        try:
+            with transaction.atomic():
+                # Lock the counts of the course before aggregating, so that the
+                # adjustments made meanwhile are applied to the new counts
+                # instead of being overwritten by them.
+                list(cls.objects.select_for_update().filter(course_id=course_id))
+                counts = {
+                    item['mode']: item['mode__count']
+                    for item in CourseEnrollment.objects.filter(
+                        course_id=course_id, is_active=True
+                    ).values('mode').order_by().annotate(Count('mode'))
+                }
+                for mode, count in counts.iteritems():
+                    cls.objects.update_or_create(course_id=course_id, mode=mode, defaults={'count': count})
+                cls.objects.filter(course_id=course_id).exclude(mode__in=counts.keys()).update(count=0)
+        except IntegrityError:
+            # The counts were concurrently computed by another process.
+            log.info(u"Enrollment counts of course %s concurrently reconciled.", course_id)
+        return counts
+
+
 class ManualEnrollmentAudit(models.Model):
     """
     Table for tracking which enrollments were performed through manual enrollment.
@@ -0,0 +1,60 @@
+"""
+Celery tasks for the student app.
+"""
+from celery.task import task
+from celery.utils.log import get_task_logger
+from django.db.models.signals import post_save
+
+from lms.djangoapps.badges.utils import badges_enabled
+from student.models import CourseEnrollment, LoginFailures
+
+LOGGER = get_task_logger(__name__)
+
+
+@task(name='student.process_bulk_enrollment')
+def process_bulk_enrollment(course_id, changed_enrollments):
+    """
+    Run the side effects of the enrollments written by
+    CourseEnrollment.bulk_enroll, which bypasses the model's signals.
+
+    Arguments:
+        course_id (unicode): The course of the enrollments.
+        changed_enrollments (list): A (enrollment id, created, previous mode)
+            list for each of the enrollments that were created or updated.
+            The previous mode is None for created enrollments.
+    """
+    changed_enrollments = {
+        enrollment_id: (created, previous_mode)
+        for enrollment_id, created, previous_mode in changed_enrollments
+    }
+    enrollments = CourseEnrollment.objects.filter(id__in=changed_enrollments.keys()).select_related('user')
+    for enrollment in enrollments:
+        created, previous_mode = changed_enrollments[enrollment.id]
+        # The state captured by pre_save receivers for the post_save ones.
+        enrollment._old_mode = previous_mode  # pylint: disable=protected-access
+        post_save.send(
+            sender=CourseEnrollment,
+            instance=enrollment,
+            created=created,
+            update_fields=None,
+            raw=False,
+            using=enrollment._state.db,  # pylint: disable=protected-access
+        )
+
+        if badges_enabled():
+            from lms.djangoapps.badges.events.course_meta import award_enrollment_badge
+            award_enrollment_badge(enrollment.user)
+
+    LOGGER.info(u"Processed %d bulk enrollments in course %s.", len(enrollments), course_id)
+
+
+@task(name='student.write_login_failures')
+def write_login_failures(user_id):
+    """
+    Write the login failure count and lockout of a user, kept in the cache when
+    the ENABLE_LOGIN_FAILURES_CACHE feature is enabled, to the database.
+
+    Arguments:
+        user_id (int): The id of the user.
+    """
+    LoginFailures.write_cached_state(user_id)
@@ -0,0 +1,82 @@
+"""
+Tests for the materialized enrollment counts of courses.
+"""
+import unittest
+
+from django.conf import settings
+from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
+
+from student.models import CourseEnrollment, CourseEnrollmentCount
+from student.roles import CourseStaffRole
+from student.tests.factories import UserFactory
+
+
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_ENROLLMENT_COUNTS': True})
+class CourseEnrollmentCountTests(TestCase):
+    """
+    Tests of CourseEnrollmentCount.
+    """
+    def setUp(self):
+        super(CourseEnrollmentCountTests, self).setUp()
+        self.course_key = CourseLocator('edX', 'EnrollmentCounts', 'run')
+        self.users = UserFactory.create_batch(3)
+        CourseEnrollment.enroll(self.users[0], self.course_key, mode='audit')
+        CourseEnrollment.enroll(self.users[1], self.course_key, mode='verified')
+
+    def assert_counts(self, expected_counts):
+        """
+        Assert that the maintained counts of the course are the expected ones,
+        and match the counts recomputed from its enrollments.
+        """
+        self.assertEqual(CourseEnrollmentCount.get_counts(self.course_key), expected_counts)
+        recomputed_counts = CourseEnrollmentCount.reconcile(self.course_key)
+        self.assertEqual(
+            {mode: count for mode, count in recomputed_counts.iteritems() if count},
+            expected_counts,
+        )
+
+    def test_counts_computed_when_read(self):
+        self.assertFalse(CourseEnrollmentCount.objects.filter(course_id=self.course_key).exists())
+        self.assert_counts({'audit': 1, 'verified': 1})
+
+    def test_counts_maintained(self):
+        CourseEnrollmentCount.get_counts(self.course_key)
+
+        CourseEnrollment.enroll(self.users[2], self.course_key, mode='audit')
+        self.assert_counts({'audit': 2, 'verified': 1})
+
+        CourseEnrollment.unenroll(self.users[0], self.course_key)
+        self.assert_counts({'audit': 1, 'verified': 1})
+
+        CourseEnrollment.get_enrollment(self.users[1], self.course_key).change_mode('honor')
+        self.assert_counts({'audit': 1, 'honor': 1})
+
+        CourseEnrollment.get_enrollment(self.users[2], self.course_key).delete()
+        self.assert_counts({'honor': 1})
+
+    def test_counts_maintained_over_saves_of_loaded_enrollment(self):
+        CourseEnrollmentCount.get_counts(self.course_key)
+
+        enrollment = CourseEnrollment.get_enrollment(self.users[0], self.course_key)
+        enrollment.mode = 'honor'
+        enrollment.save()
+        self.assert_counts({'honor': 1, 'verified': 1})
+
+        enrollment.is_active = False
+        enrollment.save()
+        self.assert_counts({'verified': 1})
+
+    def test_counts_read_without_aggregating(self):
+        CourseEnrollmentCount.get_counts(self.course_key)
+        with self.assertNumQueries(1):
+            counts = CourseEnrollment.objects.enrollment_counts(self.course_key)
+        self.assertEqual(counts['total'], 2)
+        self.assertEqual(counts['verified'], 1)
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in(self.course_key), 2)
+
+    def test_num_enrolled_in_exclude_admins(self):
+        CourseStaffRole(self.course_key).add_users(self.users[0])
+        self.assertEqual(CourseEnrollment.objects.num_enrolled_in_exclude_admins(self.course_key), 1)
@@ -12,12 +12,14 @@ from django.contrib.auth.models import User
 from django.core.cache import cache
 from django.core.urlresolvers import reverse, NoReverseMatch
 from django.http import HttpResponseBadRequest, HttpResponse
+from freezegun import freeze_time
 import httpretty
 from mock import patch
 from social.apps.django_app.default.models import UserSocialAuth
 
 from external_auth.models import ExternalAuthMap
 from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from student.models import LoginFailures
 from student.tests.factories import UserFactory, RegistrationFactory, UserProfileFactory
 from student.views import login_oauth_token
 from third_party_auth.tests.utils import (
@@ -379,6 +381,44 @@ class LoginTest(CacheIsolationTestCase):
         self.assertIsNone(response_content["redirect_url"])
         self._assert_response(response, success=True)
 
+    @override_settings(MAX_FAILED_LOGIN_ATTEMPTS_ALLOWED=3)
+    @patch.dict(
+        "django.conf.settings.FEATURES",
+        {'ENABLE_MAX_FAILED_LOGIN_ATTEMPTS': True, 'ENABLE_LOGIN_FAILURES_CACHE': True}
+    )
+    def test_cached_login_failures(self):
+        for i in xrange(3):
+            response, _audit_log = self._login_response('test@edx.org', u'wrong_password{0}'.format(i))
+            self._assert_response(response, success=False, value='Email or password is incorrect')
+
+        # The failures were written to the database in the background.
+        record = LoginFailures.objects.get(user=self.user)
+        self.assertEqual(record.failure_count, 3)
+        self.assertIsNotNone(record.lockout_until)
+
+        response, _audit_log = self._login_response('test@edx.org', 'test_password')
+        self._assert_response(response, success=False, value='This account has been temporarily locked')
+
+        with freeze_time('2100-01-01'):
+            response, _audit_log = self._login_response('test@edx.org', 'test_password')
+        self._assert_response(response, success=True)
+        self.assertFalse(LoginFailures.objects.filter(user=self.user).exists())
+
+        # The successful logins of users without failures only read the cache.
+        with patch.object(LoginFailures, '_get_record_for_user') as mock_get_record:
+            response, _audit_log = self._login_response('test@edx.org', 'test_password')
+        self._assert_response(response, success=True)
+        self.assertFalse(mock_get_record.called)
+
+    @patch.dict(
+        "django.conf.settings.FEATURES",
+        {'ENABLE_MAX_FAILED_LOGIN_ATTEMPTS': True, 'ENABLE_LOGIN_FAILURES_CACHE': True}
+    )
+    def test_cached_login_failures_loaded_from_database(self):
+        LoginFailures.objects.create(user=self.user, failure_count=1)
+        self._login_response('test@edx.org', 'wrong_password')
+        self.assertEqual(LoginFailures.objects.get(user=self.user).failure_count, 2)
+
     def _login_response(self, email, password, patched_audit_log='student.views.AUDIT_LOG', extra_post_params=None):
         ''' Post the login info '''
         post_params = {'email': email, 'password': password}
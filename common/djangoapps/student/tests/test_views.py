@@ -6,7 +6,9 @@ import unittest
 import ddt
 from django.conf import settings
 from django.core.urlresolvers import reverse
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from edx_oauth2_provider.constants import AUTHORIZED_CLIENTS_SESSION_KEY
 from edx_oauth2_provider.tests.factories import ClientFactory, TrustedClientFactory
 from mock import patch
@@ -14,9 +16,13 @@ from pyquery import PyQuery as pq
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory
 
+from certificates.models import CertificateStatuses  # pylint: disable=import-error
+from certificates.tests.factories import GeneratedCertificateFactory  # pylint: disable=import-error
+from course_modes.models import CourseMode
+from student import views
 from student.helpers import DISABLE_UNENROLL_CERT_STATES
 from student.models import CourseEnrollment, LogoutViewConfiguration
-from student.tests.factories import UserFactory, CourseEnrollmentFactory
+from student.tests.factories import UserFactory, CourseEnrollmentFactory, CourseModeFactory
 
 PASSWORD = 'test'
 
@@ -42,7 +48,7 @@ class TestStudentDashboardUnenrollments(SharedModuleStoreTestCase):
         self.cert_status = None
         self.client.login(username=self.user.username, password=PASSWORD)
 
-    def mock_cert(self, _user, _course_overview, _course_mode):
+    def mock_cert(self, _user, _course_overview, _course_mode, cert_status=None):  # pylint: disable=unused-argument
         """ Return a preset certificate status. """
         if self.cert_status is not None:
             return {
@@ -111,6 +117,112 @@ class TestStudentDashboardUnenrollments(SharedModuleStoreTestCase):
             self.assertEqual(response.status_code, 200)
 
 
+@unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+class TestDashboardCourseData(SharedModuleStoreTestCase):
+    """
+    Tests of the assembly of the per-course data of the student dashboard.
+    """
+    ENABLED_CACHES = ['default']
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestDashboardCourseData, cls).setUpClass()
+        cls.courses = [CourseFactory.create() for __ in range(3)]
+
+    def setUp(self):
+        super(TestDashboardCourseData, self).setUp()
+        for course in self.courses:
+            CourseModeFactory(course_id=course.id, mode_slug=CourseMode.VERIFIED)
+        self.user = UserFactory()
+        for course in self.courses[:2]:
+            CourseEnrollmentFactory(course_id=course.id, user=self.user, mode=CourseMode.VERIFIED)
+        GeneratedCertificateFactory(
+            user=self.user,
+            course_id=self.courses[0].id,
+            status=CertificateStatuses.downloadable,
+            download_url='http://www.example.com/certificate.pdf',
+        )
+
+    def get_enrollments_and_modes(self):
+        """
+        Return the user's enrollments, with their course overviews loaded, and
+        the unexpired modes of their courses, as the dashboard loads them.
+        """
+        course_enrollments = list(CourseEnrollment.enrollments_for_user(self.user))
+        for enrollment in course_enrollments:
+            self.assertIsNotNone(enrollment.course_overview)
+        __, unexpired_course_modes = CourseMode.all_and_unexpired_modes_for_courses(
+            [enrollment.course_id for enrollment in course_enrollments]
+        )
+        course_modes_by_course = {
+            course_id: {mode.slug: mode for mode in modes}
+            for course_id, modes in unexpired_course_modes.iteritems()
+        }
+        return course_enrollments, course_modes_by_course
+
+    def get_course_data(self):
+        """
+        Return the dashboard course data of the user's enrollments.
+        """
+        course_enrollments, course_modes_by_course = self.get_enrollments_and_modes()
+        return views._get_dashboard_course_data(  # pylint: disable=protected-access
+            self.user, course_enrollments, course_modes_by_course,
+        )
+
+    def test_certificates_of_all_courses(self):
+        with patch('student.views.cert_info', return_value={}) as mock_cert_info:
+            self.get_course_data()
+
+        cert_statuses = {
+            call_args[0][1].id: call_args[1]['cert_status']
+            for call_args in mock_cert_info.call_args_list
+        }
+        self.assertEqual(cert_statuses[self.courses[0].id]['status'], CertificateStatuses.downloadable)
+        self.assertEqual(cert_statuses[self.courses[1].id]['status'], CertificateStatuses.unavailable)
+
+    def test_not_refundable_with_certificate(self):
+        course_data = self.get_course_data()
+        self.assertNotIn(self.courses[0].id, course_data['show_refund_option_for'])
+        self.assertIn(self.courses[1].id, course_data['show_refund_option_for'])
+
+    def test_queries_independent_of_enrollments(self):
+        CourseEnrollment.unenroll(self.user, self.courses[1].id)
+        # Load the configuration read while assembling the data.
+        self.get_course_data()
+        course_enrollments, course_modes_by_course = self.get_enrollments_and_modes()
+        with CaptureQueriesContext(connection) as queries:
+            views._get_dashboard_course_data(  # pylint: disable=protected-access
+                self.user, course_enrollments, course_modes_by_course,
+            )
+
+        for course in self.courses[1:]:
+            CourseEnrollment.enroll(self.user, course.id, mode=CourseMode.VERIFIED)
+        course_enrollments, course_modes_by_course = self.get_enrollments_and_modes()
+        self.assertEqual(len(course_enrollments), 3)
+        with self.assertNumQueries(len(queries)):
+            views._get_dashboard_course_data(  # pylint: disable=protected-access
+                self.user, course_enrollments, course_modes_by_course,
+            )
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_DASHBOARD_COURSE_DATA_CACHE': True})
+    def test_course_data_cached(self):
+        with patch('student.views.check_verify_status_by_course', return_value={}) as mock_verify_status:
+            self.get_course_data()
+            self.get_course_data()
+            self.assertEqual(mock_verify_status.call_count, 1)
+
+            # Enrolling in another course recomputes the data.
+            CourseEnrollmentFactory(course_id=self.courses[2].id, user=self.user)
+            self.get_course_data()
+            self.assertEqual(mock_verify_status.call_count, 2)
+
+    def test_course_data_not_cached(self):
+        with patch('student.views.check_verify_status_by_course', return_value={}) as mock_verify_status:
+            self.get_course_data()
+            self.get_course_data()
+            self.assertEqual(mock_verify_status.call_count, 2)
+
+
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
 class LogoutTests(TestCase):
     """ Tests for the logout functionality. """
@@ -4,6 +4,7 @@ Miscellaneous tests for the student app.
 """
 import logging
 import unittest
+from collections import defaultdict
 import ddt
 from datetime import datetime, timedelta
 from urlparse import urljoin
@@ -22,6 +23,7 @@ from django.test import TestCase
 from django.test.client import Client
 
 from course_modes.models import CourseMode
+from django_comment_common.models import FORUM_ROLE_STUDENT
 from student.models import (
     anonymous_id_for_user, user_by_anonymous_id, CourseEnrollment,
     unique_id_for_user, LinkedInAddToProfileConfiguration, UserAttribute
@@ -769,6 +771,38 @@ class EnrollInCourseTest(EnrollmentEventTestMixin, TestCase):
         CourseEnrollment.enroll(user, course_id, "audit")
         self.assert_enrollment_mode_change_event_was_emitted(user, course_id, "audit")
 
+    @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
+    def test_bulk_enrollment(self):
+        course_id = SlashSeparatedCourseKey("edX", "Test101", "2013")
+        users = [
+            User.objects.create(username="bulk{}".format(index), email="bulk{}@fake.edx.org".format(index))
+            for index in range(3)
+        ]
+        CourseEnrollment.enroll(users[0], course_id, "honor")
+        CourseEnrollment.enroll(users[1], course_id, "audit")
+        CourseEnrollment.unenroll(users[1], course_id)
+        self.mock_tracker.reset_mock()
+
+        with patch('student.models.BULK_ENROLL_BATCH_SIZE', 2):
+            enrollments = CourseEnrollment.bulk_enroll(course_id, users, "honor")
+
+        self.assertItemsEqual([enrollment.user for enrollment in enrollments], users)
+        for user in users:
+            enrollment = CourseEnrollment.get_enrollment(user, course_id)
+            self.assertTrue(enrollment.is_active)
+            self.assertEqual(enrollment.mode, "honor")
+
+        # The post_save receivers of the new enrollment ran in the background task.
+        self.assertTrue(users[2].roles.filter(course_id=course_id, name=FORUM_ROLE_STUDENT).exists())
+
+        # The user already enrolled in the mode gets no events.
+        emitted_user_ids = defaultdict(list)
+        for call_args in self.mock_tracker.emit.call_args_list:  # pylint: disable=maybe-no-member
+            event_name, data = call_args[0]
+            emitted_user_ids[event_name].append(data['user_id'])
+        self.assertItemsEqual(emitted_user_ids['edx.course.enrollment.activated'], [users[1].id, users[2].id])
+        self.assertItemsEqual(emitted_user_ids['edx.course.enrollment.mode_changed'], [users[1].id, users[2].id])
+
 
 @unittest.skipUnless(settings.ROOT_URLCONF == 'lms.urls', 'Test only valid in lms')
 class ChangeEnrollmentViewTest(ModuleStoreTestCase):
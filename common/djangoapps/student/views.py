@@ -2,6 +2,7 @@
 Student Views
 """
 import datetime
+import hashlib
 import logging
 import uuid
 import json
@@ -23,6 +24,7 @@ from django.contrib.auth.views import password_reset_confirm
 from django.contrib import messages
 from django.core.context_processors import csrf
 from django.core import mail
+from django.core.cache import cache
 from django.core.urlresolvers import reverse, NoReverseMatch, reverse_lazy
 from django.core.validators import validate_email, ValidationError
 from django.db import IntegrityError, transaction
@@ -34,6 +36,7 @@ from django.utils.http import base36_to_int, urlsafe_base64_encode, urlencode
 from django.utils.translation import ugettext as _, get_language
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.views.decorators.http import require_POST, require_GET
+from django.db.models.query import prefetch_related_objects
 from django.db.models.signals import post_save
 from django.dispatch import receiver, Signal
 from django.template.response import TemplateResponse
@@ -59,7 +62,12 @@ from student.forms import AccountCreationForm, PasswordResetFormNoActive, get_re
 from lms.djangoapps.commerce.utils import EcommerceService  # pylint: disable=import-error
 from lms.djangoapps.verify_student.models import SoftwareSecurePhotoVerification  # pylint: disable=import-error
 from bulk_email.models import Optout, BulkEmailFlag  # pylint: disable=import-error
-from certificates.models import CertificateStatuses, certificate_status_for_student
+from certificates.models import (  # pylint: disable=import-error
+    CertificateStatuses,
+    GeneratedCertificate,
+    certificate_status_for_certificate,
+    certificate_status_for_student,
+)
 from certificates.api import (  # pylint: disable=import-error
     get_certificate_url,
     has_html_certificates_enabled,
@@ -99,6 +107,7 @@ from util.milestones_helpers import (
 )
 
 from util.password_policy_validators import validate_password_strength
+from util.query import read_mostly
 import third_party_auth
 from third_party_auth import pipeline, provider
 from student.helpers import (
@@ -206,7 +215,7 @@ def process_survey_link(survey_link, user):
     return survey_link.format(UNIQUE_ID=unique_id_for_user(user))
 
 
-def cert_info(user, course_overview, course_mode):
+def cert_info(user, course_overview, course_mode, cert_status=None):
     """
     Get the certificate info needed to render the dashboard section for the given
     student and course.
@@ -215,6 +224,8 @@ def cert_info(user, course_overview, course_mode):
         user (User): A user.
         course_overview (CourseOverview): A course.
         course_mode (str): The enrollment mode (honor, verified, audit, etc.)
+        cert_status (dict): If provided, the certificate_status_for_student of
+            the user in the course, which is otherwise queried.
 
     Returns:
         dict: Empty dict if certificates are disabled or hidden, or a dictionary with keys:
@@ -229,12 +240,9 @@ def cert_info(user, course_overview, course_mode):
     """
     if not course_overview.may_certify():
         return {}
-    return _cert_info(
-        user,
-        course_overview,
-        certificate_status_for_student(user, course_overview.id),
-        course_mode
-    )
+    if cert_status is None:
+        cert_status = certificate_status_for_student(user, course_overview.id)
+    return _cert_info(user, course_overview, cert_status, course_mode)
 
 
 def reverification_info(statuses):
@@ -544,6 +552,7 @@ def is_course_blocked(request, redeemed_registration_codes, course_key):
 
 @login_required
 @ensure_csrf_cookie
+@read_mostly
 def dashboard(request):
     user = request.user
 
@@ -625,32 +634,9 @@ def dashboard(request):
         for enrollment in course_enrollments
     }
 
-    # Determine the per-course verification status
-    # This is a dictionary in which the keys are course locators
-    # and the values are one of:
-    #
-    # VERIFY_STATUS_NEED_TO_VERIFY
-    # VERIFY_STATUS_SUBMITTED
-    # VERIFY_STATUS_APPROVED
-    # VERIFY_STATUS_MISSED_DEADLINE
-    #
-    # Each of which correspond to a particular message to display
-    # next to the course on the dashboard.
-    #
-    # If a course is not included in this dictionary,
-    # there is no verification messaging to display.
-    verify_status_by_course = check_verify_status_by_course(user, course_enrollments)
-    cert_statuses = {
-        enrollment.course_id: cert_info(request.user, enrollment.course_overview, enrollment.mode)
-        for enrollment in course_enrollments
-    }
-
-    # only show email settings for Mongo course and when bulk email is turned on
-    show_email_settings_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments if (
-            BulkEmailFlag.feature_enabled(enrollment.course_id)
-        )
-    )
+    # The certificate, verification, credit, refund, payment and email
+    # settings statuses of the courses.
+    course_data = _get_dashboard_course_data(user, course_enrollments, course_modes_by_course)
 
     # Verification Attempts
     # Used to generate the "you must reverify for course x" banner
@@ -660,28 +646,24 @@ def dashboard(request):
     statuses = ["approved", "denied", "pending", "must_reverify"]
     reverifications = reverification_info(statuses)
 
-    show_refund_option_for = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.refundable()
-    )
+    # Retrieve the registration codes redeemed by the user in all of the
+    # courses at once.
+    redeemed_registration_codes_by_course = defaultdict(list)
+    for redeemed_registration in CourseRegistrationCode.objects.filter(
+            course_id__in=enrolled_course_ids,
+            registrationcoderedemption__redeemed_by=request.user
+    ).select_related('invoice_item__invoice'):
+        redeemed_registration_codes_by_course[redeemed_registration.course_id].append(redeemed_registration)
 
     block_courses = frozenset(
         enrollment.course_id for enrollment in course_enrollments
         if is_course_blocked(
             request,
-            CourseRegistrationCode.objects.filter(
-                course_id=enrollment.course_id,
-                registrationcoderedemption__redeemed_by=request.user
-            ),
+            redeemed_registration_codes_by_course[enrollment.course_id],
             enrollment.course_id
         )
     )
 
-    enrolled_courses_either_paid = frozenset(
-        enrollment.course_id for enrollment in course_enrollments
-        if enrollment.is_paid_course()
-    )
-
     # If there are *any* denied reverifications that have not been toggled off,
     # we'll display the banner
     denied_banner = any(item.display for item in reverifications["denied"])
@@ -717,21 +699,21 @@ def dashboard(request):
         'errored_courses': errored_courses,
         'show_courseware_links_for': show_courseware_links_for,
         'all_course_modes': course_mode_info,
-        'cert_statuses': cert_statuses,
-        'credit_statuses': _credit_statuses(user, course_enrollments),
-        'show_email_settings_for': show_email_settings_for,
+        'cert_statuses': course_data['cert_statuses'],
+        'credit_statuses': course_data['credit_statuses'],
+        'show_email_settings_for': course_data['show_email_settings_for'],
         'reverifications': reverifications,
         'verification_status': verification_status,
-        'verification_status_by_course': verify_status_by_course,
+        'verification_status_by_course': course_data['verification_status_by_course'],
         'verification_msg': verification_msg,
-        'show_refund_option_for': show_refund_option_for,
+        'show_refund_option_for': course_data['show_refund_option_for'],
         'block_courses': block_courses,
         'denied_banner': denied_banner,
         'billing_email': settings.PAYMENT_SUPPORT_EMAIL,
         'user': user,
         'logout_url': reverse('logout'),
         'platform_name': platform_name,
-        'enrolled_courses_either_paid': enrolled_courses_either_paid,
+        'enrolled_courses_either_paid': course_data['enrolled_courses_either_paid'],
         'provider_states': [],
         'order_history_list': order_history_list,
         'courses_requirements_not_met': courses_requirements_not_met,
@@ -751,6 +733,103 @@ def dashboard(request):
     return render_to_response('dashboard.html', context)
 
 
+def _get_dashboard_course_data(user, course_enrollments, course_modes_by_course):
+    """
+    Assemble the per-course data of the dashboard with a fixed number of
+    queries, whatever the number of enrollments.
+
+    When the ENABLE_DASHBOARD_COURSE_DATA_CACHE feature is enabled, the data
+    is cached for DASHBOARD_COURSE_DATA_CACHE_TIMEOUT seconds, keyed by the
+    user's enrollments so that enrolling, unenrolling or changing modes
+    recomputes it.
+
+    Arguments:
+        user (User): The user.
+        course_enrollments (list[CourseEnrollment]): The user's enrollments.
+        course_modes_by_course (dict): The unexpired modes of the courses,
+            keyed by course id then by slug.
+
+    Returns: dict with keys:
+        cert_statuses (dict): The cert_info of each course.
+        credit_statuses (dict): See _credit_statuses.
+        verification_status_by_course (dict): See check_verify_status_by_course.
+        show_refund_option_for (frozenset): The refundable courses.
+        enrolled_courses_either_paid (frozenset): The paid courses.
+        show_email_settings_for (frozenset): The courses with bulk email.
+    """
+    cache_key = None
+    if settings.FEATURES.get('ENABLE_DASHBOARD_COURSE_DATA_CACHE', False):
+        enrollments_digest = hashlib.md5(repr(sorted(
+            (unicode(enrollment.course_id), enrollment.mode) for enrollment in course_enrollments
+        ))).hexdigest()
+        cache_key = u'student.dashboard.course_data.{user_id}.{digest}'.format(
+            user_id=user.id,
+            digest=enrollments_digest,
+        )
+        course_data = cache.get(cache_key)
+        if course_data is not None:
+            return course_data
+
+    course_ids = [enrollment.course_id for enrollment in course_enrollments]
+    generated_certificates = {
+        generated_certificate.course_id: generated_certificate
+        for generated_certificate in GeneratedCertificate.objects.filter(user=user, course_id__in=course_ids)
+    }
+    # The order numbers of the enrollments are read to check whether they are refundable.
+    prefetch_related_objects(course_enrollments, ['attributes'])
+
+    cert_statuses = {}
+    for enrollment in course_enrollments:
+        course_modes = course_modes_by_course.get(enrollment.course_id, {})
+        cert_statuses[enrollment.course_id] = cert_info(
+            user,
+            enrollment.course_overview,
+            enrollment.mode,
+            cert_status=certificate_status_for_certificate(
+                generated_certificates.get(enrollment.course_id),
+                course_mode_slugs=course_modes.keys(),
+            ),
+        )
+    certified_course_ids = set(generated_certificates)
+
+    course_data = {
+        'cert_statuses': cert_statuses,
+        'credit_statuses': _credit_statuses(user, course_enrollments),
+        # Determine the per-course verification status
+        # This is a dictionary in which the keys are course locators
+        # and the values are one of:
+        #
+        # VERIFY_STATUS_NEED_TO_VERIFY
+        # VERIFY_STATUS_SUBMITTED
+        # VERIFY_STATUS_APPROVED
+        # VERIFY_STATUS_MISSED_DEADLINE
+        #
+        # Each of which correspond to a particular message to display
+        # next to the course on the dashboard.
+        #
+        # If a course is not included in this dictionary,
+        # there is no verification messaging to display.
+        'verification_status_by_course': check_verify_status_by_course(user, course_enrollments),
+        'show_refund_option_for': frozenset(
+            enrollment.course_id for enrollment in course_enrollments
+            if enrollment.refundable(
+                user_already_has_certs_for=certified_course_ids,
+                modes=course_modes_by_course.get(enrollment.course_id, {}).values(),
+            )
+        ),
+        'enrolled_courses_either_paid': frozenset(
+            enrollment.course_id for enrollment in course_enrollments
+            if enrollment.is_paid_course(modes_dict=course_modes_by_course.get(enrollment.course_id, {}))
+        ),
+        # only show email settings for Mongo course and when bulk email is turned on
+        'show_email_settings_for': BulkEmailFlag.courses_feature_enabled(course_ids),
+    }
+
+    if cache_key is not None:
+        cache.set(cache_key, course_data, settings.DASHBOARD_COURSE_DATA_CACHE_TIMEOUT)
+    return course_data
+
+
 def _create_recent_enrollment_message(course_enrollments, course_modes):  # pylint: disable=invalid-name
     """
     Builds a recent course enrollment message.
@@ -1165,7 +1244,8 @@ def login_user(request, error=""):  # pylint: disable=too-many-statements,unused
         email = request.POST['email']
         password = request.POST['password']
         try:
-            user = User.objects.get(email=email)
+            # Load the profile along with the user, as the rest of the login may need it.
+            user = User.objects.select_related('profile').get(email=email)
         except User.DoesNotExist:
             if settings.FEATURES['SQUELCH_PII_IN_LOGS']:
                 AUDIT_LOG.warning(u"Login failed - Unknown user email")
@@ -1222,6 +1302,13 @@ def login_user(request, error=""):  # pylint: disable=too-many-statements,unused
                 "value": _('Too many failed login attempts. Try again later.'),
             })  # TODO: this should be status code 429  # pylint: disable=fixme
 
+        if user is not None and user_found_by_email_lookup and user.id == user_found_by_email_lookup.id:
+            # Keep using the user loaded with their profile, with the backend
+            # that authenticated them and the password hash it may have upgraded.
+            user_found_by_email_lookup.backend = user.backend
+            user_found_by_email_lookup.password = user.password
+            user = user_found_by_email_lookup
+
     if user is None:
         # tick the failed login counters if the user exists in the database
         if user_found_by_email_lookup and LoginFailures.is_feature_enabled():
@@ -0,0 +1,92 @@
+"""
+Middleware for read replica routing and for the query budgets of views.
+"""
+import logging
+
+from django.conf import settings
+
+import dogstats_wrapper as dog_stats_api
+from util.query import (
+    QueryCounter,
+    pin_user_to_primary,
+    read_replica_routing_enabled,
+    reset_routing_state,
+    wrote_to_database,
+)
+
+log = logging.getLogger(__name__)
+
+
+class ReadReplicaMiddleware(object):
+    """
+    Pin the reads of users who wrote to the database to the primary database
+    for a while, so that they see their own writes in the views declared with
+    util.query.read_mostly. Must come after the authentication middleware.
+    """
+    def process_request(self, request):  # pylint: disable=unused-argument
+        """
+        Forget the writes of the previous request run by the thread.
+        """
+        reset_routing_state()
+
+    def process_response(self, request, response):
+        """
+        Pin the user to the primary database if the request wrote to it.
+        """
+        user = getattr(request, 'user', None)
+        if (
+                wrote_to_database() and user is not None and user.is_authenticated() and
+                read_replica_routing_enabled()
+        ):
+            pin_user_to_primary(user.id)
+        return response
+
+
+class QueryBudgetMiddleware(object):
+    """
+    Count the database queries run by the views with a budget in
+    settings.QUERY_BUDGETS, and the time they took, and log a warning when
+    they exceed their budget.
+
+    The budgets are keyed by the dotted path of the view function, and have a
+    maximum number of 'queries' and a maximum number of 'seconds', either of
+    which can be omitted. For example:
+
+        QUERY_BUDGETS = {
+            'student.views.dashboard': {'queries': 150, 'seconds': 0.5},
+        }
+    """
+    def process_view(self, request, view_func, view_args, view_kwargs):  # pylint: disable=unused-argument
+        """
+        Start counting the queries of views with a budget.
+        """
+        view_name = u'{}.{}'.format(view_func.__module__, view_func.__name__)
+        budget = settings.QUERY_BUDGETS.get(view_name)
+        if budget is not None:
+            request.query_budget = (view_name, budget, QueryCounter())
+
+    def process_response(self, request, response):
+        """
+        Record the queries run by the view, and log a warning if they exceeded its budget.
+        """
+        query_budget = getattr(request, 'query_budget', None)
+        if query_budget is None:
+            return response
+
+        view_name, budget, counter = query_budget
+        del request.query_budget
+        count, total_time = counter.stop()
+
+        tags = [u'view:{}'.format(view_name)]
+        dog_stats_api.histogram('edxapp.view.db_queries', count, tags=tags)
+        dog_stats_api.histogram('edxapp.view.db_query_time', total_time, tags=tags)
+
+        max_queries = budget.get('queries')
+        max_seconds = budget.get('seconds')
+        if (max_queries is not None and count > max_queries) or (max_seconds is not None and total_time > max_seconds):
+            dog_stats_api.increment('edxapp.view.query_budget_exceeded', tags=tags)
+            log.warning(
+                u'View %s ran %d queries in %.3f seconds, exceeding its budget of %s queries in %s seconds.',
+                view_name, count, total_time, max_queries, max_seconds,
+            )
+        return response
@@ -1,9 +1,232 @@
-""" Utility functions related to database queries """
+"""
+Utility functions related to database queries
+
+Views and tasks that mostly read can be declared with `read_mostly`. When the
+ENABLE_READ_REPLICA_ROUTING feature is enabled and there is a database called
+'read_replica', ReadReplicaRouter sends their reads to the replica, except:
+
+* reads of the models that were written earlier in the request or task, which
+  the replica may not have caught up with yet, and
+* reads for users who wrote to the database in the last
+  settings.READ_REPLICA_PIN_TIMEOUT seconds, so that they always see their own
+  writes. Their requests are recorded by util.middleware.ReadReplicaMiddleware.
+"""
+import threading
+
+from celery.signals import task_prerun
+from crum import get_current_user
 from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import ContextDecorator
+
+
+READ_REPLICA_DB = 'read_replica'
+
+READ_REPLICA_PIN_CACHE_KEY = u'util.query.read_replica_pin.{user_id}'
 
 
 def use_read_replica_if_available(queryset):
     """
     If there is a database called 'read_replica', use that database for the queryset.
     """
-    return queryset.using("read_replica") if "read_replica" in settings.DATABASES else queryset
+    return queryset.using(READ_REPLICA_DB) if READ_REPLICA_DB in settings.DATABASES else queryset
+
+
+def read_replica_routing_enabled():
+    """
+    Return whether the reads of views and tasks declared with `read_mostly`
+    are sent to the read replica.
+    """
+    return settings.FEATURES.get('ENABLE_READ_REPLICA_ROUTING', False) and READ_REPLICA_DB in settings.DATABASES
+
+
+class _RoutingState(threading.local):
+    """
+    The read replica routing state of the current thread.
+    """
+    def __init__(self):
+        super(_RoutingState, self).__init__()
+        # How many read_mostly blocks are being run.
+        self.read_mostly_depth = 0
+        # Whether the current user's reads are pinned to the primary database.
+        self.pinned = False
+        # The (app label, model name) of the models written in the current
+        # request or task.
+        self.written_models = set()
+
+    def reset(self):
+        """
+        Forget the writes and the pin of the previous request or task.
+        """
+        self.pinned = False
+        self.written_models = set()
+
+
+_routing_state = _RoutingState()  # pylint: disable=invalid-name
+
+
+def _model_key(model):
+    """
+    Return the key of the model in the written models of the routing state.
+    """
+    return model._meta.app_label, model._meta.model_name  # pylint: disable=protected-access
+
+
+def pin_user_to_primary(user_id):
+    """
+    Send the reads of the user's requests to the primary database for the next
+    settings.READ_REPLICA_PIN_TIMEOUT seconds.
+    """
+    cache.set(READ_REPLICA_PIN_CACHE_KEY.format(user_id=user_id), True, settings.READ_REPLICA_PIN_TIMEOUT)
+
+
+def is_user_pinned_to_primary(user_id):
+    """
+    Return whether the reads of the user's requests are sent to the primary database.
+    """
+    return bool(cache.get(READ_REPLICA_PIN_CACHE_KEY.format(user_id=user_id)))
+
+
+def reset_routing_state():
+    """
+    Forget the writes of the previous request or task run by this thread.
+    """
+    _routing_state.reset()
+
+
+@task_prerun.connect
+def reset_task_routing_state(**kwargs):  # pylint: disable=unused-argument
+    """
+    Forget the writes of the previous task run by the worker.
+    """
+    reset_routing_state()
+
+
+def wrote_to_database():
+    """
+    Return whether the current request wrote to the database.
+    """
+    return bool(_routing_state.written_models)
+
+
+class ReadMostly(ContextDecorator):
+    """
+    Send the reads of the decorated view or function, or of the block, to the
+    read replica when routing to it is enabled.
+
+    Use `read_mostly` instead of using this class directly.
+    """
+    def __enter__(self):
+        if _routing_state.read_mostly_depth == 0:
+            user = get_current_user()
+            _routing_state.pinned = bool(
+                user is not None and user.is_authenticated() and read_replica_routing_enabled() and
+                is_user_pinned_to_primary(user.id)
+            )
+        _routing_state.read_mostly_depth += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _routing_state.read_mostly_depth -= 1
+
+
+def read_mostly(func=None):
+    """
+    Declare a view, a task or a block of code as read-mostly, so that its reads
+    are sent to the read replica when routing to it is enabled.
+
+    Can be used as a decorator, with or without parentheses, or as a context
+    manager:
+
+        @read_mostly
+        def dashboard(request):
+            ...
+
+        with read_mostly():
+            ...
+    """
+    if callable(func):
+        return ReadMostly()(func)
+    return ReadMostly()
+
+
+class ReadReplicaRouter(object):
+    """
+    A Database Router that sends the reads of read-mostly views and tasks to
+    the read replica. See the module docstring.
+    """
+
+    def db_for_read(self, model, **hints):  # pylint: disable=unused-argument
+        """
+        Use the read replica in read_mostly blocks, unless the model was
+        written in the request or the current user is pinned to the primary.
+        """
+        if (
+                _routing_state.read_mostly_depth and
+                not _routing_state.pinned and
+                _model_key(model) not in _routing_state.written_models and
+                read_replica_routing_enabled()
+        ):
+            return READ_REPLICA_DB
+        return None
+
+    def db_for_write(self, model, **hints):
+        """
+        Never write to the read replica, even objects that were read from it.
+        """
+        _routing_state.written_models.add(_model_key(model))
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db == READ_REPLICA_DB:  # pylint: disable=protected-access
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):  # pylint: disable=unused-argument
+        """
+        Allow relations between objects read from the primary and the replica.
+        """
+        databases = {DEFAULT_DB_ALIAS, READ_REPLICA_DB}
+        if obj1._state.db in databases and obj2._state.db in databases:  # pylint: disable=protected-access
+            return True
+        return None
+
+
+def query_time(query):
+    """
+    Return the time taken by a query logged in connection.queries, in seconds.
+    """
+    time = query.get('time')
+    if time is None:
+        # django-debug-toolbar monkeypatches the connection
+        # cursor wrapper and adds extra information in each
+        # item in connection.queries. The query time is stored
+        # under the key "duration" rather than "time" and is
+        # in milliseconds, not seconds.
+        time = query.get('duration', 0) / 1000
+    return float(time)
+
+
+class QueryCounter(object):
+    """
+    Count the queries run on all the databases by the current thread, and the
+    time they took, from the creation of the counter until it is stopped.
+    """
+    def __init__(self):
+        self._started = {}
+        for connection in connections.all():
+            self._started[connection.alias] = (connection.force_debug_cursor, len(connection.queries_log))
+            connection.force_debug_cursor = True
+
+    def stop(self):
+        """
+        Stop logging the queries, and return the (number of queries, total
+        time in seconds) of the queries run since the counter was created.
+        """
+        count = 0
+        total_time = 0
+        for connection in connections.all():
+            force_debug_cursor, start = self._started.get(connection.alias, (connection.force_debug_cursor, 0))
+            queries = list(connection.queries_log)[start:]
+            count += len(queries)
+            total_time += sum(query_time(query) for query in queries)
+            connection.force_debug_cursor = force_debug_cursor
+        return count, total_time
@@ -0,0 +1,162 @@
+"""Tests for the read replica routing and query counting of util.query and util.middleware."""
+from celery.signals import task_prerun
+from django.contrib.auth.models import Group, User
+from django.http import HttpResponse
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+from mock import patch
+
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+from util.middleware import QueryBudgetMiddleware, ReadReplicaMiddleware
+from util.query import (
+    READ_REPLICA_DB,
+    QueryCounter,
+    ReadReplicaRouter,
+    is_user_pinned_to_primary,
+    pin_user_to_primary,
+    read_mostly,
+    reset_routing_state,
+    wrote_to_database,
+)
+
+
+def budgeted_view(request):  # pylint: disable=unused-argument
+    """A view running two queries."""
+    User.objects.count()
+    User.objects.count()
+    return HttpResponse()
+
+
+class ReadReplicaRoutingTestCase(CacheIsolationTestCase):
+    """Base class of the read replica routing tests, with routing enabled."""
+
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(ReadReplicaRoutingTestCase, self).setUp()
+        self.user = User.objects.create_user('test', 'test@example.com', 'test')
+        self.router = ReadReplicaRouter()
+
+        for target, value in [('read_replica_routing_enabled', True), ('get_current_user', self.user)]:
+            patcher = patch('util.query.{}'.format(target), return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        reset_routing_state()
+        self.addCleanup(reset_routing_state)
+
+
+class ReadReplicaRouterTest(ReadReplicaRoutingTestCase):
+    """Tests of ReadReplicaRouter and read_mostly."""
+
+    def test_read_mostly_block(self):
+        self.assertIsNone(self.router.db_for_read(User))
+        with read_mostly():
+            self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DB)
+            with read_mostly():
+                self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DB)
+            self.assertEqual(self.router.db_for_read(User), READ_REPLICA_DB)
+        self.assertIsNone(self.router.db_for_read(User))
+
+    def test_read_mostly_decorator(self):
+        @read_mostly
+        def read():
+            """Return the database User is read from."""
+            return self.router.db_for_read(User)
+
+        self.assertEqual(read(), READ_REPLICA_DB)
+        self.assertIsNone(self.router.db_for_read(User))
+
+    def test_routing_disabled(self):
+        with patch('util.query.read_replica_routing_enabled', return_value=False):
+            with read_mostly():
+                self.assertIsNone(self.router.db_for_read(User))
+
+    def test_written_model_read_from_primary(self):
+        with read_mostly():
+            self.assertIsNone(self.router.db_for_write(User))
+            self.assertIsNone(self.router.db_for_read(User))
+            self.assertEqual(self.router.db_for_read(Group), READ_REPLICA_DB)
+
+    def test_pinned_user_read_from_primary(self):
+        pin_user_to_primary(self.user.id)
+        with read_mostly():
+            self.assertIsNone(self.router.db_for_read(User))
+
+    def test_replica_instance_written_to_primary(self):
+        self.user._state.db = READ_REPLICA_DB  # pylint: disable=protected-access
+        self.assertEqual(self.router.db_for_write(User, instance=self.user), 'default')
+
+    def test_relations_allowed_across_databases(self):
+        group = Group(name='test')
+        group._state.db = READ_REPLICA_DB  # pylint: disable=protected-access
+        self.user._state.db = 'default'  # pylint: disable=protected-access
+        self.assertTrue(self.router.allow_relation(self.user, group))
+
+    def test_writes_forgotten_before_tasks(self):
+        self.router.db_for_write(User)
+        self.assertTrue(wrote_to_database())
+        task_prerun.send(sender=None, task_id='test', task=None, args=(), kwargs={})
+        self.assertFalse(wrote_to_database())
+
+
+class ReadReplicaMiddlewareTest(ReadReplicaRoutingTestCase):
+    """Tests of ReadReplicaMiddleware."""
+
+    def setUp(self):
+        super(ReadReplicaMiddlewareTest, self).setUp()
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+        self.middleware = ReadReplicaMiddleware()
+
+    def test_user_pinned_after_write(self):
+        self.middleware.process_request(self.request)
+        self.router.db_for_write(User)
+        self.middleware.process_response(self.request, HttpResponse())
+        self.assertTrue(is_user_pinned_to_primary(self.user.id))
+
+    def test_user_not_pinned_without_write(self):
+        self.router.db_for_write(User)
+        self.middleware.process_request(self.request)
+        self.middleware.process_response(self.request, HttpResponse())
+        self.assertFalse(is_user_pinned_to_primary(self.user.id))
+
+
+class QueryBudgetMiddlewareTest(TestCase):
+    """Tests of QueryCounter and QueryBudgetMiddleware."""
+
+    VIEW_NAME = '{}.budgeted_view'.format(__name__)
+
+    def test_query_counter(self):
+        counter = QueryCounter()
+        budgeted_view(None)
+        count, total_time = counter.stop()
+        self.assertEqual(count, 2)
+        self.assertGreaterEqual(total_time, 0)
+
+    def run_view(self):
+        """Run budgeted_view through the middleware, and return the mock of its logger."""
+        middleware = QueryBudgetMiddleware()
+        request = RequestFactory().get('/')
+        with patch('util.middleware.log') as mock_log:
+            middleware.process_view(request, budgeted_view, [], {})
+            middleware.process_response(request, budgeted_view(request))
+        return mock_log
+
+    @override_settings(QUERY_BUDGETS={VIEW_NAME: {'queries': 1}})
+    def test_budget_exceeded(self):
+        mock_log = self.run_view()
+        self.assertTrue(mock_log.warning.called)
+        self.assertEqual(mock_log.warning.call_args[0][1:3], (self.VIEW_NAME, 2))
+
+    @override_settings(QUERY_BUDGETS={VIEW_NAME: {'queries': 2, 'seconds': 60}})
+    def test_within_budget(self):
+        self.assertFalse(self.run_view().warning.called)
+
+    @override_settings(QUERY_BUDGETS={})
+    def test_no_budget(self):
+        middleware = QueryBudgetMiddleware()
+        request = RequestFactory().get('/')
+        middleware.process_view(request, budgeted_view, [], {})
+        self.assertFalse(hasattr(request, 'query_budget'))
@@ -17,7 +17,7 @@ from xmodule.editing_module import EditingDescriptor
 from xmodule.edxnotes_utils import edxnotes
 from xmodule.html_checker import check_html
 from xmodule.stringify import stringify_children
-from xmodule.x_module import XModule, DEPRECATION_VSCOMPAT_EVENT
+from xmodule.x_module import XModule, DEPRECATION_VSCOMPAT_EVENT, STUDENT_VIEW
 from xmodule.xml_module import XmlDescriptor, name_to_pathname
 from xblock.core import XBlock
 from xblock.fields import Scope, String, Boolean, List
@@ -85,6 +85,16 @@ class HtmlBlock(object):
             return self.data.replace("%%USER_ID%%", self.system.anonymous_student_id)
         return self.data
 
+    @property
+    def student_invariant_views(self):
+        """
+        The views whose output is the same for every student: the student view,
+        unless the content is personalized with %%USER_ID%%.
+        """
+        if "%%USER_ID%%" in self.data:
+            return ()
+        return (STUDENT_VIEW,)
+
 
 class HtmlModuleMixin(HtmlBlock, XModule):
     """
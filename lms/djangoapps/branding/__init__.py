@@ -27,14 +27,27 @@ def get_visible_courses(org=None, filter_=None):
         filter_ (dict): Optional parameter that allows custom filtering by
             fields on the course.
     """
+    courses = get_visible_courses_queryset(org=org, filter_=filter_)
+    return sorted(courses, key=lambda course: course.number)
+
+
+def get_visible_courses_queryset(org=None, filter_=None):
+    """
+    Return an unordered QuerySet of the CourseOverviews that should be visible
+    in this branded instance.
+
+    Arguments are the same as for get_visible_courses.
+    """
     current_site_org = configuration_helpers.get_value('course_org_filter')
 
     if org and current_site_org:
         # Return an empty result if the org passed by the caller does not match the designated site org.
+        if org != current_site_org:
+            return CourseOverview.objects.none()
         courses = CourseOverview.get_all_courses(
             org=org,
             filter_=filter_,
-        ) if org == current_site_org else []
+        )
     else:
         # We only make it to this point if one of org or current_site_org is defined.
         # If both org and current_site_org were defined, the code would have fallen into the
@@ -42,8 +55,6 @@ def get_visible_courses(org=None, filter_=None):
         target_org = org or current_site_org
         courses = CourseOverview.get_all_courses(org=target_org, filter_=filter_)
 
-    courses = sorted(courses, key=lambda course: course.number)
-
     # Filtering can stop here.
     if current_site_org:
         return courses
@@ -59,11 +70,11 @@ def get_visible_courses(org=None, filter_=None):
         )
 
     if filtered_visible_ids:
-        return [course for course in courses if course.id in filtered_visible_ids]
+        return courses.filter(id__in=filtered_visible_ids)
     else:
         # Filter out any courses based on current org, to avoid leaking these.
         orgs = configuration_helpers.get_all_orgs()
-        return [course for course in courses if course.location.org not in orgs]
+        return courses.exclude(org__in=orgs) if orgs else courses
 
 
 def get_university_for_request():
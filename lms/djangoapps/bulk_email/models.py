@@ -398,6 +398,22 @@ class BulkEmailFlag(ConfigurationModel):
         else:  # implies enabled == True and require_course_email == False, so email is globally enabled
             return True
 
+    @classmethod
+    def courses_feature_enabled(cls, course_ids):
+        """
+        Returns the set of the given course ids for which feature_enabled is
+        True, with a single query of their course authorizations.
+        """
+        if not BulkEmailFlag.is_enabled():
+            return frozenset()
+        elif BulkEmailFlag.current().require_course_email_auth:
+            return frozenset(
+                authorization.course_id
+                for authorization in CourseAuthorization.objects.filter(course_id__in=course_ids, email_enabled=True)
+            )
+        else:
+            return frozenset(course_ids)
+
     class Meta(object):
         app_label = "bulk_email"
 
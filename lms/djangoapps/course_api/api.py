@@ -2,6 +2,7 @@
 Course API
 """
 
+from django.conf import settings
 from django.contrib.auth.models import User, AnonymousUser
 from rest_framework.exceptions import PermissionDenied
 
@@ -9,7 +10,9 @@ from lms.djangoapps.courseware.courses import (
     get_courses,
     get_course_overview_with_access,
     get_permission_for_course_about,
+    get_visible_course_ids,
 )
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from .permissions import can_view_courses_for_username
 
 
@@ -81,6 +84,37 @@ def list_courses(request, username, org=None, filter_=None):
 
     Return value:
         List of `CourseOverview` objects representing the collection of courses.
+        With the ENABLE_COURSE_LIST_VISIBILITY_CACHE feature, a
+        `CourseOverviewList` that only loads the courses that are accessed.
     """
     user = get_effective_user(request.user, username)
+    if settings.FEATURES.get('ENABLE_COURSE_LIST_VISIBILITY_CACHE', False):
+        return CourseOverviewList(get_visible_course_ids(user, org=org, filter_=filter_))
     return get_courses(user, org=org, filter_=filter_)
+
+
+class CourseOverviewList(object):
+    """
+    A sequence of the CourseOverviews of a list of course ids, which are
+    loaded when they are accessed. A page of the sequence is loaded with a
+    single query.
+    """
+    def __init__(self, course_ids):
+        self.course_ids = course_ids
+
+    def __len__(self):
+        return len(self.course_ids)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            course_ids = self.course_ids[index]
+            course_overviews = CourseOverview.objects.in_bulk(course_ids)
+            # Courses deleted since their ids were listed are skipped.
+            return [
+                course_overviews[course_id] for course_id in course_ids
+                if course_id in course_overviews
+            ]
+        return CourseOverview.objects.get(id=self.course_ids[index])
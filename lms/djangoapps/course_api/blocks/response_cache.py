@@ -0,0 +1,208 @@
+"""
+Conditional GET support and response caching for the Course Blocks API.
+
+The blocks returned to a user only change when the course is published, when
+the transformers producing them change, when the user's inputs to the access
+transformers change (their course roles, cohort, random partition groups,
+verification checkpoint groups, library content selections and proctored exam
+attempts), or when the start date of one of the course's blocks passes.
+Responses for courses with user partitions in any other scheme aren't cached.
+
+A validator digest of all of these but the dates identifies a response and
+keys the cache of serialized responses. Each cached response records the next
+start date of the course, after which it is no longer used, and its ETag
+covers that date as well.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.utils.timezone import now
+from edx_proctoring.models import ProctoredExamStudentAttempt
+
+from courseware.access import has_access
+from courseware.models import StudentModule
+from lms.djangoapps.course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS
+from lms.djangoapps.course_blocks.transformers.start_date import StartDateTransformer
+from lms.djangoapps.course_blocks.transformers.user_partitions import UserPartitionTransformer
+from openedx.core.djangoapps.content.block_structure.api import get_course_in_cache, get_course_published_version
+from openedx.core.djangoapps.course_groups.cohorts import get_cohort, get_group_info_for_cohort
+from openedx.core.djangoapps.user_api.models import UserCourseTag
+from openedx.core.lib.cache_utils import zpickle, zunpickle
+from student.roles import CourseBetaTesterRole
+
+from .transformers.blocks_api import BlocksAPITransformer
+from .transformers.block_counts import BlockCountsTransformer
+from .transformers.block_depth import BlockDepthTransformer
+from .transformers.navigation import BlockNavigationTransformer
+from .transformers.proctored_exam import ProctoredExamTransformer
+from .transformers.student_view import StudentViewTransformer
+
+
+RESPONSE_CACHE_KEY = u'course_api.blocks.response.{validator}'
+
+# Responses are also dropped from the cache once their course is published, as
+# their validator changes, so this is only a fail-safe.
+RESPONSE_CACHE_TIMEOUT = 60 * 60 * 24
+
+USER_PARTITIONS_CACHE_KEY = u'course_api.blocks.user_partitions.{published_version}'
+
+# The user partition schemes whose inputs are part of the validator. The
+# cohort and random schemes are covered by the user's cohort and course tags,
+# and the groups of the verification scheme are computed for the user.
+CACHEABLE_PARTITION_SCHEMES = ('cohort', 'random', 'verification')
+
+TRANSFORMERS = [transformer.__class__ for transformer in COURSE_BLOCK_ACCESS_TRANSFORMERS] + [
+    ProctoredExamTransformer,
+    BlocksAPITransformer,
+    StudentViewTransformer,
+    BlockCountsTransformer,
+    BlockDepthTransformer,
+    BlockNavigationTransformer,
+]
+
+
+def response_cache_enabled():
+    """
+    Return whether responses of the Course Blocks API are cached and support
+    conditional GET requests.
+    """
+    return settings.FEATURES.get('ENABLE_COURSE_BLOCKS_API_RESPONSE_CACHE', False)
+
+
+def get_validator(request, course_key, user, params):
+    """
+    Return the validator of the response to a Course Blocks API request, or
+    None if the response can't be cached.
+
+    Arguments:
+        request (HTTPRequest): The request, whose host the block urls are
+            built with.
+        course_key (CourseKey): The course of the requested blocks.
+        user (User): The user whose blocks are requested, or None if all the
+            blocks are requested.
+        params (dict): The cleaned parameters of the request.
+    """
+    published_version = get_course_published_version(course_key)
+    if published_version is None:
+        return None
+
+    inputs = [
+        published_version,
+        [(transformer.name(), transformer.VERSION) for transformer in TRANSFORMERS],
+        request.build_absolute_uri('/'),
+        sorted((name, _normalize_param(value)) for name, value in params.iteritems()),
+    ]
+    if user is not None:
+        # Start dates are shifted for beta testers on a per block basis.
+        if CourseBetaTesterRole(course_key).has_user(user):
+            return None
+        user_partitions = _get_user_partitions(course_key, published_version)
+        if any(user_partition.scheme.name not in CACHEABLE_PARTITION_SCHEMES for user_partition in user_partitions):
+            return None
+        inputs.append(_get_user_inputs(course_key, user, user_partitions))
+
+    return hashlib.md5(repr(inputs)).hexdigest()
+
+
+def _normalize_param(value):
+    """
+    Return a representation of a request parameter that doesn't depend on the
+    order of its items.
+    """
+    if isinstance(value, (list, set, frozenset, tuple)):
+        return sorted(unicode(item) for item in value)
+    return unicode(value)
+
+
+def _get_user_partitions(course_key, published_version):
+    """
+    Return the active user partitions of the course, as evaluated by the
+    UserPartitionTransformer.
+    """
+    cache_key = USER_PARTITIONS_CACHE_KEY.format(published_version=published_version)
+    user_partitions = cache.get(cache_key)
+    if user_partitions is None:
+        block_structure = get_course_in_cache(course_key)
+        user_partitions = block_structure.get_transformer_data(UserPartitionTransformer, 'user_partitions') or []
+        cache.set(cache_key, user_partitions, RESPONSE_CACHE_TIMEOUT)
+    return user_partitions
+
+
+def _get_user_inputs(course_key, user, user_partitions):
+    """
+    Return the inputs of the access transformers that are specific to the user.
+    """
+    cohort = get_cohort(user, course_key, assign=False, use_cached=True)
+    library_content_state = StudentModule.objects.filter(
+        student_id=user.id,
+        course_id=course_key,
+        module_type='library_content',
+    ).aggregate(Count('id'), Max('modified'))
+
+    user_inputs = [
+        user.id,
+        bool(has_access(user, 'staff', course_key)),
+        (cohort.id, get_group_info_for_cohort(cohort, use_cached=True)) if cohort else None,
+        sorted(UserCourseTag.objects.filter(user_id=user.id, course_id=course_key).values_list('key', 'value')),
+        (library_content_state['id__count'], unicode(library_content_state['modified__max'])),
+    ]
+    for user_partition in user_partitions:
+        if user_partition.scheme.name == 'verification':
+            group = user_partition.scheme.get_group_for_user(course_key, user, user_partition)
+            user_inputs.append((user_partition.id, group.id if group else None))
+    if settings.FEATURES.get('ENABLE_PROCTORED_EXAMS', False):
+        user_inputs.append(sorted(
+            ProctoredExamStudentAttempt.objects.filter(
+                user_id=user.id,
+                proctored_exam__course_id=unicode(course_key),
+            ).values_list('proctored_exam_id', 'status')
+        ))
+    return user_inputs
+
+
+def get_cached_response(validator):
+    """
+    Return the (etag, data) of the cached response with the given validator,
+    or None if there isn't one or a start date has passed since it was cached.
+    """
+    cached = cache.get(RESPONSE_CACHE_KEY.format(validator=validator))
+    if cached is None:
+        return None
+    etag, valid_until, data = zunpickle(cached)
+    if valid_until is not None and now() >= valid_until:
+        return None
+    return etag, data
+
+
+def cache_response(validator, course_key, data):
+    """
+    Cache the serialized response data with the given validator, and return
+    its etag.
+    """
+    valid_until = _get_next_start_date(course_key)
+    etag = hashlib.md5(u'{}.{}'.format(validator, valid_until)).hexdigest()
+    cache.set(
+        RESPONSE_CACHE_KEY.format(validator=validator),
+        zpickle((etag, valid_until, data)),
+        RESPONSE_CACHE_TIMEOUT,
+    )
+    return etag
+
+
+def _get_next_start_date(course_key):
+    """
+    Return the first start date of the course's blocks that is yet to pass,
+    or None if they have all passed.
+    """
+    block_structure = get_course_in_cache(course_key)
+    current_time = now()
+    upcoming_start_dates = [
+        start_date for start_date in (
+            StartDateTransformer.get_merged_start_date(block_structure, block_key)
+            for block_key in block_structure
+        )
+        if start_date and start_date > current_time
+    ]
+    return min(upcoming_start_dates) if upcoming_start_dates else None
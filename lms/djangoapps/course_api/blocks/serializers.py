@@ -12,6 +12,22 @@ class BlockSerializer(serializers.Serializer):  # pylint: disable=abstract-metho
     """
     Serializer for single course block
     """
+    _requested_supported_fields = None
+
+    def _get_requested_supported_fields(self):
+        """
+        Return the supported fields that are requested.  They are determined
+        once per serializer, which may be used for all the blocks of a block
+        structure.
+        """
+        if self._requested_supported_fields is None:
+            requested_fields = set(self.context['requested_fields'])
+            self._requested_supported_fields = [
+                supported_field for supported_field in SUPPORTED_FIELDS
+                if supported_field.requested_field_name in requested_fields
+            ]
+        return self._requested_supported_fields
+
     def _get_field(self, block_key, transformer, field_name, default):
         """
         Get the field value requested.  The field may be an XBlock field, a
@@ -57,17 +73,16 @@ class BlockSerializer(serializers.Serializer):  # pylint: disable=abstract-metho
             )
 
         # add additional requested fields that are supported by the various transformers
-        for supported_field in SUPPORTED_FIELDS:
-            if supported_field.requested_field_name in self.context['requested_fields']:
-                field_value = self._get_field(
-                    block_key,
-                    supported_field.transformer,
-                    supported_field.block_field_name,
-                    supported_field.default_value,
-                )
-                if field_value is not None:
-                    # only return fields that have data
-                    data[supported_field.serializer_field_name] = field_value
+        for supported_field in self._get_requested_supported_fields():
+            field_value = self._get_field(
+                block_key,
+                supported_field.transformer,
+                supported_field.block_field_name,
+                supported_field.default_value,
+            )
+            if field_value is not None:
+                # only return fields that have data
+                data[supported_field.serializer_field_name] = field_value
 
         if 'children' in self.context['requested_fields']:
             children = self.context['block_structure'].get_children(block_key)
@@ -89,7 +104,10 @@ class BlockDictSerializer(serializers.Serializer):  # pylint: disable=abstract-m
         """
         Serialize to a dictionary of blocks keyed by the block's usage_key.
         """
+        # a single serializer is used for all the blocks, so that what to
+        # serialize is only worked out once
+        block_serializer = BlockSerializer(context=self.context)
         return {
-            unicode(block_key): BlockSerializer(block_key, context=self.context).data
+            unicode(block_key): block_serializer.to_representation(block_key)
             for block_key in structure
         }
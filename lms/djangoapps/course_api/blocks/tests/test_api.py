@@ -3,6 +3,7 @@ Tests for Blocks api.py
 """
 
 from django.test.client import RequestFactory
+from mock import patch
 
 from student.tests.factories import UserFactory
 from xmodule.modulestore import ModuleStoreEnum
@@ -10,6 +11,8 @@ from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import SampleCourseFactory
 
 from ..api import get_blocks
+from ..transformers.block_depth import BlockDepthTransformer
+from ..transformers.student_view import StudentViewTransformer
 
 
 class TestGetBlocks(SharedModuleStoreTestCase):
@@ -95,3 +98,25 @@ class TestGetBlocks(SharedModuleStoreTestCase):
         self.assertEquals(len(blocks['blocks']), 3)
         for block in blocks['blocks'].itervalues():
             self.assertEqual(block['type'], 'problem')
+
+    def test_unneeded_transformers_skipped(self):
+        """
+        Tests that transformers whose results are not needed for the requested
+        fields are not run.
+        """
+        with patch.object(StudentViewTransformer, 'transform') as mock_student_view_transform:
+            with patch.object(BlockDepthTransformer, 'transform') as mock_block_depth_transform:
+                blocks = get_blocks(self.request, self.course.location, self.user, requested_fields=['type'])
+        self.assertFalse(mock_student_view_transform.called)
+        self.assertFalse(mock_block_depth_transform.called)
+        self.assertEquals(blocks['blocks'][unicode(self.course.location)]['type'], 'course')
+
+        with patch.object(StudentViewTransformer, 'transform') as mock_student_view_transform:
+            get_blocks(
+                self.request,
+                self.course.location,
+                self.user,
+                requested_fields=['type', 'student_view_data'],
+                student_view_data=['video'],
+            )
+        self.assertTrue(mock_student_view_transform.called)
@@ -3,6 +3,7 @@ Tests for Blocks Views
 """
 
 from django.core.urlresolvers import reverse
+from mock import Mock, patch
 from string import join
 from urllib import urlencode
 from urlparse import urlunparse
@@ -12,7 +13,9 @@ from student.models import CourseEnrollment
 from student.tests.factories import AdminFactory, CourseEnrollmentFactory, UserFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
+from xmodule.partitions.partitions import Group, UserPartition
 
+from ..api import get_blocks
 from .helpers import deserialize_usage_key
 
 
@@ -257,3 +260,114 @@ class TestBlocksInCourseView(TestBlocksView):  # pylint: disable=test-inherits-t
 
     def test_non_existent_course(self):
         self.verify_response(403, params={'course_id': unicode(CourseLocator('non', 'existent', 'course'))})
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_BLOCKS_API_RESPONSE_CACHE': True})
+class TestBlocksViewResponseCache(SharedModuleStoreTestCase):
+    """
+    Test class for the caching of BlocksView responses
+    """
+    ENABLED_CACHES = ['default']
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestBlocksViewResponseCache, cls).setUpClass()
+        cls.course_key = ToyCourseFactory.create().id
+        cls.course_usage_key = cls.store.make_course_usage_key(cls.course_key)
+
+    def setUp(self):
+        super(TestBlocksViewResponseCache, self).setUp()
+        self.user = UserFactory.create()
+        self.client.login(username=self.user.username, password='test')
+        CourseEnrollmentFactory.create(user=self.user, course_id=self.course_key)
+        self.url = reverse(
+            'blocks_in_block_tree',
+            kwargs={'usage_key_string': unicode(self.course_usage_key)}
+        )
+        self.query_params = {'depth': 'all', 'username': self.user.username}
+
+    def get_response(self, query_params=None, **headers):
+        """
+        Send a GET request for the blocks, and return the response along with
+        whether the blocks were transformed to build it.
+        """
+        with patch('course_api.blocks.views.get_blocks', wraps=get_blocks) as mock_get_blocks:
+            response = self.client.get(self.url, query_params or self.query_params, **headers)
+        return response, mock_get_blocks.called
+
+    def test_conditional_get(self):
+        response, transformed = self.get_response()
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(transformed)
+        etag = response['ETag']
+
+        # the cached response is returned without transforming the blocks again
+        cached_response, transformed = self.get_response()
+        self.assertEquals(cached_response.status_code, 200)
+        self.assertFalse(transformed)
+        self.assertEquals(cached_response['ETag'], etag)
+        self.assertEquals(cached_response.data, response.data)
+
+        response, transformed = self.get_response(HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 304)
+        self.assertFalse(transformed)
+
+    def test_different_params(self):
+        response, __ = self.get_response()
+        etag = response['ETag']
+
+        query_params = dict(self.query_params, requested_fields=['graded'])
+        response, transformed = self.get_response(query_params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(transformed)
+        self.assertNotEquals(response['ETag'], etag)
+
+    def test_course_published(self):
+        response, __ = self.get_response()
+        etag = response['ETag']
+
+        # publishing the course clears the cached responses
+        course = self.store.get_course(self.course_key)
+        course.display_name = 'Updated Toy Course'
+        self.store.update_item(course, self.user.id)
+
+        response, transformed = self.get_response(HTTP_IF_NONE_MATCH=etag)
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(transformed)
+        self.assertEquals(
+            response.data['blocks'][unicode(self.course_usage_key)]['display_name'],
+            'Updated Toy Course',
+        )
+
+    def _patch_user_partitions(self, scheme):
+        """
+        Make the course have a single user partition in the given scheme.
+        """
+        user_partition = UserPartition(0, 'Partition', 'Partition', [Group(0, 'deny'), Group(1, 'allow')], scheme)
+        patcher = patch('course_api.blocks.response_cache._get_user_partitions', return_value=[user_partition])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return user_partition
+
+    def test_verification_partition_group_changed(self):
+        user_partition = self._patch_user_partitions(UserPartition.get_scheme('verification'))
+        with patch.object(user_partition.scheme, 'get_group_for_user', return_value=user_partition.groups[0]):
+            response, __ = self.get_response()
+            __, transformed = self.get_response()
+        self.assertFalse(transformed)
+
+        # the user's verification checkpoint group changes the validator
+        with patch.object(user_partition.scheme, 'get_group_for_user', return_value=user_partition.groups[1]):
+            response, transformed = self.get_response(HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(transformed)
+
+    def test_unhandled_partition_scheme_not_cached(self):
+        scheme = Mock()
+        scheme.name = 'enrollment_track'
+        self._patch_user_partitions(scheme)
+        self.get_response()
+        response, transformed = self.get_response()
+        self.assertEquals(response.status_code, 200)
+        self.assertTrue(transformed)
+        self.assertNotIn('ETag', response)
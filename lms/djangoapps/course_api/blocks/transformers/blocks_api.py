@@ -20,17 +20,28 @@ class BlocksAPITransformer(BlockStructureTransformer):
         BlockNavigationTransformer
 
     Note: BlockDepthTransformer must be executed before BlockNavigationTransformer.
+
+    When the fields to be serialized are given, the contained transformers
+    whose results are not needed for them are skipped.
     """
 
     VERSION = 1
     STUDENT_VIEW_DATA = 'student_view_data'
     STUDENT_VIEW_MULTI_DEVICE = 'student_view_multi_device'
 
-    def __init__(self, block_types_to_count, requested_student_view_data, depth=None, nav_depth=None):
+    def __init__(
+            self,
+            block_types_to_count,
+            requested_student_view_data,
+            depth=None,
+            nav_depth=None,
+            requested_fields=None,
+    ):
         self.block_types_to_count = block_types_to_count
         self.requested_student_view_data = requested_student_view_data
         self.depth = depth
         self.nav_depth = nav_depth
+        self.requested_fields = requested_fields
 
     @classmethod
     def name(cls):
@@ -57,7 +68,9 @@ class BlocksAPITransformer(BlockStructureTransformer):
         """
         Mutates block_structure based on the given usage_info.
         """
-        StudentViewTransformer(self.requested_student_view_data).transform(usage_info, block_structure)
+        if self.requested_fields is None or self.STUDENT_VIEW_DATA in self.requested_fields:
+            StudentViewTransformer(self.requested_student_view_data).transform(usage_info, block_structure)
         BlockCountsTransformer(self.block_types_to_count).transform(usage_info, block_structure)
-        BlockDepthTransformer(self.depth).transform(usage_info, block_structure)
+        if self.requested_fields is None or self.depth is not None or self.nav_depth is not None:
+            BlockDepthTransformer(self.depth).transform(usage_info, block_structure)
         BlockNavigationTransformer(self.nav_depth).transform(usage_info, block_structure)
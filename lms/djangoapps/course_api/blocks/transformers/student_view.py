@@ -1,9 +1,27 @@
 """
 Student View Transformer
 """
+import json
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from openedx.core.djangoapps.content.course_structures.models import StudentViewSnapshot
 from openedx.core.lib.block_structure.transformer import BlockStructureTransformer
 
 
+log = logging.getLogger(__name__)
+
+
+def student_view_snapshots_enabled():
+    """
+    Return whether the collected student_view_data is snapshotted, and reused
+    for the blocks that are unchanged when the course is recollected.
+    """
+    return settings.FEATURES.get('ENABLE_STUDENT_VIEW_DATA_SNAPSHOTS', False)
+
+
 class StudentViewTransformer(BlockStructureTransformer):
     """
     Only show information that is appropriate for a learner
@@ -27,6 +45,16 @@ class StudentViewTransformer(BlockStructureTransformer):
         # collect basic xblock fields
         block_structure.request_xblock_fields('category')
 
+        snapshots = None
+        if student_view_snapshots_enabled():
+            course_key = block_structure.root_block_usage_key.course_key
+            snapshots = {
+                # Usage key strings might not include the course run, so we add it back in with map_into_course
+                snapshot.usage_key.map_into_course(course_key): snapshot
+                for snapshot in StudentViewSnapshot.get_for_course(course_key)
+            }
+        new_snapshots = []
+
         for block_key in block_structure.topological_traversal():
             block = block_structure.get_xblock(block_key)
 
@@ -58,8 +86,19 @@ class StudentViewTransformer(BlockStructureTransformer):
                 cls.STUDENT_VIEW_MULTI_DEVICE,
                 supports_multi_device,
             )
-            if getattr(block, 'student_view_data', None):
-                student_view_data = block.student_view_data()
+            has_student_view_data = bool(getattr(block, 'student_view_data', None))
+            if snapshots is None:
+                student_view_data = block.student_view_data() if has_student_view_data else None
+            else:
+                student_view_data = cls._get_snapshot_data(
+                    block,
+                    snapshots.pop(block_key, None),
+                    supports_multi_device,
+                    has_student_view_data,
+                    new_snapshots,
+                )
+
+            if has_student_view_data:
                 block_structure.set_transformer_block_field(
                     block_key,
                     cls,
@@ -67,6 +106,73 @@ class StudentViewTransformer(BlockStructureTransformer):
                     student_view_data,
                 )
 
+        if snapshots is not None:
+            cls._create_snapshots(new_snapshots)
+            # Drop the snapshots of the blocks that were removed from the course.
+            if snapshots:
+                StudentViewSnapshot.objects.filter(id__in=[snapshot.id for snapshot in snapshots.itervalues()]).delete()
+
+    @classmethod
+    def _create_snapshots(cls, new_snapshots):
+        """
+        Inserts the new snapshots, updating the ones that were inserted in the
+        meantime by another collect of the same course.
+        """
+        try:
+            with transaction.atomic():
+                StudentViewSnapshot.objects.bulk_create(new_snapshots)
+        except IntegrityError:
+            log.info("Some student_view_data snapshots were created concurrently; updating them one by one")
+            for snapshot in new_snapshots:
+                StudentViewSnapshot.objects.update_or_create(
+                    course_id=snapshot.course_id,
+                    usage_key=snapshot.usage_key,
+                    defaults={
+                        'block_type': snapshot.block_type,
+                        'block_version': snapshot.block_version,
+                        'multi_device': snapshot.multi_device,
+                        'student_view_data_json': snapshot.student_view_data_json,
+                    },
+                )
+
+    @classmethod
+    def _get_snapshot_data(cls, block, snapshot, supports_multi_device, has_student_view_data, new_snapshots):
+        """
+        Returns the student_view_data of the block, from its snapshot if that
+        is current, and otherwise from the block, updating the snapshot or
+        appending a new one to new_snapshots.
+        """
+        block_version = StudentViewSnapshot.get_block_version(block)
+        if snapshot is not None and snapshot.is_current(block_version):
+            if snapshot.multi_device != supports_multi_device:
+                snapshot.multi_device = supports_multi_device
+                snapshot.save()
+            return snapshot.student_view_data
+
+        student_view_data = block.student_view_data() if has_student_view_data else None
+        try:
+            student_view_data_json = json.dumps(student_view_data) if has_student_view_data else None
+        except (TypeError, ValueError):
+            log.warning("The student_view_data of %s isn't serializable to JSON; not snapshotting it", block.location)
+            block_version = None
+
+        if block_version is None:
+            # The block can't be snapshotted.
+            if snapshot is not None:
+                snapshot.delete()
+            return student_view_data
+
+        if snapshot is None:
+            snapshot = StudentViewSnapshot(course_id=block.location.course_key, usage_key=block.location)
+            new_snapshots.append(snapshot)
+        snapshot.block_type = block.location.block_type
+        snapshot.block_version = block_version
+        snapshot.multi_device = supports_multi_device
+        snapshot.student_view_data_json = student_view_data_json
+        if snapshot.id is not None:
+            snapshot.save()
+        return student_view_data
+
     def transform(self, usage_info, block_structure):
         """
         Mutates block_structure based on the given usage_info.
@@ -4,7 +4,11 @@ Tests for StudentViewTransformer.
 
 # pylint: disable=protected-access
 
+from mock import patch
+
+from openedx.core.djangoapps.content.course_structures.models import StudentViewSnapshot
 from openedx.core.lib.block_structure.factory import BlockStructureFactory
+from xmodule.video_module import VideoDescriptor
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
@@ -54,3 +58,61 @@ class TestStudentViewTransformer(ModuleStoreTestCase):
                 html_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_MULTI_DEVICE,
             )
         )
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_STUDENT_VIEW_DATA_SNAPSHOTS': True})
+    def test_collect_snapshots(self):
+        StudentViewTransformer.collect(self.block_structure)
+
+        video_block_key = self.course_key.make_usage_key('video', 'sample_video')
+        snapshot = StudentViewSnapshot.objects.get(course_id=self.course_key, usage_key=video_block_key)
+        self.assertEqual(
+            snapshot.student_view_data,
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            ),
+        )
+        self.assertFalse(snapshot.multi_device)
+        self.assertTrue(all(
+            html_snapshot.multi_device
+            for html_snapshot in StudentViewSnapshot.get_for_course(self.course_key, block_types=['html'])
+        ))
+        snapshot_versions = set(StudentViewSnapshot.get_for_course(self.course_key).values_list('id', 'modified'))
+
+        # recollecting the unchanged course reuses the snapshots
+        block_structure = BlockStructureFactory.create_from_modulestore(self.course_usage_key, self.store)
+        with patch.object(VideoDescriptor, 'student_view_data') as mock_student_view_data:
+            StudentViewTransformer.collect(block_structure)
+        self.assertFalse(mock_student_view_data.called)
+        self.assertEqual(
+            block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            ),
+            snapshot.student_view_data,
+        )
+        self.assertEqual(
+            set(StudentViewSnapshot.get_for_course(self.course_key).values_list('id', 'modified')),
+            snapshot_versions,
+        )
+
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_STUDENT_VIEW_DATA_SNAPSHOTS': True})
+    def test_collect_snapshots_concurrently(self):
+        # a concurrent collect inserts a snapshot after this one read the course's snapshots
+        video_block_key = self.course_key.make_usage_key('video', 'sample_video')
+        StudentViewSnapshot.objects.create(
+            course_id=self.course_key,
+            usage_key=video_block_key,
+            block_type='video',
+            block_version='stale',
+        )
+        with patch.object(StudentViewSnapshot, 'get_for_course', return_value=StudentViewSnapshot.objects.none()):
+            StudentViewTransformer.collect(self.block_structure)
+
+        snapshot = StudentViewSnapshot.objects.get(course_id=self.course_key, usage_key=video_block_key)
+        self.assertNotEqual(snapshot.block_version, 'stale')
+        self.assertEqual(
+            snapshot.student_view_data,
+            self.block_structure.get_transformer_block_field(
+                video_block_key, StudentViewTransformer, StudentViewTransformer.STUDENT_VIEW_DATA,
+            ),
+        )
+        self.assertTrue(StudentViewSnapshot.get_for_course(self.course_key, block_types=['html']).exists())
@@ -3,6 +3,7 @@ CourseBlocks API views
 """
 from django.core.exceptions import ValidationError
 from django.http import Http404
+from rest_framework import status
 from rest_framework.generics import ListAPIView
 from rest_framework.response import Response
 
@@ -14,6 +15,7 @@ from xmodule.modulestore.exceptions import ItemNotFoundError
 
 from .api import get_blocks
 from .forms import BlockListGetForm
+from .response_cache import cache_response, get_cached_response, get_validator, response_cache_enabled
 
 
 @view_auth_classes()
@@ -170,6 +172,10 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
           * lti_url: The block URL for an LTI consumer. Returned only if the
             "ENABLE_LTI_PROVIDER" Django settign is set to "True".
 
+        If the "ENABLE_COURSE_BLOCKS_API_RESPONSE_CACHE" feature is enabled,
+        responses include an ETag header, and a 304: Not Modified response is
+        returned when the request's If-None-Match header matches it.
+
     """
 
     def list(self, request, usage_key_string):  # pylint: disable=arguments-differ
@@ -189,24 +195,48 @@ class BlocksView(DeveloperErrorViewMixin, ListAPIView):
         if not params.is_valid():
             raise ValidationError(params.errors)
 
+        usage_key = params.cleaned_data['usage_key']
+        validator = None
+        if response_cache_enabled():
+            validator = get_validator(request, usage_key.course_key, params.cleaned_data['user'], params.cleaned_data)
+            cached_response = get_cached_response(validator) if validator else None
+            if cached_response is not None:
+                etag, data = cached_response
+                return self._conditional_response(request, etag, data)
+
         try:
-            return Response(
-                get_blocks(
-                    request,
-                    params.cleaned_data['usage_key'],
-                    params.cleaned_data['user'],
-                    params.cleaned_data['depth'],
-                    params.cleaned_data.get('nav_depth'),
-                    params.cleaned_data['requested_fields'],
-                    params.cleaned_data.get('block_counts', []),
-                    params.cleaned_data.get('student_view_data', []),
-                    params.cleaned_data['return_type'],
-                    params.cleaned_data.get('block_types_filter', None),
-                )
+            data = get_blocks(
+                request,
+                usage_key,
+                params.cleaned_data['user'],
+                params.cleaned_data['depth'],
+                params.cleaned_data.get('nav_depth'),
+                params.cleaned_data['requested_fields'],
+                params.cleaned_data.get('block_counts', []),
+                params.cleaned_data.get('student_view_data', []),
+                params.cleaned_data['return_type'],
+                params.cleaned_data.get('block_types_filter', None),
             )
         except ItemNotFoundError as exception:
             raise Http404("Block not found: {}".format(exception.message))
 
+        if validator:
+            return self._conditional_response(request, cache_response(validator, usage_key.course_key, data), data)
+        return Response(data)
+
+    def _conditional_response(self, request, etag, data):
+        """
+        Return a response with the given data and etag, or a 304 response if
+        the client already has it.
+        """
+        quoted_etag = '"{}"'.format(etag)
+        if quoted_etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = quoted_etag
+        return response
+
 
 @view_auth_classes()
 class BlocksInCourseView(BlocksView):
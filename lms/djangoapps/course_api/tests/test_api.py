@@ -1,18 +1,24 @@
 """
 Test for course API
 """
+from datetime import datetime, timedelta
 from hashlib import md5
 
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
 from django.http import Http404
 from opaque_keys.edx.keys import CourseKey
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.request import Request
 from rest_framework.test import APIRequestFactory
+from mock import patch
+import pytz
 
+from courseware.courses import get_courses
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from student.roles import CourseStaffRole
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase, ModuleStoreTestCase
-from xmodule.modulestore.tests.factories import check_mongo_calls
+from xmodule.modulestore.tests.factories import ToyCourseFactory, check_mongo_calls
 from .mixins import CourseApiFactoryMixin
 from ..api import course_detail, list_courses
 
@@ -226,3 +232,62 @@ class TestGetCourseListExtras(CourseListTestMixin, ModuleStoreTestCase):
         self.create_course(visible_to_staff_only=True)
         courses = self._make_api_call(self.staff_user, self.staff_user)
         self.verify_courses(courses)
+
+
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_COURSE_LIST_VISIBILITY_CACHE': True})
+class TestGetCourseListVisibilityCache(CourseListTestMixin, ModuleStoreTestCase):
+    """
+    Tests of the list_courses api function when the visible courses are
+    selected with SQL filters and cached.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestGetCourseListVisibilityCache, self).setUp()
+        self.staff_user = self.create_user("staff", is_staff=True)
+        self.honor_user = self.create_user("honor", is_staff=False)
+        self.course = self.create_course()
+
+    def create_upcoming_course(self, **kwargs):
+        """
+        Create a course that hasn't started, which is open for enrollment.
+        """
+        return ToyCourseFactory.create(
+            start=datetime.now(pytz.UTC) + timedelta(days=30),
+            emit_signals=True,
+            **kwargs
+        )
+
+    def test_same_courses_as_get_courses(self):
+        self.create_course(course='hidden', visible_to_staff_only=True)
+        self.create_upcoming_course(course='upcoming')
+        self.create_upcoming_course(course='invitation', invitation_only=True)
+        staffed_course = self.create_course(course='staffed', visible_to_staff_only=True)
+        CourseStaffRole(staffed_course.id).add_users(self.honor_user)
+
+        for user in (self.honor_user, self.staff_user, AnonymousUser()):
+            courses = self._make_api_call(user, user)
+            self.assertEqual(
+                [course.id for course in courses],
+                [course.id for course in get_courses(user)],
+            )
+        self.assertIn(staffed_course.id, [course.id for course in self._make_api_call(self.honor_user, self.honor_user)])
+
+    def test_visible_courses_cached(self):
+        self.verify_courses(self._make_api_call(self.honor_user, self.honor_user))
+
+        self.create_course(course='second')
+        self.verify_courses(self._make_api_call(self.honor_user, self.honor_user))
+
+        cache.clear()
+        self.assertEqual(len(self._make_api_call(self.honor_user, self.honor_user)), 2)
+
+    def test_page_loads_only_its_courses(self):
+        for number in range(3):
+            self.create_course(course='course{}'.format(number))
+        courses = self._make_api_call(self.honor_user, self.honor_user)
+        self.assertEqual(len(courses), 4)
+
+        with self.assertNumQueries(1):
+            page = courses[1:3]
+        self.assertEqual([course.id for course in page], courses.course_ids[1:3])
@@ -5,12 +5,16 @@ courseware.
 from datetime import datetime
 from collections import defaultdict
 from fs.errors import ResourceNotFoundError
+import hashlib
 import logging
 
 from path import Path as path
 import pytz
 from django.http import Http404
 from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db.models import Case, Min, Q, When
 
 from edxmako.shortcuts import render_to_string
 from xmodule.modulestore import ModuleStoreEnum
@@ -18,9 +22,11 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
 from static_replace import replace_static_urls
 from xmodule.modulestore import ModuleStoreEnum
+from xmodule.course_module import CATALOG_VISIBILITY_ABOUT, CATALOG_VISIBILITY_CATALOG_AND_ABOUT
 from xmodule.x_module import STUDENT_VIEW
 
 from courseware.access import has_access
+from courseware.access_utils import in_preview_mode
 from courseware.date_summary import (
     CourseEndDate,
     CourseStartDate,
@@ -31,7 +37,9 @@ from courseware.date_summary import (
 from courseware.model_data import FieldDataCache
 from courseware.module_render import get_module
 from lms.djangoapps.courseware.courseware_access_exception import CoursewareAccessException
-from student.models import CourseEnrollment
+from external_auth.models import ExternalAuthMap
+from student.models import CourseAccessRole, CourseEnrollment, CourseEnrollmentAllowed
+from student.roles import GlobalStaff
 import branding
 
 from opaque_keys.edx.keys import UsageKey
@@ -41,6 +49,12 @@ from openedx.core.djangoapps.site_configuration import helpers as configuration_
 
 log = logging.getLogger(__name__)
 
+VISIBLE_COURSE_IDS_CACHE_KEY = u'courseware.courses.visible_course_ids.{digest}'
+
+# The course visibility permissions whose checks get_visible_course_ids can
+# express as filters on CourseOverviews.
+SQL_FILTERED_PERMISSIONS = ('see_exists', 'see_in_catalog', 'see_about_page')
+
 
 def get_course(course_id, depth=0):
     """
@@ -390,6 +404,130 @@ def get_courses(user, org=None, filter_=None):
     return courses
 
 
+def get_visible_course_ids(user, org=None, filter_=None):
+    """
+    Returns the ids of the courses get_courses returns, in the same order,
+    without loading their CourseOverviews.
+
+    Instead of checking the access to each course, the courses visible to the
+    user are selected with filters on CourseOverview. Only the courses on which
+    the user has a role or an allowed enrollment are checked individually.
+
+    The ids are cached per user until COURSE_LIST_VISIBILITY_CACHE_TIMEOUT
+    expires, or until one of the courses starts or opens or closes enrollment.
+    """
+    permission_name = configuration_helpers.get_value(
+        'COURSE_CATALOG_VISIBILITY_PERMISSION',
+        settings.COURSE_CATALOG_VISIBILITY_PERMISSION
+    )
+    courses = branding.get_visible_courses_queryset(org=org, filter_=filter_)
+    try:
+        query = unicode(courses.query)
+    except EmptyResultSet:
+        return []
+
+    # Masquerading changes the access of staff per course and per session.
+    cacheable = not getattr(user, 'masquerade_settings', None)
+    if cacheable:
+        cache_key = VISIBLE_COURSE_IDS_CACHE_KEY.format(
+            digest=hashlib.md5(repr([user.id, permission_name, query]).encode('utf-8')).hexdigest()
+        )
+        course_ids = cache.get(cache_key)
+        if course_ids is not None:
+            return course_ids
+
+    current_time = datetime.now(pytz.UTC)
+    if cacheable and permission_name in SQL_FILTERED_PERMISSIONS and not in_preview_mode():
+        course_ids = _get_visible_course_ids(user, permission_name, courses, current_time)
+    else:
+        course_ids = [course.id for course in courses if has_access(user, permission_name, course)]
+    course_ids.sort(key=lambda course_id: (course_id.course, unicode(course_id)))
+
+    if cacheable:
+        cache.set(cache_key, course_ids, _get_visible_course_ids_timeout(courses, current_time))
+    return course_ids
+
+
+def _get_visible_course_ids(user, permission_name, courses, current_time):
+    """
+    Returns the ids of the given CourseOverviews that are visible to the user
+    under permission_name, one of SQL_FILTERED_PERMISSIONS.
+    """
+    if GlobalStaff().has_user(user):
+        return list(courses.values_list('id', flat=True))
+
+    visible_courses = courses.filter(_get_visibility_filter(user, permission_name, current_time))
+    if not user.is_authenticated():
+        return list(visible_courses.values_list('id', flat=True))
+
+    # The courses whose access depends on the user's roles or allowed enrollments.
+    checked_courses = Q(id__in=[])
+    for role in CourseAccessRole.objects.filter(user=user):
+        if role.course_id:
+            checked_courses |= Q(id=role.course_id)
+        elif role.org:
+            checked_courses |= Q(org=role.org)
+    if permission_name == 'see_exists':
+        checked_courses |= Q(
+            id__in=CourseEnrollmentAllowed.objects.filter(email=user.email).values_list('course_id', flat=True)
+        )
+
+    course_ids = list(visible_courses.exclude(checked_courses).values_list('id', flat=True))
+    course_ids.extend(
+        course.id for course in courses.filter(checked_courses)
+        if has_access(user, permission_name, course)
+    )
+    return course_ids
+
+
+def _get_visibility_filter(user, permission_name, current_time):
+    """
+    Returns the filter on CourseOverview that selects the courses visible under
+    permission_name to a user without any role on them.
+    """
+    if permission_name == 'see_in_catalog':
+        return Q(catalog_visibility=CATALOG_VISIBILITY_CATALOG_AND_ABOUT)
+    if permission_name == 'see_about_page':
+        return Q(catalog_visibility__in=[CATALOG_VISIBILITY_CATALOG_AND_ABOUT, CATALOG_VISIBILITY_ABOUT])
+
+    # 'see_exists' is granted if the user can either load or enroll in the course.
+    can_load = Q(visible_to_staff_only=False)
+    if not settings.FEATURES['DISABLE_START_DATES']:
+        can_load &= Q(start__isnull=True) | Q(start__lt=current_time)
+
+    can_enroll = (
+        Q(invitation_only=False) &
+        (Q(enrollment_start__isnull=True) | Q(enrollment_start__lt=current_time)) &
+        (Q(enrollment_end__isnull=True) | Q(enrollment_end__gt=current_time))
+    )
+    if settings.FEATURES.get('RESTRICT_ENROLL_BY_REG_METHOD'):
+        reg_method_ok = Q(enrollment_domain__isnull=True) | Q(enrollment_domain='')
+        if user.is_authenticated():
+            reg_method_ok |= Q(
+                enrollment_domain__in=ExternalAuthMap.objects.filter(user=user).values_list('external_domain', flat=True)
+            )
+        can_enroll &= reg_method_ok
+
+    return can_load | can_enroll
+
+
+def _get_visible_course_ids_timeout(courses, current_time):
+    """
+    Returns how long the visible course ids can be cached for, which is until
+    the next start or enrollment date of the courses at most.
+    """
+    timeout = settings.COURSE_LIST_VISIBILITY_CACHE_TIMEOUT
+    next_dates = courses.aggregate(
+        next_start=Min(Case(When(start__gt=current_time, then='start'))),
+        next_enrollment_start=Min(Case(When(enrollment_start__gt=current_time, then='enrollment_start'))),
+        next_enrollment_end=Min(Case(When(enrollment_end__gt=current_time, then='enrollment_end'))),
+    )
+    for next_date in next_dates.itervalues():
+        if next_date is not None:
+            timeout = min(timeout, int((next_date - current_time).total_seconds()) + 1)
+    return timeout
+
+
 def get_permission_for_course_about():
     """
     Returns the CourseOverview object for the course after checking for access.
@@ -28,6 +28,7 @@ from xmodule.modulestore.inheritance import InheritanceMixin
 NOTSET = object()
 ENABLED_OVERRIDE_PROVIDERS_KEY = u'courseware.field_overrides.enabled_providers.{course_id}'
 ENABLED_MODULESTORE_OVERRIDE_PROVIDERS_KEY = u'courseware.modulestore_field_overrides.enabled_providers.{course_id}'
+OVERRIDE_INDEXES_CACHE_NAME = u'courseware.field_overrides.override_indexes'
 
 
 def resolve_dotted(name):
@@ -60,6 +61,20 @@ def _lineage(block):
         parent = parent.get_parent()
 
 
+def _course_key(block):
+    """
+    Returns the key of the course `block` is bound in. This is the course id
+    of its runtime rather than the course of its location, as the two differ
+    for blocks served through a CCX.
+    """
+    runtime = getattr(block, 'runtime', None)
+    course_id = getattr(runtime, 'course_id', None)
+    if course_id is None:
+        location = getattr(block, 'location', None)
+        course_id = getattr(location, 'course_key', None)
+    return course_id
+
+
 class _OverridesDisabled(threading.local):
     """
     A thread local used to manage state of overrides being disabled or not.
@@ -100,9 +115,18 @@ class FieldOverrideProvider(object):
     A `FieldOverrideProvider` implementation is only responsible for looking up
     field overrides. To set overrides, there will be a domain specific API for
     the concrete override implementation being used.
+
+    Providers whose overrides are stored per block may also implement
+    `get_override_index`, which lets `OverrideFieldData` load every override
+    for a course up front and answer each field read with a dict lookup
+    instead of calling `get`.
     """
     __metaclass__ = ABCMeta
 
+    # Set to True by providers whose overrides depend only on the block and
+    # the field name, so that lookups against them can be cached.
+    stateless = False
+
     def __init__(self, user):
         self.user = user
 
@@ -114,6 +138,24 @@ class FieldOverrideProvider(object):
         """
         raise NotImplementedError
 
+    def get_override_index(self, course_key):
+        """
+        Return a dict mapping `(usage_key, field_name)` to the JSON value of
+        every override this provider has in the course identified by
+        `course_key`, or None if this provider doesn't support bulk loading
+        (in which case `get` is called for each field read).
+
+        The usage keys in the index must match `override_index_key`.
+        """
+        return None
+
+    def override_index_key(self, block):
+        """
+        Return the usage key used to look up `block` in the index returned by
+        `get_override_index`.
+        """
+        return block.location.replace(version=None, branch=None)
+
     @abstractmethod
     def enabled_for(self, course):  # pragma no cover
         """
@@ -131,6 +173,15 @@ class FieldOverrideProvider(object):
         return False
 
 
+def clear_override_indexes():
+    """
+    Forget the override indexes loaded in the current request, so that
+    overrides changed during the request are seen by the blocks bound after
+    the change.
+    """
+    RequestCache.get_request_cache(OVERRIDE_INDEXES_CACHE_NAME).clear()
+
+
 class OverrideFieldData(FieldData):
     """
     A :class:`~xblock.field_data.FieldData` which wraps another `FieldData`
@@ -156,11 +207,6 @@ class OverrideFieldData(FieldData):
         any performance impact of this feature if no override providers are
         configured.
         """
-        if cls.provider_classes is None:
-            cls.provider_classes = tuple(
-                (resolve_dotted(name) for name in
-                 settings.FIELD_OVERRIDE_PROVIDERS))
-
         enabled_providers = cls._providers_for_course(course)
         if enabled_providers:
             # TODO: we might not actually want to return here.  Might be better
@@ -171,6 +217,14 @@ class OverrideFieldData(FieldData):
 
         return wrapped
 
+    @classmethod
+    def has_enabled_providers(cls, course):
+        """
+        Return whether any override provider is enabled for `course`, that
+        is, whether field data for the course is wrapped by :meth:`wrap`.
+        """
+        return bool(cls._providers_for_course(course))
+
     @classmethod
     def _providers_for_course(cls, course):
         """
@@ -181,6 +235,11 @@ class OverrideFieldData(FieldData):
         Arguments:
             course: The course XBlock
         """
+        if cls.provider_classes is None:
+            cls.provider_classes = tuple(
+                (resolve_dotted(name) for name in
+                 settings.FIELD_OVERRIDE_PROVIDERS))
+
         request_cache = RequestCache.get_request_cache()
         if course is None:
             cache_key = ENABLED_OVERRIDE_PROVIDERS_KEY.format(course_id='None')
@@ -198,6 +257,54 @@ class OverrideFieldData(FieldData):
     def __init__(self, user, fallback, providers):
         self.fallback = fallback
         self.providers = tuple(provider(user) for provider in providers)
+        # (usage_key, field_name) pairs known not to be overridden by any provider
+        self._not_overridden = set()
+        # Inherited override values, or NOTSET, keyed by (usage_key, field_name)
+        self._inherited_overrides = {}
+
+    def _get_override_index(self, provider, course_key):
+        """
+        Return the override index of `provider` for the course identified by
+        `course_key`, loading it on first use. Returns None if `provider`
+        doesn't support bulk loading.
+
+        A new `OverrideFieldData` is built for every block that is bound to a
+        user, so the indexes are kept in the request cache, where they are
+        shared by all the blocks of the course rendered in the request.
+        """
+        override_indexes = RequestCache.get_request_cache(OVERRIDE_INDEXES_CACHE_NAME)
+        cache_key = (type(provider), getattr(provider.user, 'id', provider.user), course_key)
+        if cache_key not in override_indexes:
+            override_indexes[cache_key] = provider.get_override_index(course_key)
+        return override_indexes[cache_key]
+
+    def _get_provider_override(self, provider, block, name):
+        """
+        Return the override of `provider` for the field `name` in `block`,
+        or `NOTSET`. Uses the provider's override index when it has one.
+        """
+        course_key = _course_key(block)
+        index = self._get_override_index(provider, course_key) if course_key is not None else None
+        if index is None:
+            return provider.get(block, name, NOTSET)
+        value = index.get((provider.override_index_key(block), name), NOTSET)
+        if value is not NOTSET:
+            try:
+                value = block.fields[name].from_json(value)
+            except KeyError:
+                pass
+        return value
+
+    def _can_cache_lookups(self, course_key):
+        """
+        Return whether the results of override lookups in the course
+        identified by `course_key` can be cached, i.e. whether every provider
+        either answers from an override index or has `stateless` overrides.
+        """
+        return all(
+            provider.stateless or self._get_override_index(provider, course_key) is not None
+            for provider in self.providers
+        )
 
     def get_override(self, block, name):
         """
@@ -205,12 +312,42 @@ class OverrideFieldData(FieldData):
         Returns the overridden value or `NOTSET` if no override is found.
         """
         if not overrides_disabled():
+            location = getattr(block, 'location', None)
+            if (location, name) in self._not_overridden:
+                return NOTSET
             for provider in self.providers:
-                value = provider.get(block, name, NOTSET)
+                value = self._get_provider_override(provider, block, name)
                 if value is not NOTSET:
                     return value
+            course_key = _course_key(block)
+            if location is not None and course_key is not None and self._can_cache_lookups(course_key):
+                self._not_overridden.add((location, name))
         return NOTSET
 
+    def _get_inherited_override(self, block, name):
+        """
+        Returns the override for the inheritable field `name` set on the
+        nearest ancestor of `block`, or `NOTSET` if no ancestor overrides it.
+        """
+        if overrides_disabled():
+            return NOTSET
+
+        location = getattr(block, 'location', None)
+        cache_key = (location, name)
+        if cache_key in self._inherited_overrides:
+            return self._inherited_overrides[cache_key]
+
+        value = NOTSET
+        for ancestor in _lineage(block):
+            value = self.get_override(ancestor, name)
+            if value is not NOTSET:
+                break
+
+        course_key = _course_key(block)
+        if location is not None and course_key is not None and self._can_cache_lookups(course_key):
+            self._inherited_overrides[cache_key] = value
+        return value
+
     def get(self, block, name):
         value = self.get_override(block, name)
         if value is not NOTSET:
@@ -233,10 +370,8 @@ class OverrideFieldData(FieldData):
             # then we want to return False here, so the field_data uses the
             # override and not the original value for this block.
             inheritable = InheritanceMixin.fields.keys()
-            if name in inheritable:
-                for ancestor in _lineage(block):
-                    if self.get_override(ancestor, name) is not NOTSET:
-                        return False
+            if name in inheritable and self._get_inherited_override(block, name) is not NOTSET:
+                return False
 
         return has is not NOTSET or self.fallback.has(block, name)
 
@@ -249,10 +384,9 @@ class OverrideFieldData(FieldData):
         if self.providers and not overrides_disabled():
             inheritable = InheritanceMixin.fields.keys()
             if name in inheritable:
-                for ancestor in _lineage(block):
-                    value = self.get_override(ancestor, name)
-                    if value is not NOTSET:
-                        return value
+                value = self._get_inherited_override(block, name)
+                if value is not NOTSET:
+                    return value
         return self.fallback.default(block, name)
 
 
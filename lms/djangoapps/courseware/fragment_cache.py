@@ -0,0 +1,91 @@
+"""
+A shared cache for the rendered fragments of XBlock views whose output doesn't
+depend on the learner viewing them.
+
+Blocks opt in by listing such views in a ``student_invariant_views`` attribute
+(or property). Fragments are cached as returned by the view, before any of the
+runtime wrappers, which are still applied in order on every render.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import get_language
+from xblock.fragment import Fragment
+
+from openedx.core.djangoapps.theming.helpers import get_current_theme
+
+
+FRAGMENT_CACHE_KEY = u'courseware.fragment_cache.{digest}'
+
+
+def fragment_cache_enabled():
+    """
+    Return whether rendered fragments of student-invariant views may be cached.
+    """
+    return settings.FEATURES.get('ENABLE_XBLOCK_FRAGMENT_CACHE', False)
+
+
+class XBlockFragmentCache(object):
+    """
+    Stores rendered fragments for student-invariant XBlock views, keyed by
+    block version, view name, language and theme.
+    """
+    def __init__(self, timeout=None):
+        """
+        Arguments:
+            timeout (int): How long to keep fragments in the cache, in seconds.
+        """
+        if timeout is None:
+            timeout = getattr(settings, 'XBLOCK_FRAGMENT_CACHE_TIMEOUT', 60 * 60)
+        self.timeout = timeout
+
+    def can_cache(self, block, view_name):
+        """
+        Return whether the output of `view_name` on `block` may be cached.
+        """
+        return (
+            view_name in getattr(block, 'student_invariant_views', ()) and
+            self._block_version(block) is not None
+        )
+
+    def get(self, block, view_name, context):
+        """
+        Return the cached fragment for `view_name` on `block`, or None.
+        """
+        pods = cache.get(self._cache_key(block, view_name))
+        if pods is None:
+            return None
+        return Fragment.from_pods(pods)
+
+    def set(self, block, view_name, frag, context):
+        """
+        Store `frag`, the output of `view_name` on `block`, in the cache.
+        """
+        cache.set(self._cache_key(block, view_name), frag.to_pods(), self.timeout)
+
+    def _cache_key(self, block, view_name):
+        """
+        Return the shared cache key for `view_name` on `block` in the current
+        language and theme.
+        """
+        theme = get_current_theme()
+        key_parts = (
+            unicode(block.scope_ids.usage_id),
+            unicode(self._block_version(block)),
+            view_name,
+            get_language() or u'',
+            theme.theme_dir_name if theme else u'',
+        )
+        return FRAGMENT_CACHE_KEY.format(
+            digest=hashlib.md5(u'|'.join(key_parts).encode('utf-8')).hexdigest()
+        )
+
+    @staticmethod
+    def _block_version(block):
+        """
+        Return a value that changes whenever `block` is edited, or None if the
+        modulestore doesn't record one.
+        """
+        descriptor = getattr(block, 'descriptor', block)
+        return getattr(descriptor, 'edited_on', None)
@@ -42,7 +42,9 @@ from xblock.runtime import KeyValueStore
 from xblock.exceptions import KeyValueMultiSaveError, InvalidScopeError
 from xblock.fields import Scope, UserScope
 from xmodule.modulestore.django import modulestore
-from xblock.core import XBlockAside
+from xmodule.x_module import XModuleDescriptor
+from xblock.core import XBlock, XBlockAside
+from courseware.user_state_buffer import UserStateBufferBusy, UserStateWriteBuffer, user_state_buffer_enabled
 from courseware.user_state_client import DjangoXBlockUserStateClient
 
 
@@ -71,6 +73,22 @@ def _all_usage_keys(descriptors, aside_types):
     return usage_ids
 
 
+def _usage_keys_for_block_keys(block_keys, aside_types):
+    """
+    Return a set of all usage_ids for the `block_keys` (as produced by
+    :meth:`BlockStructure.get_block_keys`) and for all asides in
+    `aside_types` for those blocks.
+    """
+    usage_ids = set()
+    for block_key in block_keys:
+        usage_ids.add(block_key)
+
+        for aside_type in aside_types:
+            usage_ids.add(AsideUsageKeyV1(block_key, aside_type))
+
+    return usage_ids
+
+
 def _all_block_types(descriptors, aside_types):
     """
     Return a set of all block_types for the supplied `descriptors` and for
@@ -86,6 +104,25 @@ def _all_block_types(descriptors, aside_types):
     return block_types
 
 
+def _block_types_for_block_keys(block_keys, aside_types):
+    """
+    Return a set of all block_types for the supplied `block_keys` and for
+    the asides types in `aside_types` associated with those blocks.
+
+    A usage key doesn't record whether its block is an XModule or a pure
+    XBlock, so the block type is included for both entry points.
+    """
+    block_types = set()
+    for block_type in set(block_key.block_type for block_key in block_keys):
+        for entry_point in (XModuleDescriptor.entry_point, XBlock.entry_point):
+            block_types.add(BlockTypeKeyV1(entry_point, block_type))
+
+    for aside_type in aside_types:
+        block_types.add(BlockTypeKeyV1(XBlockAside.entry_point, aside_type))
+
+    return block_types
+
+
 class DjangoKeyValueStore(KeyValueStore):
     """
     This KeyValueStore will read and write data in the following scopes to django models
@@ -179,6 +216,18 @@ class DjangoOrmFieldCache(object):
         for field_object in self._read_objects(fields, xblocks, aside_types):
             self._cache[self._cache_key_for_field_object(field_object)] = field_object
 
+    def cache_block_keys(self, block_keys, aside_types):
+        """
+        Load all fields stored for the blocks identified by ``block_keys``
+        and the ``aside_types`` associated with them into this cache.
+
+        Arguments:
+            block_keys (set of :class:`UsageKey`): Blocks to cache fields for.
+            aside_types (list of str): Aside types to cache fields for.
+        """
+        for field_object in self._read_objects_for_block_keys(block_keys, aside_types):
+            self._cache[self._cache_key_for_field_object(field_object)] = field_object
+
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def get(self, kvs_key):
         """
@@ -324,6 +373,20 @@ class DjangoOrmFieldCache(object):
         """
         raise NotImplementedError()
 
+    @abstractmethod
+    def _read_objects_for_block_keys(self, block_keys, aside_types):
+        """
+        Return an iterator for all objects stored in the underlying datastore
+        for any field on the blocks identified by ``block_keys`` and the
+        ``aside_types`` associated with them.
+
+        Arguments:
+            block_keys (set of :class:`UsageKey`): Blocks to load fields for
+            aside_types (list of str): Asides to load field for (which annotate the supplied
+                blocks).
+        """
+        raise NotImplementedError()
+
     @abstractmethod
     def _cache_key_for_field_object(self, field_object):
         """
@@ -354,6 +417,7 @@ class UserStateCache(object):
         self.course_id = course_id
         self.user = user
         self._client = DjangoXBlockUserStateClient(self.user)
+        self._write_buffer = UserStateWriteBuffer() if user_state_buffer_enabled() else None
 
     def cache_fields(self, fields, xblocks, aside_types):  # pylint: disable=unused-argument
         """
@@ -365,13 +429,32 @@ class UserStateCache(object):
             xblocks (list of :class:`XBlock`): XBlocks to cache fields for.
             aside_types (list of str): Aside types to cache fields for.
         """
-        block_field_state = self._client.get_many(
-            self.user.username,
-            _all_usage_keys(xblocks, aside_types),
-        )
+        self._load_state(_all_usage_keys(xblocks, aside_types))
+
+    def cache_block_keys(self, block_keys, aside_types):
+        """
+        Load the state stored for the blocks identified by ``block_keys``
+        and the ``aside_types`` associated with them into this cache.
+
+        Arguments:
+            block_keys (set of :class:`UsageKey`): Blocks to cache fields for.
+            aside_types (list of str): Aside types to cache fields for.
+        """
+        self._load_state(_usage_keys_for_block_keys(block_keys, aside_types))
+
+    def _load_state(self, usage_keys):
+        """
+        Load the stored state of ``usage_keys`` into this cache, overlaid with
+        any updates still waiting in the write buffer.
+        """
+        block_field_state = self._client.get_many(self.user.username, usage_keys)
         for user_state in block_field_state:
             self._cache[user_state.block_key] = user_state.state
 
+        if self._write_buffer is not None:
+            for usage_key, state in self._write_buffer.pending_state(self.user, usage_keys).iteritems():
+                self._cache[usage_key].update(state)
+
     @contract(kvs_key=DjangoKeyValueStore.Key)
     def set(self, kvs_key, value):
         """
@@ -418,11 +501,16 @@ class UserStateCache(object):
             pending_updates[cache_key][kvs_key.field_name] = value
 
         try:
-            self._client.set_many(
-                self.user.username,
-                pending_updates
-            )
-        except DatabaseError:
+            to_write = pending_updates
+            if self._write_buffer is not None:
+                to_write = self._write_buffer.defer(self.user, pending_updates)
+
+            if to_write:
+                self._client.set_many(
+                    self.user.username,
+                    to_write
+                )
+        except (DatabaseError, UserStateBufferBusy):
             log.exception("Saving user state failed for %s", self.user.username)
             raise KeyValueMultiSaveError([])
         finally:
@@ -539,6 +627,22 @@ class UserStateSummaryCache(DjangoOrmFieldCache):
             field_name__in=set(field.name for field in fields),
         )
 
+    def _read_objects_for_block_keys(self, block_keys, aside_types):
+        """
+        Return an iterator for all objects stored in the underlying datastore
+        for any field on the blocks identified by ``block_keys`` and the
+        ``aside_types`` associated with them.
+
+        Arguments:
+            block_keys (set of :class:`UsageKey`): Blocks to load fields for
+            aside_types (list of str): Asides to load field for (which annotate the supplied
+                blocks).
+        """
+        return XModuleUserStateSummaryField.objects.chunked_filter(
+            'usage_id__in',
+            _usage_keys_for_block_keys(block_keys, aside_types),
+        )
+
     def _cache_key_for_field_object(self, field_object):
         """
         Return the key used in this DjangoOrmFieldCache to store the specified field_object.
@@ -602,6 +706,23 @@ class PreferencesCache(DjangoOrmFieldCache):
             field_name__in=set(field.name for field in fields),
         )
 
+    def _read_objects_for_block_keys(self, block_keys, aside_types):
+        """
+        Return an iterator for all objects stored in the underlying datastore
+        for any field on the block types of the blocks identified by
+        ``block_keys`` and the ``aside_types`` associated with them.
+
+        Arguments:
+            block_keys (set of :class:`UsageKey`): Blocks to load fields for
+            aside_types (list of str): Asides to load field for (which annotate the supplied
+                blocks).
+        """
+        return XModuleStudentPrefsField.objects.chunked_filter(
+            'module_type__in',
+            _block_types_for_block_keys(block_keys, aside_types),
+            student=self.user.pk,
+        )
+
     def _cache_key_for_field_object(self, field_object):
         """
         Return the key used in this DjangoOrmFieldCache to store the specified field_object.
@@ -662,6 +783,21 @@ class UserInfoCache(DjangoOrmFieldCache):
             field_name__in=set(field.name for field in fields),
         )
 
+    def _read_objects_for_block_keys(self, block_keys, aside_types):
+        """
+        Return an iterator for all objects stored in the underlying datastore
+        for this user. Scope.user_info fields aren't tied to a block, so
+        ``block_keys`` and ``aside_types`` are ignored.
+
+        Arguments:
+            block_keys (set of :class:`UsageKey`): Blocks to load fields for
+            aside_types (list of str): Asides to load field for (which annotate the supplied
+                blocks).
+        """
+        return XModuleStudentInfoField.objects.filter(
+            student=self.user.pk,
+        )
+
     def _cache_key_for_field_object(self, field_object):
         """
         Return the key used in this DjangoOrmFieldCache to store the specified field_object.
@@ -685,8 +821,13 @@ class FieldDataCache(object):
     """
     A cache of django model objects needed to supply the data
     for a module and its descendants
+
+    When constructed with ``lazy=True``, no queries are made up front.
+    Instead, the blocks added to the cache are recorded as pending for
+    each scope, and all of the pending blocks for a scope are loaded in a
+    single query the first time a field in that scope is accessed.
     """
-    def __init__(self, descriptors, course_id, user, select_for_update=False, asides=None):
+    def __init__(self, descriptors, course_id, user, select_for_update=False, asides=None, lazy=False):
         """
         Find any courseware.models objects that are needed by any descriptor
         in descriptors. Attempts to minimize the number of queries to the database.
@@ -699,6 +840,7 @@ class FieldDataCache(object):
         user: The user for which to cache data
         select_for_update: Ignored
         asides: The list of aside types to load, or None to prefetch no asides.
+        lazy: If True, defer loading each scope until it is first accessed.
         """
         if asides is None:
             self.asides = []
@@ -708,6 +850,7 @@ class FieldDataCache(object):
         assert isinstance(course_id, CourseKey)
         self.course_id = course_id
         self.user = user
+        self.lazy = lazy
 
         self.cache = {
             Scope.user_state: UserStateCache(
@@ -724,6 +867,7 @@ class FieldDataCache(object):
                 self.course_id,
             ),
         }
+        self._pending_block_keys = defaultdict(set)
         self.scorable_locations = set()
         self.add_descriptors_to_cache(descriptors)
 
@@ -737,7 +881,30 @@ class FieldDataCache(object):
                 if scope not in self.cache:
                     continue
 
-                self.cache[scope].cache_fields(fields, descriptors, self.asides)
+                if self.lazy:
+                    self._pending_block_keys[scope].update(desc.scope_ids.usage_id for desc in descriptors)
+                else:
+                    self.cache[scope].cache_fields(fields, descriptors, self.asides)
+
+    def add_block_keys_to_cache(self, block_keys):
+        """
+        Add the blocks identified by `block_keys` to this FieldDataCache,
+        without needing to load their descriptors.
+
+        Since the fields of each block aren't known, all stored fields in
+        every cached scope are loaded for these blocks.
+
+        Arguments:
+            block_keys: An iterable of UsageKeys, such as the result of
+                :meth:`BlockStructure.get_block_keys`.
+        """
+        if self.user.is_authenticated():
+            block_keys = set(block_keys)
+            for scope in self.cache:
+                if self.lazy:
+                    self._pending_block_keys[scope].update(block_keys)
+                else:
+                    self.cache[scope].cache_block_keys(block_keys, self.asides)
 
     def add_descriptor_descendents(self, descriptor, depth=None, descriptor_filter=lambda descriptor: True):
         """
@@ -797,6 +964,31 @@ class FieldDataCache(object):
         cache.add_descriptor_descendents(descriptor, depth, descriptor_filter)
         return cache
 
+    @classmethod
+    def cache_for_block_keys(cls, course_id, user, block_keys, asides=None):
+        """
+        Return a lazy FieldDataCache for the blocks identified by `block_keys`.
+
+        course_id: the course in the context of which we want StudentModules.
+        user: the django user for whom to load modules.
+        block_keys: An iterable of UsageKeys, such as the keys of a course
+            BlockStructure.
+        asides: The list of aside types to load, or None to load no asides.
+        """
+        cache = FieldDataCache([], course_id, user, asides=asides, lazy=True)
+        cache.add_block_keys_to_cache(block_keys)
+        return cache
+
+    def _scope_cache(self, scope):
+        """
+        Return the cache for `scope`, first loading any blocks that are
+        still pending for that scope in a single batch.
+        """
+        pending = self._pending_block_keys.pop(scope, None)
+        if pending:
+            self.cache[scope].cache_block_keys(pending, self.asides)
+        return self.cache[scope]
+
     def _fields_to_cache(self, descriptors):
         """
         Returns a map of scopes to fields in that scope that should be cached
@@ -827,7 +1019,7 @@ class FieldDataCache(object):
         if key.scope not in self.cache:
             raise KeyError(key.field_name)
 
-        return self.cache[key.scope].get(key)
+        return self._scope_cache(key.scope).get(key)
 
     @contract(kv_dict="dict(DjangoKeyValueStore_Key: *)")
     def set_many(self, kv_dict):
@@ -856,7 +1048,7 @@ class FieldDataCache(object):
 
         for scope, set_many_data in by_scope.iteritems():
             try:
-                self.cache[scope].set_many(set_many_data)
+                self._scope_cache(scope).set_many(set_many_data)
                 # If save is successful on these fields, add it to
                 # the list of successful saves
                 saved_fields.extend(key.field_name for key in set_many_data)
@@ -883,7 +1075,7 @@ class FieldDataCache(object):
         if key.scope not in self.cache:
             raise KeyError(key.field_name)
 
-        self.cache[key.scope].delete(key)
+        self._scope_cache(key.scope).delete(key)
 
     @contract(key=DjangoKeyValueStore.Key, returns=bool)
     def has(self, key):
@@ -904,7 +1096,7 @@ class FieldDataCache(object):
         if key.scope not in self.cache:
             return False
 
-        return self.cache[key.scope].has(key)
+        return self._scope_cache(key.scope).has(key)
 
     @contract(key=DjangoKeyValueStore.Key, returns="datetime|None")
     def last_modified(self, key):
@@ -924,7 +1116,7 @@ class FieldDataCache(object):
         if key.scope not in self.cache:
             return None
 
-        return self.cache[key.scope].last_modified(key)
+        return self._scope_cache(key.scope).last_modified(key)
 
     def __len__(self):
         return sum(len(cache) for cache in self.cache.values())
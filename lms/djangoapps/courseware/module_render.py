@@ -32,6 +32,8 @@ from xblock.exceptions import NoSuchHandlerError, NoSuchViewError
 from xblock.reference.plugins import FSService
 
 import static_replace
+from course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, get_course_blocks
+from openedx.core.lib.block_structure.transformers import BlockStructureTransformers
 from openedx.core.lib.gating import api as gating_api
 from courseware.access import has_access, get_user_role
 from courseware.entrance_exams import (
@@ -42,11 +44,14 @@ from courseware.entrance_exams import (
 from courseware.masquerade import (
     MasqueradingKeyValueStore,
     filter_displayed_blocks,
+    get_course_masquerade,
     is_masquerading_as_specific_student,
     setup_masquerade,
 )
+from courseware.fragment_cache import XBlockFragmentCache, fragment_cache_enabled
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache, set_score
 from courseware.models import SCORE_CHANGED
+from courseware.transformers.table_of_contents import TableOfContentsTransformer
 from edxmako.shortcuts import render_to_string
 from lms.djangoapps.lms_xblock.field_data import LmsFieldData
 from lms.djangoapps.lms_xblock.models import XBlockAsidesConfig
@@ -75,6 +80,7 @@ from xmodule.contentstore.django import contentstore
 from xmodule.error_module import ErrorDescriptor, NonStaffErrorDescriptor
 from xmodule.exceptions import NotFoundError, ProcessingError
 from xmodule.lti_module import LTIModule
+from xmodule.block_metadata_utils import display_name_with_default_escaped, url_name_for_block
 from xmodule.mixin import wrap_with_license
 from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.exceptions import ItemNotFoundError
@@ -147,13 +153,18 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
     NOTE: assumes that if we got this far, user has access to course.  Returns
     None if this is not the case.
 
-    field_data_cache must include data from the course module and 2 levels of its descendants
+    field_data_cache must include data from the course module and 2 levels of its descendants,
+    unless the table of contents is built from the cached course block structure
+    (see can_use_cached_toc), in which case it isn't used.
     '''
 
     with modulestore().bulk_operations(course.id):
-        course_module = get_module_for_descriptor(
-            user, request, course, field_data_cache, course.id, course=course
-        )
+        if can_use_cached_toc(user, course):
+            course_module = _cached_toc_course(user, course)
+        else:
+            course_module = get_module_for_descriptor(
+                user, request, course, field_data_cache, course.id, course=course
+            )
         if course_module is None:
             return None, None, None
 
@@ -236,6 +247,72 @@ def toc_for_course(user, request, course, active_chapter, active_section, field_
         }
 
 
+def can_use_cached_toc(user, course):
+    """
+    Return whether the table of contents for `user` in `course` can be built
+    from the cached course block structure.
+
+    The block structure transformers don't apply masquerading or field
+    overrides (such as individual due dates or CCX schedules), so those cases
+    still bind XModules.
+    """
+    return (
+        settings.FEATURES.get('ENABLE_CACHED_TOC', False) and
+        get_course_masquerade(user, course.id) is None and
+        not OverrideFieldData.has_enabled_providers(course)
+    )
+
+
+def _cached_toc_course(user, course):
+    """
+    Return a _CachedTocBlock for the root of the course block structure
+    transformed for `user`, or None if the user can't access the course.
+    """
+    transformers = BlockStructureTransformers(COURSE_BLOCK_ACCESS_TRANSFORMERS + [TableOfContentsTransformer()])
+    block_structure = get_course_blocks(user, course.location, transformers)
+    if course.location not in block_structure:
+        return None
+    return _CachedTocBlock(block_structure, course.location)
+
+
+class _CachedTocBlock(object):
+    """
+    A block of a transformed course block structure, exposing the fields that
+    toc_for_course reads under the same names as the equivalent XModule.
+    """
+    def __init__(self, block_structure, location):
+        self._block_structure = block_structure
+        self.location = location
+
+    def __getattr__(self, name):
+        if name not in TableOfContentsTransformer.FIELDS_TO_COLLECT:
+            raise AttributeError(name)
+        return self._block_structure.get_xblock_field(self.location, name)
+
+    @property
+    def url_name(self):
+        """
+        The url_name of the block.
+        """
+        return url_name_for_block(self)
+
+    @property
+    def display_name_with_default_escaped(self):
+        """
+        The escaped display name of the block.
+        """
+        return display_name_with_default_escaped(self)
+
+    def get_display_items(self):
+        """
+        Return the children of the block that are accessible to the user.
+        """
+        return [
+            _CachedTocBlock(self._block_structure, child_key)
+            for child_key in self._block_structure.get_children(self.location)
+        ]
+
+
 def _add_timed_exam_info(user, course, section, section_context):
     """
     Add in rendering context if exam is a timed exam (which includes proctored)
@@ -672,6 +749,13 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
         reverse('jump_to_id', kwargs={'course_id': course_id.to_deprecated_string(), 'module_id': ''}),
     ))
 
+    # Student-invariant views can be served from a shared cache, unless we are
+    # rendering the view of a specific student for staff.
+    if fragment_cache_enabled() and not is_masquerading_as_specific_student(user, course_id):
+        fragment_cache = XBlockFragmentCache()
+    else:
+        fragment_cache = None
+
     if settings.FEATURES.get('DISPLAY_DEBUG_INFO_TO_STAFF'):
         if is_masquerading_as_specific_student(user, course_id):
             # When masquerading as a specific student, we want to show the debug button
@@ -763,6 +847,7 @@ def get_module_system_for_user(user, student_data,  # TODO  # pylint: disable=to
         rebind_noauth_module_to_user=rebind_noauth_module_to_user,
         user_location=user_location,
         request_token=request_token,
+        fragment_cache=fragment_cache,
     )
 
     # pass position specified in URL to module through ModuleSystem
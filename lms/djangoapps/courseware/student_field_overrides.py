@@ -4,7 +4,7 @@ by the individual due dates feature.
 """
 import json
 
-from .field_overrides import FieldOverrideProvider
+from .field_overrides import FieldOverrideProvider, clear_override_indexes
 from .models import StudentFieldOverride
 
 
@@ -17,6 +17,12 @@ class IndividualStudentOverrideProvider(FieldOverrideProvider):
     def get(self, block, name, default):
         return get_override_for_user(self.user, block, name, default)
 
+    def get_override_index(self, course_key):
+        """
+        Load all of the user's overrides in the course with a single query.
+        """
+        return get_override_index_for_user(self.user, course_key)
+
     @classmethod
     def enabled_for(cls, course):
         """This simple override provider is always enabled"""
@@ -56,6 +62,23 @@ def _get_overrides_for_user(user, block):
     return overrides
 
 
+def get_override_index_for_user(user, course_key):
+    """
+    Gets all of the individual student overrides for the `user` in the course
+    identified by `course_key`.  Returns a dictionary of JSON field values
+    keyed by `(usage_key, field_name)`.
+    """
+    query = StudentFieldOverride.objects.filter(
+        course_id=course_key,
+        student_id=user.id,
+    )
+    overrides = {}
+    for override in query:
+        location = override.location.map_into_course(course_key).replace(version=None, branch=None)
+        overrides[(location, override.field)] = json.loads(override.value)
+    return overrides
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +93,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    clear_override_indexes()
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +111,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    clear_override_indexes()
@@ -0,0 +1,19 @@
+"""
+Celery tasks for the courseware app.
+"""
+from celery.task import task
+from celery.utils.log import get_task_logger
+
+from courseware.user_state_buffer import UserStateWriteBuffer
+
+
+LOGGER = get_task_logger(__name__)
+
+
+@task(name='courseware.flush_user_state_buffer')
+def flush_user_state_buffer():
+    """
+    Write the buffered updates of coalesced user state fields to StudentModule.
+    """
+    num_written = UserStateWriteBuffer().flush()
+    LOGGER.info("Flushed %d buffered user state entries", num_written)
@@ -3,9 +3,12 @@ Tests for `field_overrides` module.
 """
 # pylint: disable=missing-docstring
 import unittest
+from mock import Mock
 from nose.plugins.attrib import attr
 
 from django.test.utils import override_settings
+from opaque_keys.edx.locator import CourseLocator
+from request_cache.middleware import RequestCache
 from xblock.field_data import DictFieldData
 from xmodule.modulestore.tests.factories import CourseFactory
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
@@ -21,6 +24,7 @@ from ..testutils import FieldOverrideTestMixin
 
 
 TESTUSER = "testuser"
+BLOCK_KEY = CourseLocator('org', 'course', 'run').make_usage_key('html', 'block')
 
 
 class TestOverrideProvider(FieldOverrideProvider):
@@ -142,6 +146,61 @@ class OverrideModulestoreFieldDataTests(FieldOverrideTestMixin, OverrideFieldDat
         self.assertIsInstance(data, DictFieldData)
 
 
+class TestIndexedOverrideProvider(FieldOverrideProvider):
+    """
+    A `FieldOverrideProvider` which answers every lookup from its override index.
+    """
+    def get(self, block, name, default):
+        raise AssertionError("get() shouldn't be called when an override index is available")
+
+    loaded_for = []
+
+    def get_override_index(self, course_key):
+        self.loaded_for.append(course_key)
+        return {(BLOCK_KEY, 'foo'): 'fu'}
+
+    @classmethod
+    def enabled_for(cls, course):
+        return True
+
+
+@attr('shard_1')
+class OverrideIndexTests(unittest.TestCase):
+    """
+    Tests for `OverrideFieldData` with providers that support override indexes.
+    """
+    def setUp(self):
+        super(OverrideIndexTests, self).setUp()
+        RequestCache.clear_request_cache()
+        self.addCleanup(RequestCache.clear_request_cache)
+        self.addCleanup(setattr, TestIndexedOverrideProvider, 'loaded_for', [])
+        self.block = Mock(location=BLOCK_KEY, fields={})
+        self.block.runtime.course_id = BLOCK_KEY.course_key
+        self.block.get_parent.return_value = None
+        self.data = OverrideFieldData(TESTUSER, DictFieldData({
+            'foo': 'bar',
+            'bees': 'knees',
+        }), [TestIndexedOverrideProvider])
+
+    def test_get(self):
+        self.assertEqual(self.data.get(self.block, 'foo'), 'fu')
+        self.assertEqual(self.data.get(self.block, 'bees'), 'knees')
+        with disable_overrides():
+            self.assertEqual(self.data.get(self.block, 'foo'), 'bar')
+
+    def test_index_shared_in_request(self):
+        self.data.get(self.block, 'foo')
+        other_data = OverrideFieldData(TESTUSER, DictFieldData({'foo': 'bar'}), [TestIndexedOverrideProvider])
+        self.assertEqual(other_data.get(self.block, 'foo'), 'fu')
+        self.assertEqual(TestIndexedOverrideProvider.loaded_for, [BLOCK_KEY.course_key])
+
+    def test_index_loaded_for_runtime_course(self):
+        ccx_key = CourseLocator('org', 'course', 'ccx_run')
+        self.block.runtime.course_id = ccx_key
+        self.assertEqual(self.data.get(self.block, 'foo'), 'fu')
+        self.assertEqual(TestIndexedOverrideProvider.loaded_for, [ccx_key])
+
+
 @attr('shard_1')
 class ResolveDottedTests(unittest.TestCase):
     """
@@ -7,6 +7,13 @@ from nose.plugins.attrib import attr
 from functools import partial
 
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache, InvalidScopeError
+from courseware.user_state_buffer import (
+    BUCKET_SIZE_CACHE_KEY,
+    LOCK_CACHE_KEY,
+    OPEN_BUCKETS,
+    UserStateWriteBuffer,
+    current_bucket,
+)
 from courseware.models import StudentModule, XModuleUserStateSummaryField
 from courseware.models import XModuleStudentInfoField, XModuleStudentPrefsField
 
@@ -18,7 +25,9 @@ from courseware.tests.factories import StudentPrefsFactory, StudentInfoFactory
 from xblock.fields import Scope, BlockScope, ScopeIds
 from xblock.exceptions import KeyValueMultiSaveError
 from xblock.core import XBlock
+from django.core.cache import cache
 from django.test import TestCase
+from django.test.utils import override_settings
 from django.db import DatabaseError
 
 
@@ -426,3 +435,153 @@ class TestStudentInfoStorage(OtherUserFailureTestMixin, StorageTestBase, TestCas
     storage_class = XModuleStudentInfoField
     other_key_factory = partial(DjangoKeyValueStore.Key, Scope.user_info, 2, 'mock_problem')  # user_id=2, not 1
     existing_field_name = "existing_field"
+
+
+@attr('shard_1')
+class TestLazyFieldDataCache(TestCase):
+    """Tests for FieldDataCache built lazily from a list of block keys"""
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestLazyFieldDataCache, self).setUp()
+        student_module = StudentModuleFactory(state=json.dumps({'a_field': 'a_value'}))
+        self.user = student_module.student
+        self.assertEqual(self.user.id, 1)   # check our assumption hard-coded in the key functions above.
+        UserStateSummaryFactory.create()
+
+        # Nothing is loaded until a field is read
+        with self.assertNumQueries(0):
+            self.field_data_cache = FieldDataCache.cache_for_block_keys(course_id, self.user, [location('usage_id')])
+        self.kvs = DjangoKeyValueStore(self.field_data_cache)
+
+    def test_scope_loaded_on_first_read(self):
+        with self.assertNumQueries(1):
+            self.assertEquals('a_value', self.kvs.get(user_state_key('a_field')))
+        with self.assertNumQueries(0):
+            self.assertTrue(self.kvs.has(user_state_key('a_field')))
+            self.assertRaises(KeyError, self.kvs.get, user_state_key('b_field'))
+
+    def test_scopes_loaded_independently(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.kvs.has(user_state_summary_key('existing_field')))
+        with self.assertNumQueries(0):
+            self.assertEquals('old_value', self.kvs.get(user_state_summary_key('existing_field')))
+        self.assertEquals(1, len(self.field_data_cache))
+
+    def test_pending_keys_batched(self):
+        self.field_data_cache.add_block_keys_to_cache([location('other_usage_id')])
+        with self.assertNumQueries(1):
+            self.assertFalse(self.kvs.has(user_state_key('b_field')))
+
+
+@attr('shard_1')
+@patch.dict('django.conf.settings.FEATURES', {'ENABLE_COALESCED_USER_STATE_WRITES': True})
+@override_settings(COALESCED_USER_STATE_FIELDS={'problem': ('a_field',)})
+class TestCoalescedUserStateWrites(TestCase):
+    """Tests for buffering writes of coalesced user_state fields"""
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestCoalescedUserStateWrites, self).setUp()
+        cache.clear()
+        student_module = StudentModuleFactory(state=json.dumps({'a_field': 'a_value', 'b_field': 'b_value'}))
+        self.user = student_module.student
+        self.assertEqual(self.user.id, 1)   # check our assumption hard-coded in the key functions above.
+        self.kvs = self._make_kvs()
+        self.buckets_later = 0
+
+    def _make_kvs(self):
+        """Return a DjangoKeyValueStore reading fresh user state"""
+        field_data_cache = FieldDataCache(
+            [mock_descriptor([mock_field(Scope.user_state, 'a_field'), mock_field(Scope.user_state, 'b_field')])],
+            course_id,
+            self.user,
+        )
+        return DjangoKeyValueStore(field_data_cache)
+
+    def _stored_state(self):
+        """Return the state saved in the StudentModule"""
+        return json.loads(StudentModule.objects.get(student=self.user, module_state_key=location('usage_id')).state)
+
+    def test_coalesced_write_buffered(self):
+        with self.assertNumQueries(0):
+            self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.assertEquals('a_value', self._stored_state()['a_field'])
+        self.assertEquals('new_value', self.kvs.get(user_state_key('a_field')))
+
+        # Newly loaded state includes the buffered update
+        self.assertEquals('new_value', self._make_kvs().get(user_state_key('a_field')))
+
+    def _flush(self):
+        """Flush the buffer once the buckets of the updates made so far are closed"""
+        self.buckets_later += OPEN_BUCKETS + 1
+        with patch('courseware.user_state_buffer.current_bucket', return_value=current_bucket() + self.buckets_later):
+            return UserStateWriteBuffer().flush()
+
+    def test_flush(self):
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.kvs.set(user_state_key('a_field'), 'newer_value')
+        # The bucket of the updates isn't flushed while it's open
+        self.assertEquals(0, UserStateWriteBuffer().flush())
+        self.assertEquals(1, self._flush())
+        self.assertEquals({'a_field': 'newer_value', 'b_field': 'b_value'}, self._stored_state())
+
+        # Flushed entries are removed from the buffer
+        self.assertEquals(0, self._flush())
+        self.kvs.set(user_state_key('a_field'), 'newest_value')
+        self.assertEquals(1, self._flush())
+        self.assertEquals('newest_value', self._stored_state()['a_field'])
+
+    def test_other_field_write_persists_buffered_values(self):
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.kvs.set(user_state_key('b_field'), 'new_b_value')
+        self.assertEquals({'a_field': 'new_value', 'b_field': 'new_b_value'}, self._stored_state())
+
+        # The buffered values are only dropped by the flush, once it has written them
+        self.assertEquals('new_value', self._make_kvs().get(user_state_key('a_field')))
+        self.assertEquals(1, self._flush())
+        self.assertEquals({'a_field': 'new_value', 'b_field': 'new_b_value'}, self._stored_state())
+
+    def test_other_field_write_updates_buffered_values(self):
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.kvs.set_many({user_state_key('a_field'): 'newer_value', user_state_key('b_field'): 'new_b_value'})
+        self.assertEquals('newer_value', self._make_kvs().get(user_state_key('a_field')))
+        self.assertEquals(1, self._flush())
+        self.assertEquals({'a_field': 'newer_value', 'b_field': 'new_b_value'}, self._stored_state())
+
+    def test_failed_flush_keeps_entries(self):
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        with patch('courseware.user_state_buffer.DjangoXBlockUserStateClient.set_many', side_effect=DatabaseError):
+            self.assertEquals(0, self._flush())
+        self.assertEquals('new_value', self._make_kvs().get(user_state_key('a_field')))
+
+        # The entry was queued again for the next flush
+        self.assertEquals(1, self._flush())
+        self.assertEquals('new_value', self._stored_state()['a_field'])
+
+    def test_locked_entry(self):
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        lock_key = LOCK_CACHE_KEY.format(digest=UserStateWriteBuffer._digest(  # pylint: disable=protected-access
+            self.user, location('usage_id')
+        ))
+        cache.set(lock_key, 'other', 60)
+
+        # Updates of a locked entry fail rather than race with its holder
+        with patch('courseware.user_state_buffer.LOCK_WAIT', 0):
+            with self.assertRaises(KeyValueMultiSaveError):
+                self.kvs.set(user_state_key('a_field'), 'newer_value')
+
+        # The flush leaves locked entries for the next one
+        self.assertEquals(0, self._flush())
+        cache.delete(lock_key)
+        self.assertEquals(1, self._flush())
+        self.assertEquals('new_value', self._stored_state()['a_field'])
+
+    def test_bucket_size_evicted(self):
+        self.kvs.set(user_state_key('a_field'), 'new_value')
+        self.assertEquals(0, UserStateWriteBuffer().flush())
+        cache.delete(BUCKET_SIZE_CACHE_KEY.format(bucket=current_bucket()))
+        self.assertEquals(1, self._flush())
+        self.assertEquals('new_value', self._stored_state()['a_field'])
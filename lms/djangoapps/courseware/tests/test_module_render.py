@@ -30,10 +30,11 @@ from capa.tests.response_xml_factory import OptionResponseXMLFactory
 from course_modes.models import CourseMode
 from courseware import module_render as render
 from courseware.courses import get_course_with_access, get_course_info_section
-from courseware.field_overrides import OverrideFieldData
+from courseware.field_overrides import OverrideFieldData, clear_override_indexes
 from courseware.model_data import FieldDataCache
 from courseware.module_render import hash_resource, get_module_for_descriptor
 from courseware.models import StudentModule
+from courseware.student_field_overrides import override_field_for_user
 from courseware.tests.factories import StudentModuleFactory, UserFactory, GlobalStaffFactory
 from courseware.tests.tests import LoginEnrollmentTestCase
 from courseware.tests.test_submitting_problems import TestSubmittingProblems
@@ -397,6 +398,40 @@ class ModuleRenderTestCase(SharedModuleStoreTestCase, LoginEnrollmentTestCase):
             descriptor._unwrapped_field_data
         )
 
+    @override_settings(FIELD_OVERRIDE_PROVIDERS=(
+        'courseware.student_field_overrides.IndividualStudentOverrideProvider',
+    ))
+    def test_override_index_loaded_once(self):
+        """
+        Tests that the student overrides of a course are loaded with a single
+        query, however many blocks are bound in the request.
+        """
+        OverrideFieldData.provider_classes = None
+        self.addCleanup(setattr, OverrideFieldData, 'provider_classes', None)
+        request = self.request_factory.get('')
+        request.user = user = UserFactory()
+        course = CourseFactory.create()
+        descriptors = [
+            ItemFactory(category='html', parent=course, display_name='html {}'.format(index))
+            for index in range(5)
+        ]
+        override_field_for_user(user, descriptors[0], 'display_name', 'overridden')
+        field_data_cache = FieldDataCache([course] + descriptors, course.id, user)
+        modules = [
+            render.get_module_for_descriptor(
+                user, request, descriptor, field_data_cache, course.id, course=course
+            )
+            for descriptor in descriptors
+        ]
+        # Forget what binding the blocks read, so that the reads below load the index.
+        clear_override_indexes()
+        for module in modules:
+            module.fields['display_name']._del_cached_value(module)  # pylint: disable=protected-access
+
+        with self.assertNumQueries(1):
+            display_names = [module.display_name for module in modules]
+        self.assertEqual(display_names, ['overridden', 'html 1', 'html 2', 'html 3', 'html 4'])
+
     def test_hash_resource(self):
         """
         Ensure that the resource hasher works and does not fail on unicode,
@@ -718,6 +753,29 @@ class TestTOC(ModuleStoreTestCase):
             self.assertEquals(actual['previous_of_active_section']['url_name'], 'Toy_Videos')
             self.assertEquals(actual['next_of_active_section']['url_name'], 'video_123456789012')
 
+    # Once the course block structure is cached, no XModules are instantiated
+    # to render the toc. Split still loads the active version at the start of
+    # the bulk operation.
+    @ddt.data((ModuleStoreEnum.Type.mongo, 3, 0, 0), (ModuleStoreEnum.Type.split, 6, 0, 1))
+    @ddt.unpack
+    def test_toc_toy_from_block_structure(self, default_ms, setup_finds, setup_sends, toc_finds):
+        with self.store.default_store(default_ms):
+            self.setup_request_and_course(setup_finds, setup_sends)
+            section = 'Welcome'
+            expected = render.toc_for_course(
+                self.request.user, self.request, self.toy_course, self.chapter, section, self.field_data_cache
+            )
+
+            with patch.dict('django.conf.settings.FEATURES', {'ENABLE_CACHED_TOC': True}):
+                # The first call collects the course block structure
+                render.toc_for_course(self.request.user, self.request, self.toy_course, self.chapter, section, None)
+
+                with check_mongo_calls(toc_finds):
+                    actual = render.toc_for_course(
+                        self.request.user, self.request, self.toy_course, self.chapter, section, None
+                    )
+            self.assertEquals(expected, actual)
+
 
 @attr('shard_1')
 @ddt.ddt
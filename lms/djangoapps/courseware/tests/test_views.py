@@ -1848,6 +1848,20 @@ class TestIndewViewWithVerticalPositions(ModuleStoreTestCase):
         resp = self._get_course_vertical_by_position(input_position)
         self._assert_correct_position(resp, expected_position)
 
+    @patch.dict('django.conf.settings.FEATURES', {'ENABLE_CACHED_TOC': True})
+    def test_vertical_positions_with_cached_toc(self):
+        """
+        Tests that the data of the course is loaded lazily, rather than
+        prefetched, when the table of contents is built from the cached
+        course block structure.
+        """
+        with patch(
+            'courseware.views.index.FieldDataCache.cache_for_descriptor_descendents'
+        ) as mock_cache_for_descriptor_descendents:
+            resp = self._get_course_vertical_by_position("2")
+        self.assertFalse(mock_cache_for_descriptor_descendents.called)
+        self._assert_correct_position(resp, 2)
+
 
 class TestIndexViewWithGating(ModuleStoreTestCase, MilestonesTestCaseMixin):
     """
@@ -0,0 +1,48 @@
+"""
+Table of Contents Transformer
+"""
+from openedx.core.lib.block_structure.transformer import BlockStructureTransformer
+
+
+class TableOfContentsTransformer(BlockStructureTransformer):
+    """
+    The TableOfContentsTransformer collects the fields that the courseware
+    table of contents displays for chapters and sections, so that it can be
+    built from the cached course block structure instead of from XModules.
+
+    No runtime transformations are performed.
+
+    The following values are stored as xblock_fields on their respective
+    blocks in the block structure:
+
+        display_name: (string)
+        due: (datetime) when the section is due.
+        format: (string) the assignment type of the section.
+        graded: (boolean)
+        hide_from_toc: (boolean)
+        is_time_limited: (boolean) whether the section is a timed exam.
+    """
+    VERSION = 1
+    FIELDS_TO_COLLECT = [u'display_name', u'due', u'format', u'graded', u'hide_from_toc', u'is_time_limited']
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return u'table_of_contents'
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects any information that's necessary to execute this
+        transformer's transform method.
+        """
+        block_structure.request_xblock_fields(*cls.FIELDS_TO_COLLECT)
+
+    def transform(self, usage_info, block_structure):
+        """
+        Perform no transformations.
+        """
+        pass
@@ -0,0 +1,368 @@
+"""
+Coalescing of writes to low-value XBlock user state fields.
+
+Some blocks save a field on almost every AJAX call (for instance, the video
+player saves the playback position every few seconds). Writing each of those
+updates to ``StudentModule`` produces a steady stream of tiny writes for every
+active learner. When enabled, updates that only touch the fields configured in
+``settings.COALESCED_USER_STATE_FIELDS`` are instead merged into a per user and
+block entry in the cache named by ``settings.USER_STATE_BUFFER_CACHE``, and
+written to ``StudentModule`` in batches by the
+``courseware.flush_user_state_buffer`` task.
+
+Reads made through :class:`~courseware.model_data.UserStateCache` overlay the
+buffered values on the stored state, so learners always see their latest
+update. Any write of a field that isn't coalesced persists the buffered values
+for that block along with it, and records the coalesced values it writes in
+the buffered entry, which keeps the latest value of each coalesced field.
+
+The cache has no compare-and-set, so entries are only changed while holding a
+lock made with ``cache.add``. Entries are only removed by the flush task, once
+their state has been committed to the database. New entries are queued in
+time buckets, which the flush task goes through once they are closed, so the
+queue doesn't depend on a single counter surviving in the cache. Entries that
+are evicted from the cache are lost, so the buffer cache must be large enough
+to hold them until they are flushed.
+"""
+from contextlib import contextmanager
+import hashlib
+import logging
+import time
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from opaque_keys.edx.keys import CourseKey, UsageKey
+
+from courseware.user_state_client import DjangoXBlockUserStateClient
+
+
+log = logging.getLogger(__name__)
+
+ENTRY_CACHE_KEY = u'courseware.user_state_buffer.entry.{digest}'
+LOCK_CACHE_KEY = u'courseware.user_state_buffer.lock.{digest}'
+BUCKET_SIZE_CACHE_KEY = u'courseware.user_state_buffer.bucket.{bucket}.size'
+SLOT_CACHE_KEY = u'courseware.user_state_buffer.bucket.{bucket}.slot.{slot}'
+FLUSHED_BUCKET_CACHE_KEY = u'courseware.user_state_buffer.flushed_bucket'
+
+# Buffered entries outlive many flush intervals, so that a delayed flush
+# doesn't lose them.
+BUFFER_TIMEOUT = 24 * 60 * 60
+
+# New entries are queued in the bucket of the minute they were created in. A
+# bucket is flushed once this many newer buckets have started, so that entries
+# queued by servers whose clocks lag behind aren't missed.
+BUCKET_SECONDS = 60
+OPEN_BUCKETS = 2
+
+# How long an entry lock is held at most, and how long requests wait for it.
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 2
+LOCK_RETRY_DELAY = 0.05
+
+
+def user_state_buffer_enabled():
+    """
+    Return whether writes to the configured user state fields are coalesced.
+    """
+    return settings.FEATURES.get('ENABLE_COALESCED_USER_STATE_WRITES', False)
+
+
+def current_bucket():
+    """
+    Return the queue bucket of the current time.
+    """
+    return int(time.time()) // BUCKET_SECONDS
+
+
+class UserStateBufferBusy(Exception):
+    """
+    Raised when a buffered entry stays locked by another process for too long.
+    """
+    pass
+
+
+class UserStateWriteBuffer(object):
+    """
+    Buffers updates of coalesced user state fields in the shared cache.
+    """
+    def __init__(self, coalesced_fields=None):
+        """
+        Arguments:
+            coalesced_fields (dict): Maps block types to the names of the
+                fields whose updates are buffered. Defaults to
+                ``settings.COALESCED_USER_STATE_FIELDS``.
+        """
+        if coalesced_fields is None:
+            coalesced_fields = getattr(settings, 'COALESCED_USER_STATE_FIELDS', {})
+        self.coalesced_fields = {
+            block_type: frozenset(field_names)
+            for block_type, field_names in coalesced_fields.iteritems()
+        }
+        self.cache = caches[getattr(settings, 'USER_STATE_BUFFER_CACHE', 'default')]
+
+    def defer(self, user, block_keys_to_state):
+        """
+        Buffer the updates in `block_keys_to_state` that only touch coalesced
+        fields, and return the updates that must be written now.
+
+        Updates of blocks that have buffered state are returned merged over
+        that state, and their coalesced fields are recorded in the buffer.
+
+        Arguments:
+            user (User): The user whose state is being updated.
+            block_keys_to_state (dict): Maps UsageKeys to dicts of field
+                names to values.
+
+        Raises:
+            UserStateBufferBusy: if the buffered entry of a block couldn't be locked.
+        """
+        if not user.is_authenticated():
+            return block_keys_to_state
+
+        to_write = {}
+        for usage_key, state in block_keys_to_state.iteritems():
+            coalesced = self.coalesced_fields.get(usage_key.block_type)
+            if coalesced is None:
+                to_write[usage_key] = state
+                continue
+
+            coalesced_state = {field: value for field, value in state.iteritems() if field in coalesced}
+            with self._locked(self._digest(user, usage_key)):
+                if len(coalesced_state) == len(state):
+                    self._buffer(user, usage_key, coalesced_state)
+                else:
+                    to_write[usage_key] = self._merge(user, usage_key, state, coalesced_state)
+        return to_write
+
+    def pending_state(self, user, block_keys):
+        """
+        Return a dict mapping each of `block_keys` that has buffered updates
+        for `user` to its buffered field values.
+        """
+        if not user.is_authenticated():
+            return {}
+
+        entry_keys = {
+            ENTRY_CACHE_KEY.format(digest=self._digest(user, usage_key)): usage_key
+            for usage_key in block_keys
+            if usage_key.block_type in self.coalesced_fields
+        }
+        if not entry_keys:
+            return {}
+
+        return {
+            entry_keys[entry_key]: entry['state']
+            for entry_key, entry in self.cache.get_many(entry_keys.keys()).iteritems()
+        }
+
+    def flush(self, batch_size=500):
+        """
+        Write the buffered updates queued in closed buckets to StudentModule,
+        `batch_size` entries at a time. Returns the number of entries written.
+        """
+        last_closed = current_bucket() - OPEN_BUCKETS
+        flushed = self.cache.get(FLUSHED_BUCKET_CACHE_KEY)
+        if flushed is None:
+            # Without a record of the flushed buckets, go through the buckets
+            # that can still have entries and still know their size.
+            size_keys = {
+                BUCKET_SIZE_CACHE_KEY.format(bucket=bucket): bucket
+                for bucket in xrange(last_closed - BUFFER_TIMEOUT // BUCKET_SECONDS, last_closed + 1)
+            }
+            buckets = sorted(size_keys[size_key] for size_key in self.cache.get_many(size_keys.keys()))
+        else:
+            buckets = xrange(flushed + 1, last_closed + 1)
+
+        num_written = 0
+        for bucket in buckets:
+            num_written += self._flush_bucket(bucket, batch_size)
+            self.cache.set(FLUSHED_BUCKET_CACHE_KEY, bucket, None)
+        return num_written
+
+    def _flush_bucket(self, bucket, batch_size):
+        """
+        Write the entries queued in `bucket`, and return how many were written.
+        """
+        size_key = BUCKET_SIZE_CACHE_KEY.format(bucket=bucket)
+        size = self.cache.get(size_key)
+        num_written = 0
+
+        start = 1
+        while size is None or start <= size:
+            stop = start + batch_size if size is None else min(start + batch_size, size + 1)
+            slot_keys = [SLOT_CACHE_KEY.format(bucket=bucket, slot=slot) for slot in xrange(start, stop)]
+            digests = set(self.cache.get_many(slot_keys).values())
+            if size is None and not digests:
+                # The size of the bucket was evicted, so its slots end at the
+                # first batch without any.
+                break
+
+            num_written += self._flush_entries(digests)
+            self.cache.delete_many(slot_keys)
+            start = stop
+
+        self.cache.delete(size_key)
+        return num_written
+
+    def _flush_entries(self, digests):
+        """
+        Write the buffered entries with the given digests, and return how many
+        were written. Entries that can't be locked or written are queued again.
+        """
+        entry_keys = {ENTRY_CACHE_KEY.format(digest=digest): digest for digest in digests}
+        by_username = {}
+        for entry_key, entry in self.cache.get_many(entry_keys.keys()).iteritems():
+            by_username.setdefault(entry['username'], []).append(entry_keys[entry_key])
+
+        num_written = 0
+        for username, user_digests in by_username.iteritems():
+            num_written += self._flush_user_entries(username, user_digests)
+        return num_written
+
+    def _flush_user_entries(self, username, digests):
+        """
+        Write the buffered entries of `username` with the given digests in one
+        transaction, and return how many were written. The entries are locked
+        from before they are read until they are removed from the buffer.
+        """
+        tokens = {}
+        for digest in digests:
+            token = self._lock(digest, wait=0)
+            if token is None:
+                self._queue(digest)
+            else:
+                tokens[digest] = token
+
+        try:
+            entry_keys = {ENTRY_CACHE_KEY.format(digest=digest): digest for digest in tokens}
+            updates = {}
+            for entry_key, entry in self.cache.get_many(entry_keys.keys()).iteritems():
+                usage_key = UsageKey.from_string(entry['usage_key']).map_into_course(
+                    CourseKey.from_string(entry['course_key'])
+                )
+                updates[usage_key] = entry['state']
+            if not updates:
+                return 0
+
+            try:
+                with transaction.atomic():
+                    DjangoXBlockUserStateClient().set_many(username, updates)
+            except Exception:  # pylint: disable=broad-except
+                log.exception("Failed to flush buffered user state for %s", username)
+                # Leave the entries in the buffer for the next flush.
+                for digest in tokens:
+                    self._queue(digest)
+                return 0
+
+            self.cache.delete_many(entry_keys.keys())
+            return len(updates)
+        finally:
+            for digest, token in tokens.iteritems():
+                self._unlock(digest, token)
+
+    def _buffer(self, user, usage_key, state):
+        """
+        Merge `state` into the buffered entry for `user` and `usage_key`,
+        queueing the entry for the next flush if it isn't queued.
+
+        Must be called while holding the lock of the entry.
+        """
+        digest = self._digest(user, usage_key)
+        entry_key = ENTRY_CACHE_KEY.format(digest=digest)
+        entry = self.cache.get(entry_key)
+        if entry is None:
+            entry = {
+                'username': user.username,
+                'usage_key': unicode(usage_key),
+                'course_key': unicode(usage_key.course_key),
+                'state': {},
+                'slot': None,
+            }
+        entry['state'].update(state)
+        # The slot is gone if it was flushed while the entry was locked, or evicted.
+        if entry['slot'] is None or self.cache.get(entry['slot']) != digest:
+            entry['slot'] = self._queue(digest)
+        self.cache.set(entry_key, entry, BUFFER_TIMEOUT)
+
+    def _merge(self, user, usage_key, state, coalesced_state):
+        """
+        Return `state` merged over the buffered entry for `user` and
+        `usage_key`, recording its `coalesced_state` in the entry. The entry
+        stays in the buffer, as the caller's write isn't committed yet.
+
+        Must be called while holding the lock of the entry.
+        """
+        entry = self.cache.get(ENTRY_CACHE_KEY.format(digest=self._digest(user, usage_key)))
+        if entry is None:
+            return state
+        merged = dict(entry['state'])
+        merged.update(state)
+        if coalesced_state:
+            self._buffer(user, usage_key, coalesced_state)
+        return merged
+
+    def _queue(self, digest):
+        """
+        Give the buffered entry with `digest` a slot in the current bucket, so
+        that it is written by the flush of that bucket. Returns the slot key.
+        """
+        flushed = self.cache.get(FLUSHED_BUCKET_CACHE_KEY, 0)
+        # Never queue in a bucket that was flushed already, even if this
+        # server's clock lags behind the one of the flush task.
+        bucket = max(current_bucket(), flushed + 1)
+        size_key = BUCKET_SIZE_CACHE_KEY.format(bucket=bucket)
+        self.cache.add(size_key, 0, BUFFER_TIMEOUT)
+        slot_key = SLOT_CACHE_KEY.format(bucket=bucket, slot=self.cache.incr(size_key))
+        self.cache.set(slot_key, digest, BUFFER_TIMEOUT)
+        return slot_key
+
+    @contextmanager
+    def _locked(self, digest):
+        """
+        Hold the lock of the buffered entry with `digest`.
+
+        Raises:
+            UserStateBufferBusy: if the lock couldn't be acquired in time.
+        """
+        token = self._lock(digest)
+        if token is None:
+            raise UserStateBufferBusy(digest)
+        try:
+            yield
+        finally:
+            self._unlock(digest, token)
+
+    def _lock(self, digest, wait=None):
+        """
+        Acquire the lock of the buffered entry with `digest`, waiting up to
+        `wait` seconds (by default LOCK_WAIT) for it. Returns the token of the
+        lock, or None.
+        """
+        if wait is None:
+            wait = LOCK_WAIT
+        lock_key = LOCK_CACHE_KEY.format(digest=digest)
+        token = uuid4().hex
+        deadline = time.time() + wait
+        while not self.cache.add(lock_key, token, LOCK_TIMEOUT):
+            if time.time() >= deadline:
+                return None
+            time.sleep(LOCK_RETRY_DELAY)
+        return token
+
+    def _unlock(self, digest, token):
+        """
+        Release the lock of the buffered entry with `digest`, unless it timed
+        out and was acquired by someone else.
+        """
+        lock_key = LOCK_CACHE_KEY.format(digest=digest)
+        if self.cache.get(lock_key) == token:
+            self.cache.delete(lock_key)
+
+    @staticmethod
+    def _digest(user, usage_key):
+        """
+        Return the digest identifying the buffered entry for `user` and `usage_key`.
+        """
+        return hashlib.md5(u'{}|{}'.format(user.id, usage_key).encode('utf-8')).hexdigest()
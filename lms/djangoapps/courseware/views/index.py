@@ -50,7 +50,7 @@ from ..entrance_exams import (
 from ..exceptions import Redirect
 from ..masquerade import setup_masquerade
 from ..model_data import FieldDataCache
-from ..module_render import toc_for_course, get_module_for_descriptor
+from ..module_render import toc_for_course, get_module_for_descriptor, can_use_cached_toc
 from .views import get_current_child, registered_for_course
 
 
@@ -334,16 +334,30 @@ class CoursewareIndex(View):
         Finds the requested section.
         """
         if self.chapter:
+            if self.field_data_cache.lazy:
+                # Only the sections of the requested chapter are bound.
+                self.field_data_cache.add_block_keys_to_cache(self.chapter.children)
             return self._find_block(self.chapter, self.section_url_name, 'section')
 
     def _prefetch_and_bind_course(self):
         """
-        Prefetches all descendant data for the requested section and
-        sets up the runtime, which binds the request user to the section.
+        Prefetches the data for the course and its chapters and sections and
+        sets up the runtime, which binds the request user to the course.
+
+        When the table of contents is built from the cached course block
+        structure, only the course and the requested chapter and section are
+        bound, so their data is loaded lazily as they are found. Otherwise
+        toc_for_course binds every chapter and section of the course, so all
+        of their data is prefetched up front.
         """
-        self.field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
-            self.course_key, self.effective_user, self.course, depth=CONTENT_DEPTH,
-        )
+        if can_use_cached_toc(self.effective_user, self.course):
+            self.field_data_cache = FieldDataCache.cache_for_block_keys(
+                self.course_key, self.effective_user, [self.course.location] + self.course.children,
+            )
+        else:
+            self.field_data_cache = FieldDataCache.cache_for_descriptor_descendents(
+                self.course_key, self.effective_user, self.course, depth=CONTENT_DEPTH,
+            )
 
         self.course = get_module_for_descriptor(
             self.effective_user,
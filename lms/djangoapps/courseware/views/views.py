@@ -85,6 +85,7 @@ from util.cache import cache, cache_if_anonymous
 from util.date_utils import strftime_localized
 from util.db import outer_atomic
 from util.milestones_helpers import get_prerequisite_courses_display
+from util.query import read_mostly
 from util.views import _record_feedback_in_zendesk
 from util.views import ensure_valid_course_key
 from xmodule.modulestore.django import modulestore
@@ -658,6 +659,7 @@ def course_about(request, course_id):
 @login_required
 @cache_control(no_cache=True, no_store=True, must_revalidate=True)
 @ensure_valid_course_key
+@read_mostly
 def progress(request, course_id, student_id=None):
     """ Display the progress page. """
     course_key = CourseKey.from_string(course_id)
@@ -46,7 +46,8 @@ from django_comment_client.utils import get_accessible_discussion_xblocks, is_co
 from lms.djangoapps.discussion_api.pagination import DiscussionAPIPagination
 from lms.lib.comment_client.comment import Comment
 from lms.lib.comment_client.thread import Thread
-from lms.lib.comment_client.utils import CommentClientRequestError
+from lms.lib.comment_client.user import User as CommentClientUser
+from lms.lib.comment_client.utils import CommentClientRequestError, perform_concurrently
 from openedx.core.djangoapps.course_groups.cohorts import get_cohort_id
 from openedx.core.lib.exceptions import CourseNotFoundError, PageNotFoundError, DiscussionNotFoundError
 
@@ -98,10 +99,13 @@ def _get_thread_and_context(request, thread_id, retrieve_kwargs=None):
     try:
         if "mark_as_read" not in retrieve_kwargs:
             retrieve_kwargs["mark_as_read"] = False
-        cc_thread = Thread(id=thread_id).retrieve(**retrieve_kwargs)
+        cc_thread, cc_requester = perform_concurrently(
+            lambda: Thread(id=thread_id).retrieve(**retrieve_kwargs),
+            lambda: CommentClientUser.from_django_user(request.user).retrieve(),
+        )
         course_key = CourseKey.from_string(cc_thread["course_id"])
         course = _get_course(course_key, request.user)
-        context = get_context(course, request, cc_thread)
+        context = get_context(course, request, cc_thread, cc_requester=cc_requester)
         if (
                 not context["is_requester_privileged"] and
                 cc_thread["group_id"] and
@@ -525,7 +529,9 @@ def get_thread_list(
         })
 
     course = _get_course(course_key, request.user)
-    context = get_context(course, request)
+    # The requester is retrieved from the comments service along with the
+    # threads, below.
+    context = get_context(course, request, cc_requester=CommentClientUser.from_django_user(request.user))
 
     query_params = {
         "user_id": unicode(request.user.id),
@@ -551,12 +557,19 @@ def get_thread_list(
             })
 
     if following:
-        paginated_results = context["cc_requester"].subscribed_threads(query_params)
+        get_threads = lambda: context["cc_requester"].subscribed_threads(query_params)
     else:
         query_params["course_id"] = unicode(course.id)
         query_params["commentable_ids"] = ",".join(topic_id_list) if topic_id_list else None
         query_params["text"] = text_search
-        paginated_results = Thread.search(query_params)
+        get_threads = lambda: Thread.search(query_params)
+
+    cc_requester, paginated_results = perform_concurrently(
+        lambda: CommentClientUser.from_django_user(request.user).retrieve(),
+        get_threads,
+    )
+    cc_requester["course_id"] = course.id
+    context["cc_requester"] = cc_requester
     # The comments service returns the last page of results if the requested
     # page is beyond the last page, but we want be consistent with DRF's general
     # behavior and return a PageNotFoundError in that case
@@ -14,6 +14,7 @@ from pytz import UTC
 
 from django.core.exceptions import ValidationError
 from django.test.client import RequestFactory
+from django.test.utils import override_settings
 
 from rest_framework.exceptions import PermissionDenied
 
@@ -892,6 +893,19 @@ class GetThreadListTest(CommentsServiceMockMixin, UrlResetMixin, SharedModuleSto
             "per_page": ["11"],
         })
 
+    @override_settings(COMMENTS_SERVICE_CONCURRENCY=2)
+    def test_concurrent_requests(self):
+        self.register_subscribed_threads_response(self.user, [], page=1, num_pages=0)
+        result = get_thread_list(self.request, self.course.id, page=1, page_size=11, following=True).data
+        self.assertEqual(result["results"], [])
+        self.assertEqual(
+            {urlparse(request.path).path for request in httpretty.httpretty.latest_requests},
+            {
+                "/api/v1/users/{}".format(self.user.id),
+                "/api/v1/users/{}/subscribed_threads".format(self.user.id),
+            }
+        )
+
     @ddt.data("unanswered", "unread")
     def test_view_query(self, query):
         self.register_get_threads_response([], page=1, num_pages=0)
@@ -23,6 +23,7 @@ from openedx.core.djangoapps.course_groups.tests.helpers import config_course_co
 from student.tests.factories import UserFactory, AdminFactory, CourseEnrollmentFactory
 from openedx.core.djangoapps.content.course_structures.models import CourseStructure
 from openedx.core.djangoapps.util.testing import ContentGroupTestCase
+from request_cache.middleware import RequestCache
 from student.roles import CourseStaffRole
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory, ToyCourseFactory
@@ -319,6 +320,30 @@ class CachedDiscussionIdMapTestCase(ModuleStoreTestCase):
         self.assertFalse(utils.discussion_category_id_access(self.course, user, 'private_discussion_id'))
 
 
+@attr('shard_1')
+@mock.patch.dict('django.conf.settings.FEATURES', {'ENABLE_DISCUSSION_INDEX': True})
+class DiscussionIndexTestCase(CachedDiscussionIdMapTestCase):
+    """
+    Tests that reading discussions from the index collected with the course block structure has the same behavior
+    as searching through the course.
+    """
+    def setUp(self):
+        super(DiscussionIndexTestCase, self).setUp()
+        RequestCache.clear_request_cache()
+
+    def test_modulestore_not_searched(self):
+        with mock.patch.object(utils, 'get_accessible_discussion_xblocks') as mock_get_xblocks:
+            self.verify_discussion_metadata()
+            self.assertTrue(utils.discussion_category_id_access(self.course, self.user, 'test_discussion_id'))
+            utils.get_discussion_category_map(self.course, self.user)
+        self.assertFalse(mock_get_xblocks.called)
+
+    def test_category_map_matches_modulestore(self):
+        expected = utils.get_discussion_category_map(self.course, self.user)
+        with mock.patch.dict('django.conf.settings.FEATURES', {'ENABLE_DISCUSSION_INDEX': False}):
+            self.assertEqual(utils.get_discussion_category_map(self.course, self.user), expected)
+
+
 class CategoryMapTestMixin(object):
     """
     Provides functionality for classes that test
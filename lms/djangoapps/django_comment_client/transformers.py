@@ -0,0 +1,69 @@
+"""
+Discussions Transformer
+"""
+from openedx.core.lib.block_structure.transformer import BlockStructureTransformer
+
+
+class DiscussionIndexTransformer(BlockStructureTransformer):
+    """
+    The DiscussionIndexTransformer precomputes, when the course block structure
+    is collected, the index of the course's inline discussions that the forum
+    category map and discussion id map are built from.
+
+    No runtime transformations are performed. Combined with the course block
+    access transformers, the discussions accessible to a user are the indexed
+    ones whose block remains in their transformed block structure.
+
+    The index is stored as transformer data under the key 'index'. It is a
+    list, in course order, of a dict for each discussion block that has a
+    discussion_id, discussion_category and discussion_target:
+
+        location: (UsageKey) the usage key of the discussion block.
+        id: (string) the discussion_id.
+        category: (string) the discussion_category.
+        title: (string) the discussion_target.
+        sort_key: (string) the sort_key.
+        start: (datetime) the start date of the block.
+    """
+    VERSION = 1
+    INDEX = 'index'
+
+    @classmethod
+    def name(cls):
+        """
+        Unique identifier for the transformer's class;
+        same identifier used in setup.py.
+        """
+        return u'discussion_index'
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects any information that's necessary to execute this
+        transformer's transform method.
+        """
+        index = []
+        for block_key in block_structure.topological_traversal():
+            if block_key.block_type != 'discussion':
+                continue
+            xblock = block_structure.get_xblock(block_key)
+            if any(
+                    getattr(xblock, field_name, None) is None
+                    for field_name in ('discussion_id', 'discussion_category', 'discussion_target')
+            ):
+                continue
+            index.append({
+                'location': block_key,
+                'id': xblock.discussion_id,
+                'category': xblock.discussion_category,
+                'title': xblock.discussion_target,
+                'sort_key': xblock.sort_key,
+                'start': xblock.start,
+            })
+        block_structure.set_transformer_data(cls, cls.INDEX, index)
+
+    def transform(self, usage_info, block_structure):
+        """
+        Perform no transformations.
+        """
+        pass
@@ -7,7 +7,7 @@ from django.conf import settings
 import pytz
 from django.contrib.auth.models import User
 from django.core.urlresolvers import reverse
-from django.db import connection
+from django.db import connections
 from django.http import HttpResponse
 from django.utils.timezone import UTC
 import pystache_custom as pystache
@@ -15,10 +15,16 @@ from opaque_keys.edx.locations import i4xEncoder
 from opaque_keys.edx.keys import CourseKey
 from xmodule.modulestore.django import modulestore
 from lms.djangoapps.ccx.overrides import get_current_ccx
+from ccx_keys.locator import CCXLocator
+from course_blocks.api import COURSE_BLOCK_ACCESS_TRANSFORMERS, get_course_blocks
+from openedx.core.lib.block_structure.transformers import BlockStructureTransformers
+from request_cache.middleware import RequestCache
+from util.query import query_time
 
 from django_comment_common.models import Role, FORUM_ROLE_STUDENT
 from django_comment_client.permissions import check_permissions_by_view, has_permission, get_team
 from django_comment_client.settings import MAX_COMMENT_DEPTH
+from django_comment_client.transformers import DiscussionIndexTransformer
 from edxmako import lookup_template
 
 from courseware import courses
@@ -137,15 +143,72 @@ def get_accessible_discussion_xblocks(course, user, include_all=False):  # pylin
     ]
 
 
+def _discussion_index_enabled(course):
+    """
+    Returns True if the discussions accessible in course are read from the
+    discussion index collected with the course block structure.
+    """
+    return settings.FEATURES.get('ENABLE_DISCUSSION_INDEX', False) and not isinstance(course.id, CCXLocator)
+
+
+def get_accessible_discussion_entries(course, user):
+    """
+    Return the index entries (see DiscussionIndexTransformer) of all valid
+    discussion xblocks in this course that are accessible to the given user,
+    without loading the xblocks from the modulestore.
+
+    The result is cached for the rest of the request.
+    """
+    cache_key = u"django_comment_client.discussion_entries.{}.{}".format(course.id, user.id)
+    request_cache_dict = RequestCache.get_request_cache().data
+    if cache_key not in request_cache_dict:
+        transformers = BlockStructureTransformers(COURSE_BLOCK_ACCESS_TRANSFORMERS + [DiscussionIndexTransformer()])
+        block_structure = get_course_blocks(user, course.location, transformers)
+        index = block_structure.get_transformer_data(DiscussionIndexTransformer, DiscussionIndexTransformer.INDEX, [])
+        request_cache_dict[cache_key] = [entry for entry in index if entry['location'] in block_structure]
+    return request_cache_dict[cache_key]
+
+
+def _get_accessible_discussion_entries(course, user):
+    """
+    Returns the index entries of the discussions accessible to user in course,
+    from the discussion index if enabled or else from the modulestore.
+    """
+    if _discussion_index_enabled(course):
+        return get_accessible_discussion_entries(course, user)
+    return [_discussion_entry(xblock) for xblock in get_accessible_discussion_xblocks(course, user)]
+
+
+def _discussion_entry(xblock):
+    """
+    Returns the discussion index entry for a discussion xblock.
+    """
+    return {
+        'location': xblock.location,
+        'id': xblock.discussion_id,
+        'category': xblock.discussion_category,
+        'title': xblock.discussion_target,
+        'sort_key': xblock.sort_key,
+        'start': xblock.start,
+    }
+
+
 def get_discussion_id_map_entry(xblock):
     """
     Returns a tuple of (discussion_id, metadata) suitable for inclusion in the results of get_discussion_id_map().
     """
+    return _get_discussion_id_map_entry(_discussion_entry(xblock))
+
+
+def _get_discussion_id_map_entry(entry):
+    """
+    Returns a tuple of (discussion_id, metadata) for a discussion index entry.
+    """
     return (
-        xblock.discussion_id,
+        entry["id"],
         {
-            "location": xblock.location,
-            "title": xblock.discussion_category.split("/")[-1].strip() + " / " + xblock.discussion_target
+            "location": entry["location"],
+            "title": entry["category"].split("/")[-1].strip() + " / " + entry["title"]
         }
     )
 
@@ -175,6 +238,9 @@ def get_cached_discussion_id_map(course, discussion_ids, user):
     Returns a dict mapping discussion_ids to respective discussion xblock metadata if it is cached and visible to the
     user. If not, returns the result of get_discussion_id_map
     """
+    if _discussion_index_enabled(course):
+        return get_discussion_id_map(course, user, discussion_ids)
+
     try:
         entries = []
         for discussion_id in discussion_ids:
@@ -190,12 +256,16 @@ def get_cached_discussion_id_map(course, discussion_ids, user):
         return get_discussion_id_map(course, user)
 
 
-def get_discussion_id_map(course, user):
+def get_discussion_id_map(course, user, discussion_ids=None):
     """
     Transform the list of this course's discussion xblocks (visible to a given user) into a dictionary of metadata keyed
-    by discussion_id.
+    by discussion_id, limited to discussion_ids if given.
     """
-    return dict(map(get_discussion_id_map_entry, get_accessible_discussion_xblocks(course, user)))
+    entries = _get_accessible_discussion_entries(course, user)
+    if discussion_ids is not None:
+        discussion_ids = set(discussion_ids)
+        entries = [entry for entry in entries if entry["id"] in discussion_ids]
+    return dict(map(_get_discussion_id_map_entry, entries))
 
 
 def _filter_unstarted_categories(category_map, course):
@@ -301,20 +371,15 @@ def get_discussion_category_map(course, user, cohorted_if_in_list=False, exclude
     """
     unexpanded_category_map = defaultdict(list)
 
-    xblocks = get_accessible_discussion_xblocks(course, user)
-
     course_cohort_settings = get_course_cohort_settings(course.id)
 
-    for xblock in xblocks:
-        discussion_id = xblock.discussion_id
-        title = xblock.discussion_target
-        sort_key = xblock.sort_key
-        category = " / ".join([x.strip() for x in xblock.discussion_category.split("/")])
-        # Handle case where xblock.start is None
-        entry_start_date = xblock.start if xblock.start else datetime.max.replace(tzinfo=pytz.UTC)
-        unexpanded_category_map[category].append({"title": title,
-                                                  "id": discussion_id,
-                                                  "sort_key": sort_key,
+    for entry in _get_accessible_discussion_entries(course, user):
+        category = " / ".join([x.strip() for x in entry["category"].split("/")])
+        # Handle case where the xblock's start is None
+        entry_start_date = entry["start"] if entry["start"] else datetime.max.replace(tzinfo=pytz.UTC)
+        unexpanded_category_map[category].append({"title": entry["title"],
+                                                  "id": entry["id"],
+                                                  "sort_key": entry["sort_key"],
                                                   "start_date": entry_start_date})
 
     category_map = {"entries": defaultdict(dict), "subcategories": defaultdict(dict)}
@@ -397,6 +462,8 @@ def discussion_category_id_access(course, user, discussion_id, xblock=None):
     """
     if discussion_id in course.top_level_discussion_topic_ids:
         return True
+    if xblock is None and _discussion_index_enabled(course):
+        return any(entry["id"] == discussion_id for entry in get_accessible_discussion_entries(course, user))
     try:
         if not xblock:
             key = get_cached_discussion_key(course, discussion_id)
@@ -478,29 +545,21 @@ class ViewNameMiddleware(object):
 class QueryCountDebugMiddleware(object):
     """
     This middleware will log the number of queries run
-    and the total time taken for each request (with a
-    status code of 200). It does not currently support
-    multi-db setups.
+    on all the databases and the total time taken for
+    each request (with a status code of 200). Queries
+    are only logged when DEBUG is True. See
+    util.middleware.QueryBudgetMiddleware to track the
+    queries of views in production.
     """
     def process_response(self, request, response):
         """
         Log information for 200 OK responses as part of the outbound pipeline
         """
         if response.status_code == 200:
-            total_time = 0
-
-            for query in connection.queries:
-                query_time = query.get('time')
-                if query_time is None:
-                    # django-debug-toolbar monkeypatches the connection
-                    # cursor wrapper and adds extra information in each
-                    # item in connection.queries. The query time is stored
-                    # under the key "duration" rather than "time" and is
-                    # in milliseconds, not seconds.
-                    query_time = query.get('duration', 0) / 1000
-                total_time += float(query_time)
-
-            log.info(u'%s queries run, total %s seconds', len(connection.queries), total_time)
+            queries = [query for connection in connections.all() for query in connection.queries]
+            total_time = sum(query_time(query) for query in queries)
+
+            log.info(u'%s queries run, total %s seconds', len(queries), total_time)
         return response
 
 
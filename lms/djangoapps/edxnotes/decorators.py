@@ -21,19 +21,30 @@ def edxnotes(cls):
     Decorator that makes components annotatable.
     """
     original_get_html = cls.get_html
+    original_student_invariant_views = getattr(cls, 'student_invariant_views', ())
+
+    def get_course_and_enabled(self):
+        """
+        Returns the course of the component and whether notes are enabled for
+        it, looking the course up only once per component instance.
+        """
+        if not hasattr(self, '_edxnotes_course_enabled'):
+            course = self.descriptor.runtime.modulestore.get_course(self.runtime.course_id)
+            self._edxnotes_course_enabled = (course, is_feature_enabled(course))  # pylint: disable=protected-access
+        return self._edxnotes_course_enabled  # pylint: disable=protected-access
 
     def get_html(self, *args, **kwargs):
         """
         Returns raw html for the component.
         """
         is_studio = getattr(self.system, "is_author_mode", False)
-        course = self.descriptor.runtime.modulestore.get_course(self.runtime.course_id)
+        course, enabled = get_course_and_enabled(self)
 
         # Must be disabled:
         # - in Studio;
         # - when Harvard Annotation Tool is enabled for the course;
         # - when the feature flag or `edxnotes` setting of the course is set to False.
-        if is_studio or not is_feature_enabled(course):
+        if is_studio or not enabled:
             return original_get_html(self, *args, **kwargs)
         else:
             return render_to_string("edxnotes_wrapper.html", {
@@ -54,5 +65,18 @@ def edxnotes(cls):
                 },
             })
 
+    def student_invariant_views(self):
+        """
+        Annotatable components embed a per-user notes token, so none of their
+        views are student-invariant while notes are enabled for the course.
+        """
+        __, enabled = get_course_and_enabled(self)
+        if enabled:
+            return ()
+        if isinstance(original_student_invariant_views, property):
+            return original_student_invariant_views.fget(self)
+        return original_student_invariant_views
+
     cls.get_html = get_html
+    cls.student_invariant_views = property(student_invariant_views)
     return cls
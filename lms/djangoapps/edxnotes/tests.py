@@ -162,6 +162,21 @@ class EdxNotesDecoratorTest(ModuleStoreTestCase):
         self.problem.system.is_author_mode = True
         self.assertEqual("original_get_html", self.problem.get_html())
 
+    @patch.dict("django.conf.settings.FEATURES", {"ENABLE_EDXNOTES": True})
+    @patch("edxnotes.decorators.get_public_endpoint", MagicMock(return_value="/endpoint"))
+    @patch("edxnotes.decorators.get_token_url", MagicMock(return_value="/tokenUrl"))
+    @patch("edxnotes.decorators.get_edxnotes_id_token", MagicMock(return_value="token"))
+    def test_course_fetched_once(self):
+        """
+        Tests that the course is looked up only once per component, however
+        often its student-invariant views are checked.
+        """
+        enable_edxnotes_for_the_course(self.course, self.user.id)
+        for __ in range(3):
+            self.assertEqual((), self.problem.student_invariant_views)
+        self.problem.get_html()
+        self.assertEqual(self.problem.descriptor.runtime.modulestore.get_course.call_count, 1)
+
     def test_edxnotes_harvard_notes_enabled(self):
         """
         Tests that get_html is not wrapped when Harvard Annotation Tool is enabled.
@@ -34,6 +34,7 @@ from survey.models import SurveyAnswer
 from track.views import task_track
 from util.db import outer_atomic
 from util.file import course_filename_prefix_generator, UniversalNewlineIterator
+from util.query import read_mostly
 from xblock.runtime import KvsFieldData
 from xmodule.modulestore.django import modulestore
 from xmodule.split_test_module import get_split_user_partitions
@@ -653,6 +654,7 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
+@read_mostly
 def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
     """
     For a given `course_id`, generate a grades CSV file for all students that
@@ -869,6 +871,7 @@ def _order_problems(blocks):
     return problems
 
 
+@read_mostly
 def upload_problem_responses_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing
@@ -903,6 +906,7 @@ def upload_problem_responses_csv(_xmodule_instance_args, _entry_id, course_id, t
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+@read_mostly
 def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     Generate a CSV containing all students' problem grades within a given
@@ -977,6 +981,7 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
     return task_progress.update_task_state(extra_meta={'step': 'Uploading CSV'})
 
 
+@read_mostly
 def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing profile
@@ -1010,6 +1015,7 @@ def upload_students_csv(_xmodule_instance_args, _entry_id, course_id, task_input
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+@read_mostly
 def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing profile
@@ -1131,6 +1137,7 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+@read_mostly
 def upload_may_enroll_csv(_xmodule_instance_args, _entry_id, course_id, task_input, action_name):
     """
     For a given `course_id`, generate a CSV file containing
@@ -1246,6 +1253,7 @@ def get_executive_report(course_id):
     }
 
 
+@read_mostly
 def upload_exec_summary_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a html report containing information,
@@ -1309,6 +1317,7 @@ def upload_exec_summary_report(_xmodule_instance_args, _entry_id, course_id, _ta
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+@read_mostly
 def upload_course_survey_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a html report containing the survey results for a course.
@@ -1367,6 +1376,7 @@ def upload_course_survey_report(_xmodule_instance_args, _entry_id, course_id, _t
     return task_progress.update_task_state(extra_meta=current_step)
 
 
+@read_mostly
 def upload_proctored_exam_results_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=invalid-name
     """
     For a given `course_id`, generate a CSV file containing
@@ -1617,6 +1627,7 @@ def invalidate_generated_certificates(course_id, enrolled_students, certificate_
     )
 
 
+@read_mostly
 def upload_ora2_data(
         _xmodule_instance_args, _entry_id, course_id, _task_input, action_name
 ):
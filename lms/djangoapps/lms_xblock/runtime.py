@@ -216,8 +216,57 @@ class LmsModuleSystem(ModuleSystem):  # pylint: disable=abstract-method
         if badges_enabled():
             services['badging'] = BadgingService(course_id=kwargs.get('course_id'), modulestore=store)
         self.request_token = kwargs.pop('request_token', None)
+        self.fragment_cache = kwargs.pop('fragment_cache', None)
+        self._pending_fragment_cache_fills = set()
         super(LmsModuleSystem, self).__init__(**kwargs)
 
+    def render(self, block, view_name, context=None):
+        """
+        Render `view_name` on `block`. If a fragment cache is configured and
+        the view is student-invariant, the output of the view is served from
+        (or stored in) the cache. The runtime wrappers are applied, in order,
+        on every render.
+
+        See :method:`xblock.runtime:Runtime.render`
+        """
+        if not self._use_fragment_cache(block, view_name):
+            return super(LmsModuleSystem, self).render(block, view_name, context)
+
+        frag = self.fragment_cache.get(block, view_name, context)
+        if frag is not None:
+            return self.wrap_xblock(block, view_name, frag, context)
+
+        fill_key = (block.scope_ids.usage_id, view_name)
+        self._pending_fragment_cache_fills.add(fill_key)
+        try:
+            return super(LmsModuleSystem, self).render(block, view_name, context)
+        finally:
+            self._pending_fragment_cache_fills.discard(fill_key)
+
+    def wrap_xblock(self, block, view, frag, context):
+        """
+        Apply the runtime wrappers to `frag`, storing it in the fragment cache
+        first if this render is filling the cache.
+
+        See :method:`xblock.runtime:Runtime.wrap_child`
+        """
+        fill_key = (block.scope_ids.usage_id, view)
+        if fill_key in self._pending_fragment_cache_fills:
+            self._pending_fragment_cache_fills.discard(fill_key)
+            self.fragment_cache.set(block, view, frag, context)
+        return super(LmsModuleSystem, self).wrap_xblock(block, view, frag, context)
+
+    def _use_fragment_cache(self, block, view_name):
+        """
+        Return whether the output of `view_name` on `block` is served from
+        the fragment cache.
+        """
+        return (
+            self.fragment_cache is not None and
+            self.fragment_cache.can_cache(block, view_name) and
+            not self.applicable_aside_types(block)
+        )
+
     def handler_url(self, *args, **kwargs):
         """
         Implement the XBlock runtime handler_url interface.
@@ -1,8 +1,10 @@
 """
 Tests of the LMS XBlock Runtime and associated utilities
 """
+import datetime
 
 from django.conf import settings
+from django.core.cache import cache
 from ddt import ddt, data
 from django.test import TestCase
 from mock import Mock, patch
@@ -13,9 +15,11 @@ from opaque_keys.edx.locations import BlockUsageLocator, CourseLocator, SlashSep
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
 from badges.tests.factories import BadgeClassFactory
+from courseware.fragment_cache import XBlockFragmentCache
 from badges.tests.test_models import get_image
 from lms.djangoapps.lms_xblock.runtime import quote_slashes, unquote_slashes, LmsModuleSystem
 from xblock.fields import ScopeIds
+from xblock.fragment import Fragment
 from xmodule.modulestore.django import ModuleI18nService
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xblock.exceptions import NoSuchServiceError
@@ -314,3 +318,66 @@ class TestI18nService(ModuleStoreTestCase):
         Test: i18n service should not be callable in LMS after initialization.
         """
         self.assertFalse(callable(self.runtime.service(self.mock_block, 'i18n')))
+
+
+@patch.dict(settings.FEATURES, {'ENABLE_XBLOCK_FRAGMENT_CACHE': True})
+class TestFragmentCache(TestCase):
+    """Test rendering student-invariant views through the fragment cache"""
+
+    def setUp(self):
+        super(TestFragmentCache, self).setUp()
+        self.course_key = SlashSeparatedCourseKey("org", "course", "run")
+        self.block = BlockMock(
+            name='block',
+            scope_ids=ScopeIds(None, 'html', None, self.course_key.make_usage_key('html', 'block')),
+            student_invariant_views=('student_view',),
+            edited_on=datetime.datetime(2016, 1, 1),
+        )
+        self.block.student_view.return_value = Fragment(u'<a href="/static/image.png">')
+        self.runtime = self.create_runtime(XBlockFragmentCache())
+        self.addCleanup(cache.clear)
+
+    def create_runtime(self, fragment_cache):
+        """
+        Return a runtime with a license-like wrapper adding urls to the
+        content, a per-request wrapper and a url rewriter, in that order.
+        """
+        license_wrapper = lambda block, view, frag, context: Fragment(
+            frag.content + u'<a href="/jump_to_id/license">'
+        )
+        request_wrapper = lambda block, view, frag, context: Fragment(u'<div>{}</div>'.format(frag.content))
+        url_rewriter = lambda block, view, frag, context: Fragment(
+            frag.content.replace('/static/', '/asset/').replace('/jump_to_id/', '/jump/')
+        )
+        return LmsModuleSystem(
+            static_url='/static',
+            track_function=Mock(),
+            get_module=Mock(),
+            render_template=Mock(),
+            replace_urls=str,
+            course_id=self.course_key,
+            descriptor_runtime=Mock(),
+            wrappers=[license_wrapper, request_wrapper, url_rewriter],
+            fragment_cache=fragment_cache,
+        )
+
+    @patch.object(LmsModuleSystem, 'applicable_aside_types', Mock(return_value=[]))
+    def test_cached_render(self):
+        for __ in range(2):
+            frag = self.runtime.render(self.block, 'student_view', {})
+            self.assertEqual(frag.content, u'<div><a href="/asset/image.png"><a href="/jump/license"></div>')
+        self.assertEqual(self.block.student_view.call_count, 1)
+
+    @patch.object(LmsModuleSystem, 'applicable_aside_types', Mock(return_value=[]))
+    def test_wrapper_order_preserved(self):
+        uncached = self.create_runtime(None).render(self.block, 'student_view', {})
+        for __ in range(2):
+            frag = self.runtime.render(self.block, 'student_view', {})
+            self.assertEqual(frag.content, uncached.content)
+
+    @patch.object(LmsModuleSystem, 'applicable_aside_types', Mock(return_value=[]))
+    def test_uncacheable_view(self):
+        self.block.student_invariant_views = ()
+        for __ in range(2):
+            self.runtime.render(self.block, 'student_view', {})
+        self.assertEqual(self.block.student_view.call_count, 2)
@@ -227,6 +227,8 @@ if 'loc_cache' not in CACHES:
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'edx_location_mem_cache',
     }
+CONFIGURATION_MODEL_SNAPSHOT_TTL = ENV_TOKENS.get('CONFIGURATION_MODEL_SNAPSHOT_TTL', CONFIGURATION_MODEL_SNAPSHOT_TTL)
+GEOIP_COUNTRY_CODE_CACHE_SIZE = ENV_TOKENS.get('GEOIP_COUNTRY_CODE_CACHE_SIZE', GEOIP_COUNTRY_CODE_CACHE_SIZE)
 
 # Email overrides
 DEFAULT_FROM_EMAIL = ENV_TOKENS.get('DEFAULT_FROM_EMAIL', DEFAULT_FROM_EMAIL)
@@ -313,6 +315,9 @@ VIRTUAL_UNIVERSITIES = ENV_TOKENS.get('VIRTUAL_UNIVERSITIES', [])
 META_UNIVERSITIES = ENV_TOKENS.get('META_UNIVERSITIES', {})
 COMMENTS_SERVICE_URL = ENV_TOKENS.get("COMMENTS_SERVICE_URL", '')
 COMMENTS_SERVICE_KEY = ENV_TOKENS.get("COMMENTS_SERVICE_KEY", '')
+COMMENTS_SERVICE_POOL_SIZE = ENV_TOKENS.get("COMMENTS_SERVICE_POOL_SIZE", COMMENTS_SERVICE_POOL_SIZE)
+COMMENTS_SERVICE_MAX_RETRIES = ENV_TOKENS.get("COMMENTS_SERVICE_MAX_RETRIES", COMMENTS_SERVICE_MAX_RETRIES)
+COMMENTS_SERVICE_CONCURRENCY = ENV_TOKENS.get("COMMENTS_SERVICE_CONCURRENCY", COMMENTS_SERVICE_CONCURRENCY)
 CERT_QUEUE = ENV_TOKENS.get("CERT_QUEUE", 'test-pull')
 ZENDESK_URL = ENV_TOKENS.get("ZENDESK_URL")
 FEEDBACK_SUBMISSION_EMAIL = ENV_TOKENS.get("FEEDBACK_SUBMISSION_EMAIL")
@@ -709,6 +714,16 @@ COURSE_ABOUT_VISIBILITY_PERMISSION = ENV_TOKENS.get(
     'COURSE_ABOUT_VISIBILITY_PERMISSION',
     COURSE_ABOUT_VISIBILITY_PERMISSION
 )
+COURSE_LIST_VISIBILITY_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'COURSE_LIST_VISIBILITY_CACHE_TIMEOUT',
+    COURSE_LIST_VISIBILITY_CACHE_TIMEOUT
+)
+DASHBOARD_COURSE_DATA_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'DASHBOARD_COURSE_DATA_CACHE_TIMEOUT',
+    DASHBOARD_COURSE_DATA_CACHE_TIMEOUT
+)
+READ_REPLICA_PIN_TIMEOUT = ENV_TOKENS.get('READ_REPLICA_PIN_TIMEOUT', READ_REPLICA_PIN_TIMEOUT)
+QUERY_BUDGETS = ENV_TOKENS.get('QUERY_BUDGETS', QUERY_BUDGETS)
 
 
 # Enrollment API Cache Timeout
@@ -853,6 +868,18 @@ if ENV_TOKENS.get('AUDIT_CERT_CUTOFF_DATE', None):
 
 CREDENTIALS_GENERATION_ROUTING_KEY = HIGH_PRIORITY_QUEUE
 
+# Coalesced user state writes
+COALESCED_USER_STATE_FIELDS = ENV_TOKENS.get('COALESCED_USER_STATE_FIELDS', COALESCED_USER_STATE_FIELDS)
+USER_STATE_BUFFER_FLUSH_INTERVAL = ENV_TOKENS.get(
+    'USER_STATE_BUFFER_FLUSH_INTERVAL', USER_STATE_BUFFER_FLUSH_INTERVAL
+)
+USER_STATE_BUFFER_CACHE = ENV_TOKENS.get('USER_STATE_BUFFER_CACHE', USER_STATE_BUFFER_CACHE)
+if FEATURES.get('ENABLE_COALESCED_USER_STATE_WRITES'):
+    CELERYBEAT_SCHEDULE['flush-user-state-buffer'] = {
+        'task': 'courseware.flush_user_state_buffer',
+        'schedule': datetime.timedelta(seconds=USER_STATE_BUFFER_FLUSH_INTERVAL),
+    }
+
 # The extended StudentModule history table
 if FEATURES.get('ENABLE_CSMH_EXTENDED'):
     INSTALLED_APPS += ('coursewarehistoryextended',)
@@ -60,6 +60,16 @@ DISCUSSION_SETTINGS = {
     'MAX_COMMENT_DEPTH': 2,
 }
 
+# Connections to the comments service are kept alive and pooled per process.
+# COMMENTS_SERVICE_POOL_SIZE is the number of connections kept per host, and
+# COMMENTS_SERVICE_MAX_RETRIES how many times a failed connection attempt is
+# retried.
+COMMENTS_SERVICE_POOL_SIZE = 10
+COMMENTS_SERVICE_MAX_RETRIES = 2
+# Number of worker threads per process used to make independent requests to
+# the comments service concurrently (1 makes them one after the other).
+COMMENTS_SERVICE_CONCURRENCY = 4
+
 
 # Features
 FEATURES = {
@@ -90,6 +100,11 @@ FEATURES = {
     # in their emails, and they will have no way to resubscribe.
     'ENABLE_DISCUSSION_EMAIL_DIGEST': False,
 
+    # Read the discussions accessible to a user from the discussion index
+    # collected with the course block structure, instead of loading every
+    # discussion xblock from the modulestore.
+    'ENABLE_DISCUSSION_INDEX': False,
+
     'ENABLE_DJANGO_ADMIN_SITE': True,  # set true to enable django's admin site, even on prod (e.g. for course ops)
     'ENABLE_SQL_TRACKING_LOGS': False,
     'ENABLE_LMS_MIGRATION': False,
@@ -121,6 +136,49 @@ FEATURES = {
     # See jquey-xblock: https://github.com/edx-solutions/jquery-xblock
     'ENABLE_XBLOCK_VIEW_ENDPOINT': False,
 
+    # Serve the rendered output of student-invariant XBlock views (such as
+    # most HTML components) from a shared cache.
+    'ENABLE_XBLOCK_FRAGMENT_CACHE': False,
+
+    # Buffer updates of the fields listed in COALESCED_USER_STATE_FIELDS in
+    # the shared cache and write them to StudentModule in periodic batches.
+    'ENABLE_COALESCED_USER_STATE_WRITES': False,
+
+    # Build the courseware table of contents from the cached course block
+    # structure rather than from XModules.
+    'ENABLE_CACHED_TOC': False,
+
+    # Cache the responses of the Course Blocks API and answer conditional
+    # requests for them with 304 responses.
+    'ENABLE_COURSE_BLOCKS_API_RESPONSE_CACHE': False,
+
+    # Snapshot the student_view_data of blocks when courses are published, and
+    # only recompute it for the blocks that changed.
+    'ENABLE_STUDENT_VIEW_DATA_SNAPSHOTS': False,
+
+    # Resolve the courses listed by the Courses API with SQL filters, cache
+    # the result per user, and only load the courses of the requested page.
+    'ENABLE_COURSE_LIST_VISIBILITY_CACHE': False,
+
+    # Cache the certificate, verification, credit, refund and payment statuses
+    # of the courses on the student dashboard.
+    'ENABLE_DASHBOARD_COURSE_DATA_CACHE': False,
+
+    # Maintain per-course, per-mode counts of active enrollments, and read the
+    # enrollment counts and course capacity from them instead of aggregating
+    # the enrollments. Run the reconcile_enrollment_counts management command
+    # periodically when enabled.
+    'ENABLE_ENROLLMENT_COUNTS': False,
+
+    # Read the modes of courses from the request and shared caches, and
+    # filter them in memory, instead of querying them on every lookup.
+    'ENABLE_COURSE_MODES_CACHE': False,
+
+    # Send the reads of the views and tasks declared with util.query.read_mostly
+    # to the 'read_replica' database, if there is one. Users who wrote to the
+    # database are pinned to the primary for READ_REPLICA_PIN_TIMEOUT seconds.
+    'ENABLE_READ_REPLICA_ROUTING': False,
+
     # Allows to configure the LMS to provide CORS headers to serve requests from other domains
     'ENABLE_CORS_HEADERS': False,
 
@@ -218,6 +276,11 @@ FEATURES = {
     # Turn off account locking if failed login attempts exceeds a limit
     'ENABLE_MAX_FAILED_LOGIN_ATTEMPTS': True,
 
+    # Keep the failed login counts and lockouts in the cache, which must be
+    # shared and support atomic increments, and write them to the database in
+    # the background, instead of querying the database on every login.
+    'ENABLE_LOGIN_FAILURES_CACHE': False,
+
     # Hide any Personally Identifiable Information from application logs
     'SQUELCH_PII_IN_LOGS': True,
 
@@ -406,6 +469,8 @@ NODE_PATH = ':'.join(node_paths)
 # For geolocation ip database
 GEOIP_PATH = REPO_ROOT / "common/static/data/geoip/GeoIP.dat"
 GEOIPV6_PATH = REPO_ROOT / "common/static/data/geoip/GeoIPv6.dat"
+# Number of IP addresses whose country is kept in memory by each process
+GEOIP_COUNTRY_CODE_CACHE_SIZE = 10000
 
 # Where to look for a status message
 STATUS_MESSAGE_PATH = ENV_ROOT / "status_message.json"
@@ -414,8 +479,20 @@ STATUS_MESSAGE_PATH = ENV_ROOT / "status_message.json"
 
 DATABASE_ROUTERS = [
     'openedx.core.lib.django_courseware_routers.StudentModuleHistoryExtendedRouter',
+    'util.query.ReadReplicaRouter',
 ]
 
+# How long the reads of users who wrote to the database are sent to the
+# primary database, when ENABLE_READ_REPLICA_ROUTING is enabled. It should
+# exceed the replication lag of the read replica.
+READ_REPLICA_PIN_TIMEOUT = 10
+
+# The maximum number of 'queries' and 'seconds' spent on queries of views,
+# keyed by the dotted path of the view function. The queries of these views are
+# recorded, and a warning is logged when they exceed their budget. See
+# util.middleware.QueryBudgetMiddleware.
+QUERY_BUDGETS = {}
+
 ############################ OpenID Provider  ##################################
 OPENID_PROVIDER_TRUSTED_ROOTS = ['cs50.net', '*.cs50.net']
 
@@ -1147,6 +1224,10 @@ MIDDLEWARE_CLASSES = (
     # 'debug_toolbar.middleware.DebugToolbarMiddleware',
 
     'django_comment_client.utils.ViewNameMiddleware',
+
+    # Read replica routing and query budgets of views
+    'util.middleware.ReadReplicaMiddleware',
+    'util.middleware.QueryBudgetMiddleware',
     'codejail.django_integration.ConfigureCodeJailMiddleware',
 
     # catches any uncaught RateLimitExceptions and returns a 403 instead of a 500
@@ -2648,10 +2729,26 @@ COURSE_CATALOG_VISIBILITY_PERMISSION = 'see_exists'
 # visible. We default this to the legacy permission 'see_exists'.
 COURSE_ABOUT_VISIBILITY_PERMISSION = 'see_exists'
 
+# How long the ids of the courses visible to a user in the course catalog are
+# cached for, when ENABLE_COURSE_LIST_VISIBILITY_CACHE is enabled. They are
+# also recomputed when a course's start or enrollment dates pass.
+COURSE_LIST_VISIBILITY_CACHE_TIMEOUT = 5 * 60
+
+# How long the per-course data of the student dashboard is cached for, when
+# ENABLE_DASHBOARD_COURSE_DATA_CACHE is enabled. It is also recomputed when
+# the user's enrollments change.
+DASHBOARD_COURSE_DATA_CACHE_TIMEOUT = 60
+
 
 # Enrollment API Cache Timeout
 ENROLLMENT_COURSE_DETAILS_CACHE_TIMEOUT = 60
 
+# Number of seconds between the checks each process makes that the
+# ConfigurationModel entries it keeps in memory are still current. Saving an
+# entry is seen by all processes within that delay. 0 disables the in-memory
+# entries, so that every lookup goes to the 'configuration' cache.
+CONFIGURATION_MODEL_SNAPSHOT_TTL = 0
+
 
 OAUTH_ID_TOKEN_EXPIRATION = 60 * 60
 
@@ -2760,6 +2857,17 @@ FIELD_OVERRIDE_PROVIDERS = ()
 # require student context.
 MODULESTORE_FIELD_OVERRIDE_PROVIDERS = ()
 
+# For FEATURES['ENABLE_COALESCED_USER_STATE_WRITES']: the user state fields,
+# by block type, whose updates are buffered, and how often (in seconds) the
+# buffered updates are written to StudentModule.
+COALESCED_USER_STATE_FIELDS = {
+    'video': ('saved_video_position',),
+}
+USER_STATE_BUFFER_FLUSH_INTERVAL = 60
+# The cache holding the buffered updates. Updates evicted from it before they
+# are flushed are lost, so it should have room for a day's worth of them.
+USER_STATE_BUFFER_CACHE = 'default'
+
 # PROFILE IMAGE CONFIG
 # WARNING: Certain django storage backends do not support atomic
 # file overwrites (including the default, OverwriteStorage) - instead
@@ -60,6 +60,10 @@ FEATURES['DISABLE_START_DATES'] = True
 # the one in cms/envs/test.py
 FEATURES['ENABLE_DISCUSSION_SERVICE'] = False
 
+# Make requests to the comments service one after the other, so that tests
+# can inspect them in order.
+COMMENTS_SERVICE_CONCURRENCY = 1
+
 FEATURES['ENABLE_SERVICE_STATUS'] = True
 
 FEATURES['ENABLE_SHOPPING_CART'] = True
@@ -411,6 +415,9 @@ PASSWORD_HASHERS = (
     # 'django.contrib.auth.hashers.CryptPasswordHasher',
 )
 
+# Tests mock the country of IP addresses differently from one test to the next
+GEOIP_COUNTRY_CODE_CACHE_SIZE = 0
+
 ### This enables the Metrics tab for the Instructor dashboard ###########
 FEATURES['CLASS_DASHBOARD'] = True
 
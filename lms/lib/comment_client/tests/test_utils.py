@@ -0,0 +1,78 @@
+"""
+Tests of the connections to the comments service made by lms.lib.comment_client.utils.
+"""
+import requests
+from django.test.utils import override_settings
+from mock import patch
+from requests.packages.urllib3.exceptions import NewConnectionError
+
+from django_comment_common.models import ForumsConfig
+from lms.lib.comment_client import utils
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
+
+
+class CommentClientUtilsTestCase(CacheIsolationTestCase):
+    """
+    Base class of the comment client utils tests, which resets the session
+    and the connection timeout kept by the process.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(CommentClientUtilsTestCase, self).setUp()
+        for name, value in [('_session', None), ('_connection_timeout', (None, 0))]:
+            patcher = patch.object(utils, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+
+class SessionTest(CommentClientUtilsTestCase):
+    """
+    Tests of the pooled session used to talk to the comments service.
+    """
+    @override_settings(COMMENTS_SERVICE_POOL_SIZE=3, COMMENTS_SERVICE_MAX_RETRIES=1)
+    def test_session_reused(self):
+        session = utils.get_session()
+        self.assertIs(utils.get_session(), session)
+
+        adapter = session.get_adapter('http://localhost:4567/api/v1/threads')
+        self.assertIsInstance(adapter, utils.PooledHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 3)  # pylint: disable=protected-access
+        self.assertEqual(adapter.max_retries.total, 1)
+        self.assertEqual(adapter.max_retries.read, 0)
+
+    def test_send_request_uses_session(self):
+        with patch.object(requests.Session, 'request') as mock_request:
+            utils.send_request('get', 'http://localhost:4567/api/v1/threads', timeout=1)
+        mock_request.assert_called_once_with('get', 'http://localhost:4567/api/v1/threads', timeout=1)
+
+    @override_settings(COMMENTS_SERVICE_MAX_RETRIES=2)
+    def test_connection_error_retried(self):
+        with patch(
+            'requests.packages.urllib3.connection.HTTPConnection._new_conn',
+            side_effect=NewConnectionError(None, 'Connection refused'),
+        ) as mock_new_conn:
+            with self.assertRaises(requests.ConnectionError):
+                utils.send_request('get', 'http://localhost:4567/api/v1/threads')
+        self.assertEqual(mock_new_conn.call_count, 3)
+
+
+class ConnectionTimeoutTest(CommentClientUtilsTestCase):
+    """
+    Tests of get_connection_timeout.
+    """
+    def test_default_timeout(self):
+        self.assertEqual(utils.get_connection_timeout(), 5.0)
+
+    def test_timeout_overridden(self):
+        ForumsConfig.objects.create(enabled=True, connection_timeout=2.5)
+        self.assertEqual(utils.get_connection_timeout(), 2.5)
+
+    def test_timeout_kept_until_config_expires(self):
+        with patch.object(utils, 'time', return_value=1000):
+            self.assertEqual(utils.get_connection_timeout(), 5.0)
+            ForumsConfig.objects.create(enabled=True, connection_timeout=2.5)
+            self.assertEqual(utils.get_connection_timeout(), 5.0)
+
+        with patch.object(utils, 'time', return_value=1000 + ForumsConfig.cache_timeout):
+            self.assertEqual(utils.get_connection_timeout(), 2.5)
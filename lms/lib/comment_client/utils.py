@@ -3,13 +3,27 @@ from contextlib import contextmanager
 import dogstats_wrapper as dog_stats_api
 import logging
 import requests
+import threading
 from django.conf import settings
+from django.utils import translation
+from multiprocessing.pool import ThreadPool
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 from time import time
 from uuid import uuid4
 from django.utils.translation import get_language
 
 log = logging.getLogger(__name__)
 
+_session = None
+_session_lock = threading.Lock()
+
+# (connection timeout, time after which it must be reloaded)
+_connection_timeout = (None, 0)
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -51,11 +65,124 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
-def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter that reports whether each request reused a pooled
+    keep-alive connection to the comments service.
+    """
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        pool = self.get_connection(request.url, kwargs.get('proxies'))
+        num_connections = pool.num_connections
+        response = super(PooledHTTPAdapter, self).send(request, **kwargs)
+        dog_stats_api.increment(
+            'comment_client.request.connection',
+            tags=[u'reused:{}'.format(pool.num_connections == num_connections)]
+        )
+        return response
+
+
+def get_session():
+    """
+    Return the process-wide session used to talk to the comments service,
+    creating it on first use.
+
+    Connections are kept alive and pooled, up to COMMENTS_SERVICE_POOL_SIZE
+    per host. Failures to connect are retried COMMENTS_SERVICE_MAX_RETRIES
+    times; requests that reached the service are never retried, since not
+    all of them are idempotent.
+    """
+    global _session  # pylint: disable=global-statement
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = getattr(settings, 'COMMENTS_SERVICE_POOL_SIZE', 10)
+                adapter = PooledHTTPAdapter(
+                    pool_connections=pool_size,
+                    pool_maxsize=pool_size,
+                    max_retries=Retry(total=getattr(settings, 'COMMENTS_SERVICE_MAX_RETRIES', 2), read=0),
+                )
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def send_request(method, url, **kwargs):
+    """
+    Send a request to the comments service through the pooled session.
+    Takes the same arguments as `requests.request`.
+    """
+    return get_session().request(method, url, **kwargs)
+
+
+def _get_worker_pool():
+    """
+    Return the process-wide pool of COMMENTS_SERVICE_CONCURRENCY threads used
+    by perform_concurrently, creating it on first use.
+    """
+    global _worker_pool  # pylint: disable=global-statement
+    if _worker_pool is None:
+        with _worker_pool_lock:
+            if _worker_pool is None:
+                _worker_pool = ThreadPool(settings.COMMENTS_SERVICE_CONCURRENCY)
+    return _worker_pool
+
+
+def _call_in_language(function, language):
+    """
+    Call `function` with `language` active, so that requests made from a
+    worker thread carry the same Accept-Language as the calling thread.
+    """
+    with translation.override(language):
+        return function()
+
+
+def perform_concurrently(*functions):
+    """
+    Call each of `functions` on the worker pool and return their results, in
+    order. If any of them raises, the first exception (in order) is re-raised
+    once all of them are done.
+
+    The functions should do no more than make requests to the comments
+    service; they run on other threads, so they must not use the database or
+    any other per-thread state.
+    """
+    if len(functions) < 2 or getattr(settings, 'COMMENTS_SERVICE_CONCURRENCY', 1) < 2:
+        return [function() for function in functions]
+
+    # Make sure the timeout is loaded on this thread, since it may need to
+    # be read from the database.
+    get_connection_timeout()
+
+    pool = _get_worker_pool()
+    language = translation.get_language()
+    async_results = [pool.apply_async(_call_in_language, (function, language)) for function in functions]
+    for async_result in async_results:
+        async_result.wait()
+    return [async_result.get() for async_result in async_results]
+
+
+def get_connection_timeout():
+    """
+    Return the configured timeout for requests to the comments service.
+
+    The value is kept in the process for as long as ForumsConfig is cached,
+    rather than being read from the cache on every request.
+    """
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
 
+    global _connection_timeout  # pylint: disable=global-statement
+    timeout, expires = _connection_timeout
+    if time() >= expires:
+        timeout = ForumsConfig.current().connection_timeout
+        _connection_timeout = (timeout, time() + ForumsConfig.cache_timeout)
+    return timeout
+
+
+def perform_request(method, url, data_or_params=None, raw=False,
+                    metric_action=None, metric_tags=None, paged_results=False):
     if metric_tags is None:
         metric_tags = []
 
@@ -79,14 +206,13 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        config = ForumsConfig.current()
-        response = requests.request(
+        response = send_request(
             method,
             url,
             data=data,
             params=params,
             headers=headers,
-            timeout=config.connection_timeout
+            timeout=get_connection_timeout()
         )
 
     metric_tags.append(u'status_code:{}'.format(response.status_code))
@@ -3,21 +3,26 @@ This file contains implementation override of SearchResultProcessor which will a
     * Blends in "location" property
     * Confirms user access to object
 """
+from time import time
+
 from django.core.urlresolvers import reverse
 
+import dogstats_wrapper as dog_stats_api
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from request_cache.middleware import RequestCache
 from search.result_processor import SearchResultProcessor
 from xmodule.modulestore.django import modulestore
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.courseware.access import has_access
 
+ACCESSIBLE_BLOCKS_CACHE_KEY = u"courseware_search.accessible_blocks.{}.{}"
+
 
 class LmsSearchResultProcessor(SearchResultProcessor):
     """ SearchResultProcessor for LMS Search """
     _course_key = None
     _usage_key = None
     _module_store = None
-    _course_blocks = {}
 
     def get_course_key(self):
         """ fetch course key object from string representation - retain result for subsequent uses """
@@ -38,12 +43,27 @@ class LmsSearchResultProcessor(SearchResultProcessor):
         return self._module_store
 
     def get_course_blocks(self, user):
-        """ fetch cached blocks for course - retain for subsequent use """
-        course_key = self.get_course_key()
-        if course_key not in self._course_blocks:
-            root_block_usage_key = self.get_module_store().make_course_usage_key(course_key)
-            self._course_blocks[course_key] = get_course_blocks(user, root_block_usage_key)
-        return self._course_blocks[course_key]
+        """ fetch the blocks of the course that the user can access """
+        root_block_usage_key = self.get_module_store().make_course_usage_key(self.get_course_key())
+        return get_course_blocks(user, root_block_usage_key)
+
+    def get_accessible_block_keys(self, user):
+        """
+        Returns the set of the usage keys of the course blocks that the user can
+        access, or None if the user has staff access to the whole course.
+
+        The set is computed once per request for each user and course, so that
+        all the results of a search within a course are checked against it.
+        """
+        request_cache = RequestCache.get_request_cache()
+        cache_key = ACCESSIBLE_BLOCKS_CACHE_KEY.format(user.id, self.get_course_key())
+        if cache_key not in request_cache.data:
+            if has_access(user, 'staff', self.get_course_key()):
+                accessible_block_keys = None
+            else:
+                accessible_block_keys = frozenset(self.get_course_blocks(user).get_block_keys())
+            request_cache.data[cache_key] = accessible_block_keys
+        return request_cache.data[cache_key]
 
     @property
     def url(self):
@@ -60,6 +80,12 @@ class LmsSearchResultProcessor(SearchResultProcessor):
 
     def should_remove(self, user):
         """ Test to see if this result should be removed due to access restriction """
-        if has_access(user, 'staff', self.get_course_key()):
-            return False
-        return self.get_usage_key() not in self.get_course_blocks(user).get_block_keys()
+        start_time = time()
+        accessible_block_keys = self.get_accessible_block_keys(user)
+        remove = accessible_block_keys is not None and self.get_usage_key() not in accessible_block_keys
+        dog_stats_api.histogram(
+            'lms.courseware_search.filter_time',
+            (time() - start_time) * 1000,
+            tags=[u'course_id:{}'.format(self.get_course_key())]
+        )
+        return remove
@@ -1,6 +1,10 @@
 """
 Tests for the lms_result_processor
 """
+from mock import patch
+
+from lms.djangoapps.course_blocks.api import get_course_blocks
+from request_cache.middleware import RequestCache
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 
@@ -99,3 +103,29 @@ class LmsSearchResultProcessorTestCase(ModuleStoreTestCase):
         )
 
         self.assertEqual(srp.should_remove(self.global_staff), False)
+
+    def test_should_remove_uses_accessible_blocks_per_course(self):
+        """
+        Tests that the blocks accessible to the user are only computed once per
+        course for all the results of a search. The course hasn't started, so
+        they aren't accessible to the user.
+        """
+        RequestCache.clear_request_cache()
+        user = UserFactory()
+        processors = [
+            LmsSearchResultProcessor(
+                {
+                    "course": unicode(self.course.id),
+                    "id": unicode(block.scope_ids.usage_id),
+                    "content": {"text": "This is html test text"}
+                },
+                "test"
+            )
+            for block in (self.html, self.ghost_html)
+        ]
+
+        with patch(
+            'lms.lib.courseware_search.lms_result_processor.get_course_blocks', wraps=get_course_blocks
+        ) as mock_get_course_blocks:
+            self.assertEqual([srp.should_remove(user) for srp in processors], [True, True])
+        self.assertEqual(mock_get_course_blocks.call_count, 1)
@@ -1,6 +1,8 @@
 """
 Higher order functions built on the BlockStructureManager to interact with a django cache.
 """
+from uuid import uuid4
+
 from django.core.cache import cache
 from openedx.core.lib.block_structure.manager import BlockStructureManager
 from xmodule.modulestore.django import modulestore
@@ -40,6 +42,27 @@ def clear_course_from_cache(course_key):
     arbitrary access to an intermediate block will be supported.
     """
     get_block_structure_manager(course_key).clear()
+    get_cache().delete(_published_version_cache_key(course_key))
+
+
+def get_course_published_version(course_key):
+    """
+    Returns an opaque token that changes whenever the block structure of the
+    given course is cleared from the cache, that is, whenever the course is
+    published.
+
+    Returns None if the token can't be kept in the cache.
+    """
+    cache_key = _published_version_cache_key(course_key)
+    get_cache().add(cache_key, uuid4().hex, None)
+    return get_cache().get(cache_key)
+
+
+def _published_version_cache_key(course_key):
+    """
+    Returns the cache key of the published version token of the given course.
+    """
+    return u"block_structure.published_version.{}".format(course_key)
 
 
 def get_block_structure_manager(course_key):
@@ -3,7 +3,7 @@ Django Admin model registry for Course Structures sub-application
 """
 from ratelimitbackend import admin
 
-from .models import CourseStructure
+from .models import CourseStructure, StudentViewSnapshot
 
 
 class CourseStructureAdmin(admin.ModelAdmin):
@@ -16,3 +16,16 @@ class CourseStructureAdmin(admin.ModelAdmin):
 
 
 admin.site.register(CourseStructure, CourseStructureAdmin)
+
+
+class StudentViewSnapshotAdmin(admin.ModelAdmin):
+    """
+    Django Admin class for managing Student View Snapshots model data
+    """
+    search_fields = ('course_id', 'usage_key')
+    list_display = ('course_id', 'usage_key', 'block_type', 'multi_device', 'modified')
+    list_filter = ('block_type',)
+    ordering = ('course_id', 'usage_key')
+
+
+admin.site.register(StudentViewSnapshot, StudentViewSnapshotAdmin)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+import model_utils.fields
+import util.models
+import xmodule_django.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('course_structures', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentViewSnapshot',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, verbose_name='created', editable=False)),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, verbose_name='modified', editable=False)),
+                ('course_id', xmodule_django.models.CourseKeyField(max_length=255, verbose_name=b'Course ID', db_index=True)),
+                ('usage_key', xmodule_django.models.UsageKeyField(max_length=255)),
+                ('block_type', models.CharField(max_length=64)),
+                ('block_version', models.CharField(max_length=32)),
+                ('multi_device', models.BooleanField(default=False)),
+                ('student_view_data_json', util.models.CompressedTextField(null=True, blank=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='studentviewsnapshot',
+            unique_together=set([('course_id', 'usage_key')]),
+        ),
+    ]
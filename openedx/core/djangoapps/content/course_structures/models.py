@@ -1,14 +1,18 @@
 """
 Django ORM model specifications for the Course Structures sub-application
 """
+import hashlib
 import json
 import logging
 
 from collections import OrderedDict
+from datetime import timedelta
+from django.db import models
+from django.utils.timezone import now
 from model_utils.models import TimeStampedModel
 
 from util.models import CompressedTextField
-from xmodule_django.models import CourseKeyField, UsageKey
+from xmodule_django.models import CourseKeyField, UsageKey, UsageKeyField
 
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -81,3 +85,79 @@ class CourseStructure(TimeStampedModel):
 
         for child_node in cur_block['children']:
             self._traverse_tree(child_node, unordered_structure, ordered_blocks, parent=block)
+
+
+class StudentViewSnapshot(TimeStampedModel):
+    """
+    A snapshot of the student_view_data and multi-device support of a
+    published block, recorded when the course block structure is collected.
+
+    Snapshots are keyed by a version of their block, so that recollecting the
+    course only calls student_view_data() on the blocks that were edited since.
+    As the data of some blocks doesn't only depend on their own content (for
+    instance, videos include their encodings from VAL), snapshots older than
+    MAX_AGE are recomputed regardless.
+    """
+
+    class Meta(object):
+        app_label = 'course_structures'
+        unique_together = (('course_id', 'usage_key'),)
+
+    MAX_AGE = timedelta(days=1)
+
+    course_id = CourseKeyField(max_length=255, db_index=True, verbose_name='Course ID')
+    usage_key = UsageKeyField(max_length=255)
+    block_type = models.CharField(max_length=64)
+
+    # Digest of the edit info of the block the snapshot was taken of.
+    block_version = models.CharField(max_length=32)
+
+    multi_device = models.BooleanField(default=False)
+
+    # JSON of the block's student_view_data, or null if it has none.
+    student_view_data_json = CompressedTextField(blank=True, null=True)
+
+    @property
+    def student_view_data(self):
+        """
+        Deserializes the student_view_data of the block.
+        """
+        if self.student_view_data_json is not None:
+            return json.loads(self.student_view_data_json)
+        return None
+
+    @classmethod
+    def get_block_version(cls, xblock):
+        """
+        Returns the version of the given published block that its snapshot
+        is keyed by, or None if the block doesn't record when it was edited.
+        """
+        edited_on = getattr(xblock, 'edited_on', None)
+        if edited_on is None:
+            return None
+        return hashlib.md5(unicode(edited_on)).hexdigest()
+
+    def is_current(self, block_version):
+        """
+        Returns whether the snapshot can be reused for the given version of
+        its block.
+        """
+        return (
+            block_version is not None and
+            self.block_version == block_version and
+            self.modified > now() - self.MAX_AGE
+        )
+
+    @classmethod
+    def get_for_course(cls, course_key, block_types=None, modified_since=None):
+        """
+        Returns the snapshots of the blocks of the given course, optionally
+        restricted to the given block types or to the snapshots that were
+        updated after the given datetime.
+        """
+        snapshots = cls.objects.filter(course_id=course_key)
+        if block_types is not None:
+            snapshots = snapshots.filter(block_type__in=block_types)
+        if modified_since is not None:
+            snapshots = snapshots.filter(modified__gt=modified_since)
+        return snapshots
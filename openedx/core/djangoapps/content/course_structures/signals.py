@@ -5,7 +5,7 @@ from django.dispatch.dispatcher import receiver
 
 from xmodule.modulestore.django import SignalHandler
 
-from .models import CourseStructure
+from .models import CourseStructure, StudentViewSnapshot
 
 
 @receiver(SignalHandler.course_published)
@@ -27,3 +27,11 @@ def listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable=
     # Note: The countdown=0 kwarg is set to to ensure the method below does not attempt to access the course
     # before the signal emitter has finished all operations. This is also necessary to ensure all tests pass.
     update_course_structure.apply_async([unicode(course_key)], countdown=0)
+
+
+@receiver(SignalHandler.course_deleted)
+def listen_for_course_delete(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Course Structure application receiver for the course_deleted signal
+    """
+    StudentViewSnapshot.objects.filter(course_id=course_key).delete()
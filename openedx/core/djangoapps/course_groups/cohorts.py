@@ -5,7 +5,10 @@ forums, and to the cohort admin views.
 
 import logging
 import random
+from collections import defaultdict
 
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.db.models.signals import post_save, m2m_changed
 from django.dispatch import receiver
 from django.http import Http404
@@ -15,6 +18,7 @@ from courseware import courses
 from eventtracking import tracker
 from request_cache.middleware import RequestCache
 from student.models import get_user_by_username_or_email
+from util.db import outer_atomic
 
 from .models import (
     CourseUserGroup,
@@ -88,6 +92,12 @@ def _cohort_membership_changed(sender, **kwargs):
 # management UI in the instructor dashboard.
 DEFAULT_COHORT_NAME = _("Default Group")
 
+# How long the shared cache keeps the id of the cohort a user belongs to in a
+# course. Entries are also dropped whenever the user's CohortMembership changes,
+# but that may happen before the change is committed, so this bounds how long
+# a concurrent reader can cache the old cohort.
+COHORT_MEMBERSHIP_CACHE_TIMEOUT = 10 * 60
+
 
 # tl;dr: global state is bad.  capa reseeds random every time a problem is loaded.  Even
 # if and when that's fixed, it's a good idea to have a local generator to avoid any other
@@ -201,6 +211,122 @@ def get_cohort(user, course_key, assign=True, use_cached=False):
     return request_cache.data.setdefault(cache_key, membership.course_user_group)
 
 
+def get_cohorts_for_users(course_key, user_ids, assign=True):
+    """Returns the cohorts of many users in the specified course.
+
+    This is the bulk counterpart of get_cohort. The memberships of users that
+    aren't in the shared cache are fetched with a single query and users
+    without a cohort are randomly assigned one with batched inserts. The
+    resulting cohorts are stored in the shared cache, and in the request cache
+    used by get_cohort.
+
+    Arguments:
+        course_key: CourseKey
+        user_ids: an iterable of User ids.
+        assign (bool): if False then we don't assign a group to users
+
+    Returns:
+        A dict that maps each of the user ids to a CourseUserGroup object if
+        the course is cohorted and the User has a cohort, else to None.
+
+    Raises:
+       Http404 if the course doesn't exist.
+    """
+    user_ids = set(user_ids)
+    course_cohort_settings = get_course_cohort_settings(course_key)
+    if not course_cohort_settings.is_cohorted:
+        return dict.fromkeys(user_ids)
+
+    cache_keys = {CohortMembership.cache_key(course_key, user_id): user_id for user_id in user_ids}
+    cohort_ids = {
+        cache_keys[cache_key]: cohort_id
+        for cache_key, cohort_id in cache.get_many(cache_keys.keys()).iteritems()
+    }
+    cohorts_by_id = {}
+
+    uncached_user_ids = user_ids.difference(cohort_ids)
+    if uncached_user_ids:
+        memberships = CohortMembership.objects.filter(
+            course_id=course_key,
+            user_id__in=uncached_user_ids,
+        ).select_related('course_user_group')
+        for membership in memberships:
+            cohort_ids[membership.user_id] = membership.course_user_group_id
+            cohorts_by_id[membership.course_user_group_id] = membership.course_user_group
+
+        # Cache the memberships read from the database. The ones assigned
+        # below may not be committed yet, and are cached once they are read.
+        cache.set_many(
+            {
+                CohortMembership.cache_key(course_key, user_id): cohort_ids[user_id]
+                for user_id in uncached_user_ids
+                if user_id in cohort_ids
+            },
+            COHORT_MEMBERSHIP_CACHE_TIMEOUT
+        )
+
+        unassigned_user_ids = uncached_user_ids.difference(cohort_ids)
+        if assign and unassigned_user_ids:
+            for user_id, cohort in _assign_random_cohorts(course_key, unassigned_user_ids).iteritems():
+                cohort_ids[user_id] = cohort.id
+                cohorts_by_id[cohort.id] = cohort
+
+    missing_cohort_ids = set(cohort_ids.itervalues()).difference(cohorts_by_id)
+    if missing_cohort_ids:
+        cohorts_by_id.update(CourseUserGroup.objects.in_bulk(list(missing_cohort_ids)))
+
+    request_cache = RequestCache.get_request_cache()
+    cohorts = {}
+    for user_id in user_ids:
+        cohort = cohorts_by_id.get(cohort_ids.get(user_id))
+        cohorts[user_id] = cohort
+        if cohort is not None:
+            request_cache.data[u"cohorts.get_cohort.{}.{}".format(user_id, course_key)] = cohort
+    return cohorts
+
+
+def _assign_random_cohorts(course_key, user_ids):
+    """
+    Randomly assign each of the given users, who must not have a cohort in the
+    course yet, to one of its RANDOM cohorts.
+
+    Returns:
+        A dict that maps the user ids to their new CourseUserGroup.
+    """
+    cohorts = _get_random_cohorts(course_key)
+    assignments = {user_id: local_random().choice(cohorts) for user_id in user_ids}
+
+    user_ids_by_cohort = defaultdict(list)
+    for user_id, cohort in assignments.iteritems():
+        user_ids_by_cohort[cohort].append(user_id)
+
+    try:
+        with transaction.atomic():
+            for cohort, cohort_user_ids in user_ids_by_cohort.iteritems():
+                cohort.users.add(*cohort_user_ids)
+            CohortMembership.objects.bulk_create(
+                [
+                    CohortMembership(course_user_group=cohort, user_id=user_id, course_id=course_key)
+                    for user_id, cohort in assignments.iteritems()
+                ],
+                batch_size=500
+            )
+    except IntegrityError:
+        # Some of the users were assigned a cohort concurrently, so assign
+        # the rest one at a time.
+        for user_id in assignments.keys():
+            try:
+                membership = CohortMembership.objects.get(course_id=course_key, user_id=user_id)
+            except CohortMembership.DoesNotExist:
+                membership = CohortMembership.objects.create(
+                    user_id=user_id,
+                    course_user_group=assignments[user_id]
+                )
+            assignments[user_id] = membership.course_user_group
+
+    return assignments
+
+
 def get_random_cohort(course_key):
     """
     Helper method to get a cohort for random assignment.
@@ -208,17 +334,25 @@ def get_random_cohort(course_key):
     If there are multiple cohorts of type RANDOM in the course, one of them will be randomly selected.
     If there are no existing cohorts of type RANDOM in the course, one will be created.
     """
+    return local_random().choice(_get_random_cohorts(course_key))
+
+
+def _get_random_cohorts(course_key):
+    """
+    Return the cohorts of type RANDOM in the course, creating the default
+    cohort if there are none.
+    """
     course = courses.get_course(course_key)
     cohorts = get_course_cohorts(course, assignment_type=CourseCohort.RANDOM)
-    if cohorts:
-        cohort = local_random().choice(cohorts)
-    else:
-        cohort = CourseCohort.create(
-            cohort_name=DEFAULT_COHORT_NAME,
-            course_id=course_key,
-            assignment_type=CourseCohort.RANDOM
-        ).course_user_group
-    return cohort
+    if not cohorts:
+        cohorts = [
+            CourseCohort.create(
+                cohort_name=DEFAULT_COHORT_NAME,
+                course_id=course_key,
+                assignment_type=CourseCohort.RANDOM
+            ).course_user_group
+        ]
+    return cohorts
 
 
 def migrate_cohort_settings(course):
@@ -356,10 +490,12 @@ def remove_user_from_cohort(cohort, username_or_email):
     user = get_user_by_username_or_email(username_or_email)
 
     try:
-        membership = CohortMembership.objects.get(course_user_group=cohort, user=user)
-        membership.delete()
+        with outer_atomic():
+            membership = CohortMembership.objects.get(course_user_group=cohort, user=user)
+            membership.delete()
     except CohortMembership.DoesNotExist:
         raise ValueError("User {} was not present in cohort {}".format(username_or_email, cohort))
+    uncache_cohort_membership(cohort.course_id, user.id)
 
 
 def add_user_to_cohort(cohort, username_or_email):
@@ -381,6 +517,7 @@ def add_user_to_cohort(cohort, username_or_email):
 
     membership = CohortMembership(course_user_group=cohort, user=user)
     membership.save()  # This will handle both cases, creation and updating, of a CohortMembership for this user.
+    uncache_cohort_membership(cohort.course_id, user.id)
 
     tracker.emit(
         "edx.cohort.user_add_requested",
@@ -395,6 +532,18 @@ def add_user_to_cohort(cohort, username_or_email):
     return (user, membership.previous_cohort_name)
 
 
+def uncache_cohort_membership(course_key, user_id):
+    """
+    Drop the shared cache entry for the cohort of the user in the course.
+
+    The CohortMembership signal receivers already drop it when a membership
+    changes, but before the change is committed, so a concurrent
+    get_cohorts_for_users may cache the old cohort again. Callers that commit
+    a change to a membership drop it again once it is committed.
+    """
+    cache.delete(CohortMembership.cache_key(course_key, user_id))
+
+
 def get_group_info_for_cohort(cohort, use_cached=False):
     """
     Get the ids of the group and partition to which this cohort has been linked
@@ -9,7 +9,8 @@ from django.contrib.auth.models import User
 from django.db import models, transaction
 from util.db import outer_atomic
 from django.core.exceptions import ValidationError
-from django.db.models.signals import pre_delete
+from django.core.cache import cache
+from django.db.models.signals import pre_delete, post_delete, post_save
 from django.dispatch import receiver
 from xmodule_django.models import CourseKeyField
 
@@ -76,6 +77,14 @@ class CohortMembership(models.Model):
     class Meta(object):
         unique_together = (('user', 'course_id'), )
 
+    @staticmethod
+    def cache_key(course_key, user_id):
+        """
+        Return the shared cache key under which the id of the cohort that
+        the user belongs to in the course is stored.
+        """
+        return u"course_groups.cohort_membership.{}.{}".format(course_key, user_id)
+
     def clean_fields(self, *args, **kwargs):
         if self.course_id is None:
             self.course_id = self.course_user_group.course_id
@@ -147,6 +156,15 @@ def remove_user_from_cohort(sender, instance, **kwargs):  # pylint: disable=unus
     instance.course_user_group.save()
 
 
+@receiver(post_save, sender=CohortMembership)
+@receiver(post_delete, sender=CohortMembership)
+def invalidate_cached_cohort_membership(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drops the shared cache entry for a CohortMembership whenever it changes.
+    """
+    cache.delete(CohortMembership.cache_key(instance.course_id, instance.user_id))
+
+
 class CourseUserGroupPartitionGroup(models.Model):
     """
     Create User Partition Info.
@@ -8,7 +8,9 @@ from nose.plugins.attrib import attr
 import before_after
 
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db import IntegrityError
+from django.db.models.signals import post_delete, post_save
 from django.http import Http404
 from django.test import TestCase
 
@@ -19,7 +21,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import TEST_DATA_MIXED_MODULESTORE, ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import ToyCourseFactory
 
-from ..models import CourseUserGroup, CourseCohort, CourseUserGroupPartitionGroup
+from ..models import CohortMembership, CourseUserGroup, CourseCohort, CourseUserGroupPartitionGroup
 from .. import cohorts
 from ..tests.helpers import (
     topic_name_to_id, config_course_cohorts, config_course_cohorts_legacy,
@@ -303,6 +305,37 @@ class TestCohorts(ModuleStoreTestCase):
         # get_cohort should return a group for user
         self.assertEquals(cohorts.get_cohort(user, course.id).name, "AutoGroup")
 
+    def test_get_cohorts_for_users(self):
+        """
+        Make sure cohorts.get_cohorts_for_users() returns existing cohorts and
+        assigns users without one to a random cohort.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        users = [UserFactory() for __ in range(3)]
+        user_ids = [user.id for user in users]
+
+        self.assertEqual(
+            cohorts.get_cohorts_for_users(course.id, user_ids),
+            dict.fromkeys(user_ids),
+            "Course isn't cohorted, so users shouldn't have a cohort"
+        )
+
+        config_course_cohorts(course, is_cohorted=True, auto_cohorts=["AutoGroup"])
+        cohort = CohortFactory(course_id=course.id, name="TestCohort", users=[users[0]])
+
+        self.assertEqual(
+            cohorts.get_cohorts_for_users(course.id, user_ids, assign=False),
+            {users[0].id: cohort, users[1].id: None, users[2].id: None}
+        )
+
+        user_cohorts = cohorts.get_cohorts_for_users(course.id, user_ids)
+        self.assertEqual(user_cohorts[users[0].id], cohort)
+        self.assertEqual(user_cohorts[users[1].id].name, "AutoGroup")
+        self.assertEqual(user_cohorts[users[2].id].name, "AutoGroup")
+        for user in users:
+            self.assertEqual(cohorts.get_cohort(user, course.id), user_cohorts[user.id])
+            self.assertIn(user, user_cohorts[user.id].users.all())
+
     def test_cohorting_with_auto_cohorts(self):
         """
         Make sure cohorts.get_cohort() does the right thing.
@@ -727,6 +760,68 @@ class TestCohorts(ModuleStoreTestCase):
             )
 
 
+@attr('shard_2')
+class TestCohortMembershipCache(ModuleStoreTestCase):
+    """
+    Test the shared cache of cohort memberships
+    """
+    MODULESTORE = TEST_DATA_MIXED_MODULESTORE
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(TestCohortMembershipCache, self).setUp()
+        self.toy_course_key = ToyCourseFactory.create().id
+
+    def test_get_cohorts_for_users(self):
+        """
+        Make sure cohorts.get_cohorts_for_users() caches memberships across
+        requests and that the cache is invalidated when memberships change.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        users = [UserFactory() for __ in range(5)]
+        user_ids = [user.id for user in users]
+        cohort = CohortFactory(course_id=course.id, name="TestCohort", users=users)
+        other_cohort = CohortFactory(course_id=course.id, name="OtherCohort")
+        cohorts.get_cohorts_for_users(course.id, user_ids)
+
+        # The cohort settings and the cohorts themselves are still queried.
+        with self.assertNumQueries(2):
+            user_cohorts = cohorts.get_cohorts_for_users(course.id, user_ids)
+        self.assertEqual(set(user_cohorts.values()), {cohort})
+
+        cohorts.add_user_to_cohort(other_cohort, users[0].username)
+        self.assertEqual(cohorts.get_cohorts_for_users(course.id, user_ids)[users[0].id], other_cohort)
+
+        cohorts.remove_user_from_cohort(other_cohort, users[0].username)
+        self.assertIsNone(cohorts.get_cohorts_for_users(course.id, user_ids, assign=False)[users[0].id])
+
+    def test_membership_uncached_after_commit(self):
+        """
+        Make sure a cohort cached by a concurrent reader between a membership
+        change and its commit is dropped once the change is committed.
+        """
+        course = modulestore().get_course(self.toy_course_key)
+        config_course_cohorts(course, is_cohorted=True)
+        user = UserFactory()
+        cohort = CohortFactory(course_id=course.id, name="TestCohort", users=[user])
+        other_cohort = CohortFactory(course_id=course.id, name="OtherCohort")
+
+        def recache_old_cohort(sender, instance, **kwargs):  # pylint: disable=unused-argument
+            """Cache the cohort that is still committed, as a concurrent reader would"""
+            cache.set(CohortMembership.cache_key(course.id, user.id), cohort.id)
+
+        for signal in (post_save, post_delete):
+            signal.connect(recache_old_cohort, sender=CohortMembership)
+            self.addCleanup(signal.disconnect, recache_old_cohort, sender=CohortMembership)
+
+        cohorts.add_user_to_cohort(other_cohort, user.username)
+        self.assertEqual(cohorts.get_cohorts_for_users(course.id, [user.id])[user.id], other_cohort)
+
+        cohorts.remove_user_from_cohort(other_cohort, user.username)
+        self.assertIsNone(cohorts.get_cohorts_for_users(course.id, [user.id], assign=False)[user.id])
+
+
 @attr('shard_2')
 @ddt.ddt
 class TestCohortsAndPartitionGroups(ModuleStoreTestCase):
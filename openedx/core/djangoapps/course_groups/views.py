@@ -9,6 +9,7 @@ from django.core.paginator import Paginator, EmptyPage
 from django.core.urlresolvers import reverse
 from django.http import Http404, HttpResponseBadRequest
 from django.views.decorators.http import require_http_methods
+from util.db import outer_atomic
 from util.json_request import expect_json, JsonResponse
 from django.db import transaction
 from django.contrib.auth.decorators import login_required
@@ -364,6 +365,7 @@ def add_users_to_cohort(request, course_key_string, cohort_id):
                                'unknown': unknown})
 
 
+@transaction.non_atomic_requests
 @ensure_csrf_cookie
 @require_POST
 def remove_user_from_cohort(request, course_key_string, cohort_id):
@@ -393,11 +395,14 @@ def remove_user_from_cohort(request, course_key_string, cohort_id):
                                    'msg': "No user '{0}'".format(username)})
 
     try:
-        membership = CohortMembership.objects.get(user=user, course_id=course_key)
-        membership.delete()
+        with outer_atomic():
+            membership = CohortMembership.objects.get(user=user, course_id=course_key)
+            membership.delete()
 
     except CohortMembership.DoesNotExist:
         pass
+    else:
+        cohorts.uncache_cohort_membership(course_key, user.id)
 
     return json_http_response({'success': True})
 